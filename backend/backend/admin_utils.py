@@ -0,0 +1,121 @@
+"""
+admin_utils.py
+
+Unelte pentru paginile de admin peste tabele mari (bilete, notificari, utilizatori):
+
+- EstimatedCountPaginator: pe Postgres ia numarul de randuri din estimarea planner-ului
+  (pg_class.reltuples / EXPLAIN) in loc de COUNT(*); sub ADMIN_EXACT_COUNT_LIMIT numara exact
+- AutocompleteFilter: filtru lateral pentru FK cu select autocomplete, in loc sa incarce
+  toate obiectele legate in sidebar
+- LargeTableAdmin: ModelAdmin cu paginatorul de mai sus si fara al doilea COUNT ("N total")
+"""
+
+import json
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path, get_last_value_from_parameters
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+ADMIN_EXACT_COUNT_LIMIT = getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000)
+
+
+def estimate_count(queryset):
+    """Estimarea Postgres pentru numarul de randuri; None daca nu exista una."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            # tabela intreaga: statisticile actualizate de (auto)vacuum / ANALYZE
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 = tabela inca neanalizata
+            return row[0] if row and row[0] >= 0 else None
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Numarul total e aproximativ peste ADMIN_EXACT_COUNT_LIMIT randuri; ultimele pagini pot
+    iesi goale sau lipsi, in schimb changelist-ul nu mai scaneaza tabela la fiecare incarcare.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, "query"):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    list_filter = (("event", AutocompleteFilter),)
+
+    Adminul modelului legat trebuie sa aiba search_fields (la fel ca la autocomplete_fields).
+    """
+
+    template = "admin/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.name}__exact"
+        self.lookup_val = get_last_value_from_parameters(params, self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.admin_site = model_admin.admin_site
+        self.title = field.verbose_name
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.lookup_val is None,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": _("All"),
+        }
+
+    def widget(self):
+        # doar obiectul selectat (daca exista) e citit din DB; restul vin prin autocomplete_view
+        form_field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(self.field, self.admin_site),
+            required=False,
+        )
+        return form_field.widget.render(self.lookup_kwarg, self.lookup_val)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        # select2 + autocomplete.js pentru filtrele AutocompleteFilter din sidebar
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, (list, tuple)) and issubclass(list_filter[1], AutocompleteFilter):
+                field = get_fields_from_path(self.model, list_filter[0])[-1]
+                media += AutocompleteSelect(field, self.admin_site).media
+        return media
+
@@ -0,0 +1,109 @@
+"""
+async_views.py
+
+Baza pentru variantele async ale endpoint-urilor de citire (rulate pe ASGI, ex. uvicorn).
+
+- `sync_view` e view-ul DRF sincron al aceleiasi rute; async-ul nu reimplementeaza nimic din el
+- GET ruleaza in event loop: autentificare din claims JWT, queryset-ul si filtrele view-ului
+  DRF (get_queryset + filter_queryset, prin sync_to_async: filterset-urile pot valida cu query-uri),
+  incarcat cu ORM async (aiterator) si serializat cu serializer-ul lui, pe obiecte deja incarcate
+- POST/PUT/PATCH/DELETE sunt delegate view-ului DRF, deci validarile si permisiunile de scriere
+  raman exact aceleasi; header-ul Allow contine doar metodele pe care acesta le implementeaza
+
+Se activeaza din settings.ASYNC_READ_VIEWS (vezi urls.py din aplicatii).
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.utils.encoders import JSONEncoder
+
+from users.authentication import ClaimsJWTAuthentication
+
+
+class AsyncReadView(View):
+    # View.setup trateaza HEAD ca GET
+    http_method_names = ["get", "post", "put", "patch", "delete", "head", "options"]
+
+    # daca GET cere user autentificat (echivalentul IsAuthenticated)
+    login_required = False
+
+    # view-ul DRF sincron al rutei: ii refolosim queryset-ul / filtrele / serializer-ul si ii
+    # delegam scrierile
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # la fel ca APIView: autentificarea e prin JWT, nu prin cookie de sesiune
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def _write_methods(self):
+        # ca APIView.allowed_methods: doar metodele definite efectiv pe view-ul DRF
+        if self.sync_view is None:
+            return []
+        return [
+            m for m in self.sync_view.http_method_names
+            if m not in ("get", "head", "options") and hasattr(self.sync_view, m)
+        ]
+
+    def _allowed_methods(self):
+        # acelasi Allow ca view-ul DRF (View.setup ii adauga head cand are get)
+        view = self.sync_view
+        if view is None:
+            return ["GET", "HEAD", "OPTIONS"]
+        return [
+            m.upper() for m in view.http_method_names
+            if hasattr(view, m) or (m == "head" and hasattr(view, "get"))
+        ]
+
+    def drf_view(self, request, *args, **kwargs):
+        """Instanta view-ului DRF pentru request-ul curent, fara dispatch (autentificarea e deja facuta)."""
+        view = self.sync_view()
+        view.setup(request, *args, **kwargs)
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.request.user = request.user
+        view.format_kwarg = None
+        return view
+
+    @staticmethod
+    def error(detail, status):
+        return JsonResponse({"detail": str(detail)}, status=status)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            request.user = await ClaimsJWTAuthentication().aauthenticate(request) or AnonymousUser()
+            if self.login_required and not request.user.is_authenticated:
+                return self.error("Authentication credentials were not provided.", 401)
+
+            data = await self.get_data(request, *args, **kwargs)
+        except Http404 as exc:
+            return self.error(str(exc) or "Not found.", 404)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+            return JsonResponse(detail, status=exc.status_code, encoder=JSONEncoder, safe=False)
+
+        return JsonResponse(data, encoder=JSONEncoder, safe=False)
+
+    @staticmethod
+    async def filtered_queryset(view):
+        return await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+
+    async def get_data(self, request, *args, **kwargs):
+        """Lista: queryset-ul filtrat al view-ului DRF, serializat cu serializer-ul lui."""
+        view = self.drf_view(request, *args, **kwargs)
+        qs = await self.filtered_queryset(view)
+        objects = [obj async for obj in qs.aiterator()]
+        return view.get_serializer(objects, many=True).data
+
+    async def _write(self, request, *args, **kwargs):
+        if request.method.lower() not in self._write_methods():
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        response = await sync_to_async(self.sync_view.as_view())(request, *args, **kwargs)
+        # Response-ul DRF e randat tot in thread-ul sincron
+        return await sync_to_async(response.render)()
+
+    post = put = patch = delete = _write
@@ -0,0 +1,124 @@
+"""
+db_router.py
+
+Rutare primary / replici de citire.
+
+- scrierile merg mereu pe "default" (primary)
+- citirile merg pe o replica (alias-urile "replica_*" din DATABASES), cu exceptia:
+    * request-urilor care scriu (POST/PUT/PATCH/DELETE): tot request-ul ramane pe primary,
+      ca validarile (ex. locuri disponibile) sa nu citeasca date intarziate
+    * clientilor care au scris recent (REPLICA_PIN_SECONDS): organizatorul isi vede
+      imediat modificarile, chiar daca replica nu a prins inca din urma
+- fara replici configurate totul merge pe "default"
+
+Pin-ul "a scris recent" se tine in cache-ul REPLICA_PIN_CACHE, care trebuie sa fie partajat
+intre workeri (Redis, Memcached, DB): cu LocMemCache fiecare proces ar avea propriul pin si
+GET-ul de dupa un POST, servit de alt worker, ar citi de pe replica. Middleware-ul refuza
+pornirea cu replici configurate si un cache local.
+"""
+
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+_pinned = ContextVar("db_pinned_to_primary", default=False)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# backend-uri de cache cu stare per proces (sau fara stare)
+_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or _pinned.get():
+            return "default"
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # orice citire de dupa o scriere, in acelasi request, vine tot de pe primary
+        pin_to_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # toate alias-urile contin aceleasi date
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaPinningMiddleware:
+    """Decide per request daca citirile pot merge pe replici (sync sau async)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        alias = getattr(settings, "REPLICA_PIN_CACHE", "default")
+        if replica_aliases() and settings.CACHES[alias]["BACKEND"] in _LOCAL_CACHES:
+            raise ImproperlyConfigured(
+                f"Cu replici de citire, REPLICA_PIN_CACHE ({alias!r}) trebuie sa fie un cache "
+                "partajat intre workeri (Redis, Memcached, DB), nu unul local procesului."
+            )
+        self.cache = caches[alias]
+
+    @staticmethod
+    def _client_key(request):
+        # acelasi token JWT (sau acelasi IP, pentru anonimi) = acelasi client
+        ident = request.META.get("HTTP_AUTHORIZATION") or request.META.get("REMOTE_ADDR", "")
+        return "db-pin:" + hashlib.sha1(ident.encode()).hexdigest()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+
+        key = self._client_key(request)
+        writes = request.method not in SAFE_METHODS
+        token = _pinned.set(writes or bool(self.cache.get(key)))
+        try:
+            response = self.get_response(request)
+            if writes and response.status_code < 400:
+                self.cache.set(key, True, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+            return response
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        key = self._client_key(request)
+        writes = request.method not in SAFE_METHODS
+        # view-urile sync primesc o copie a contextului, deci vad si ele pin-ul
+        token = _pinned.set(writes or bool(await self.cache.aget(key)))
+        try:
+            response = await self.get_response(request)
+            if writes and response.status_code < 400:
+                await self.cache.aset(key, True, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+            return response
+        finally:
+            _pinned.reset(token)
@@ -0,0 +1,229 @@
+"""
+media.py
+
+Servirea fisierelor din MEDIA_ROOT (imagini si fisiere de eveniment) cu verificare de acces:
+
+- can_read: evenimentele publicate sunt publice; restul (draft, pending, respinse) doar pentru
+  organizator, staff sau cu un URL semnat; upload-urile inca neatasate doar pentru proprietar
+- signed_url: URL-ul cu ?sig=... pe care EventSerializer il da pentru evenimentele nepublicate,
+  ca <img> / link-urile (care nu trimit token-ul JWT) sa functioneze pentru organizator
+- MediaView: dupa verificare, fisierul e predat serverului web din fata (MEDIA_SERVE_MODE
+  "nginx" -> X-Accel-Redirect, "sendfile" -> X-Sendfile); altfel ("django") e trimis in
+  streaming cu FileResponse, cu Range (reluare / cautare in video), ETag si Cache-Control
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from events.images import FORMATS, VARIANTS
+from events.models import Event
+from uploads.models import Upload
+from users.authentication import ClaimsJWTAuthentication
+
+SIGNATURE_PARAM = "sig"
+STREAM_BLOCK = 64 * 1024
+
+_signer = signing.TimestampSigner(salt="backend.media")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# event_images/poza__card-400.webp -> event_images/poza (vezi events.images.variant_name)
+_VARIANT_RE = re.compile(
+    rf"^(?P<stem>.+)__(?:{'|'.join(VARIANTS)})-\d+\.(?:{'|'.join(FORMATS)})$"
+)
+
+
+# ---- acces ----
+
+def sign(name):
+    # doar "timestamp:semnatura"; numele fisierului e deja in URL
+    return _signer.sign(name)[len(name) + 1:]
+
+
+def signed_url(url, name):
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}{SIGNATURE_PARAM}={sign(name)}"
+
+
+def _valid_signature(name, token):
+    if not token:
+        return False
+    try:
+        _signer.unsign(f"{name}:{token}", max_age=settings.MEDIA_SIGNATURE_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _owner_info(name):
+    """(status, organizer_id) pentru evenimentul fisierului, ("upload", owner_id) sau None."""
+    key = f"media:owner:{name}"
+    info = cache.get(key)
+    if info is not None:
+        return tuple(info) if info else None
+
+    lookup = Q(image=name) | Q(file=name)
+    variant = _VARIANT_RE.match(name)
+    if variant:
+        lookup |= Q(image__startswith=variant["stem"] + ".")
+    info = Event.objects.filter(lookup).values_list("status", "organizer_id").first()
+    if info is None:
+        owner_id = Upload.objects.filter(stored_name=name).values_list("owner_id", flat=True).first()
+        info = ("upload", owner_id) if owner_id is not None else None
+
+    # cache scurt: un eveniment publicat / retras devine vizibil / invizibil in cateva secunde
+    cache.set(key, info or (), settings.MEDIA_ACCESS_CACHE_SECONDS)
+    return info
+
+
+def can_read(request, name):
+    """(acces permis, fisier public)."""
+    info = _owner_info(name)
+    if info is None:
+        # fisier fara eveniment / upload: nu il expunem
+        return False, False
+    status, owner_id = info
+    if status == "published":
+        return True, True
+
+    user = request.user
+    if user.is_authenticated and (user.id == owner_id or (user.is_staff and status != "upload")):
+        return True, False
+    return status != "upload" and _valid_signature(name, request.GET.get(SIGNATURE_PARAM)), False
+
+
+# ---- servire ----
+
+class _RangeFile:
+    """Fisierul de la pozitia curenta, limitat la `length` bytes (fara fileno, deci fara sendfile)."""
+
+    def __init__(self, fh, length):
+        self.fh = fh
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+
+def _parse_range(header, size):
+    """(start, end) inclusiv; None = fisierul intreg; ValueError = interval nesatisfiabil."""
+    match = _RANGE_RE.match(header or "")
+    if not match:
+        # lipsa, mai multe intervale sau alta unitate: raspundem cu tot fisierul (permis de RFC 9110)
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        # "bytes=-500": ultimii 500 de bytes
+        start, end = max(size - int(end), 0), size - 1
+        if end < 0:
+            raise ValueError
+        return start, end
+    start, end = int(start), min(int(end) if end else size - 1, size - 1)
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return parse_http_date_safe(value) == int(mtime)
+
+
+def _stream(request, path, stat, etag, content_type):
+    size = stat.st_size
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = _parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    fh = open(path, "rb")
+    if byte_range is None:
+        # FileResponse peste fisierul real: serverul WSGI poate folosi sendfile()
+        response = FileResponse(fh, content_type=content_type)
+    else:
+        start, end = byte_range
+        fh.seek(start)
+        response = FileResponse(_RangeFile(fh, end - start + 1), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response.block_size = STREAM_BLOCK
+    return response
+
+
+class MediaView(APIView):
+    """GET /media/<path>: verifica accesul, apoi serveste sau preda fisierul serverului web."""
+
+    # JWT fara query pe user (din claims); sesiunea acopera previzualizarile din admin
+    authentication_classes = [ClaimsJWTAuthentication, SessionAuthentication]
+    permission_classes = [AllowAny]
+
+    def get(self, request, path):
+        try:
+            full_path = default_storage.path(path)
+        except SuspiciousFileOperation:
+            raise Http404
+        # numele normalizat, asa cum e salvat in DB (fara "./", "//" etc.)
+        name = os.path.relpath(full_path, default_storage.location).replace(os.sep, "/")
+
+        allowed, public = can_read(request, name)
+        if not allowed:
+            # 404, nu 403: nu confirmam existenta fisierelor private
+            raise Http404
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            raise Http404
+
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            mode = settings.MEDIA_SERVE_MODE
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if mode == "nginx":
+                # location interna in nginx (alias catre MEDIA_ROOT); nginx face Range / ETag
+                response = HttpResponse(content_type=content_type)
+                response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+            elif mode == "sendfile":
+                # Apache mod_xsendfile / lighttpd
+                response = HttpResponse(content_type=content_type)
+                response["X-Sendfile"] = full_path
+            else:
+                response = _stream(request, full_path, stat, etag, content_type)
+                response["Accept-Ranges"] = "bytes"
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        visibility = "public" if public else "private"
+        response["Cache-Control"] = f"{visibility}, max-age={settings.MEDIA_CACHE_SECONDS}, must-revalidate"
+        return response
@@ -0,0 +1,230 @@
+"""
+metrics.py
+
+Instrumentare per request, destul de ieftina cat sa ramana pornita in productie:
+
+- RequestMetricsMiddleware: per nume de ruta (view_name) masoara durata totala, numarul de
+  query-uri si timpul petrecut in DB (connection.execute_wrapper), timpul de serializare
+  (TimedSerializerMixin), timpul de randare JSON (backend.renderers.TimedJSONRenderer) si
+  marimea raspunsului; merge si sync (WSGI), si
+  async (ASGI). Header-ul Server-Timing se adauga doar cu DEBUG sau pentru staff (altfel ar
+  expune timpii DB oricui)
+- TimedSerializerMixin: opt-in pe serializer-ele de citire; cronometreaza to_representation
+  (acolo se duce timpul, in view, inainte de randare)
+- MetricsView: /metrics, histograme in format text Prometheus, doar pentru staff
+
+Histogramele sunt tinute in memorie, per proces (fiecare worker isi expune propriile valori).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serializer_time", "serializer_depth", "render_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: se apeleaza pentru fiecare query de pe conexiune
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # contoare per bucket (+Inf la final), suma, numar
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+
+        for labels, counts, total, count in sorted(series):
+            label_str = ",".join(f'{key}="{value}"' for key, value in labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_str},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_str}}} {total}")
+            lines.append(f"{self.name}_count{{{label_str}}} {count}")
+        return "\n".join(lines)
+
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Durata totala a request-ului.", TIME_BUCKETS)
+DB_QUERIES = Histogram("http_request_db_queries", "Numarul de query-uri SQL per request.", COUNT_BUCKETS)
+DB_DURATION = Histogram("http_request_db_duration_seconds", "Timpul petrecut in DB per request.", TIME_BUCKETS)
+SERIALIZER_DURATION = Histogram(
+    "http_request_serializer_duration_seconds", "Timpul petrecut in serializer-ele DRF.", TIME_BUCKETS
+)
+RENDER_DURATION = Histogram(
+    "http_request_render_duration_seconds", "Timpul de randare a raspunsului DRF (JSON).", TIME_BUCKETS
+)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Marimea corpului raspunsului.", SIZE_BUCKETS)
+
+HISTOGRAMS = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, RENDER_DURATION, RESPONSE_SIZE)
+
+
+def current_stats():
+    """Statisticile request-ului curent (None in afara RequestMetricsMiddleware)."""
+    return _current.get()
+
+
+class TimedSerializerMixin:
+    """Se pune inaintea clasei DRF: class EventSerializer(TimedSerializerMixin, ModelSerializer)."""
+
+    def to_representation(self, instance):
+        stats = _current.get()
+        # serializer-ele imbricate (sau elementele unei liste) nu se numara de doua ori
+        if stats is None or stats.serializer_depth:
+            return super().to_representation(instance)
+
+        stats.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            stats.serializer_depth -= 1
+            stats.serializer_time += time.perf_counter() - started
+
+
+def _wrap_connections(stats):
+    """execute_wrapper pe conexiunile firului curent; in async se apeleaza prin sync_to_async,
+    pe firul pe care ruleaza si query-urile request-ului."""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+    return stack
+
+
+def _is_staff(request):
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_staff)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _route(request):
+        match = getattr(request, "resolver_match", None)
+        # rutele necunoscute (404) sunt grupate, ca sa nu explodeze numarul de serii
+        return match.view_name if match and match.view_name else "<unresolved>"
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with _wrap_connections(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - started
+
+        self._observe(request, response, stats, duration)
+        if settings.DEBUG or _is_staff(request):
+            self._server_timing(response, stats, duration)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            stack = await sync_to_async(_wrap_connections)(stats)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - started
+
+        self._observe(request, response, stats, duration)
+        # request.user poate fi inca lazy (sesiunea se citeste din DB)
+        if settings.DEBUG or await sync_to_async(_is_staff)(request):
+            self._server_timing(response, stats, duration)
+        return response
+
+    def _observe(self, request, response, stats, duration):
+        labels = (("method", request.method), ("view", self._route(request)))
+        REQUEST_DURATION.observe(labels, duration)
+        DB_QUERIES.observe(labels, stats.queries)
+        DB_DURATION.observe(labels, stats.db_time)
+        SERIALIZER_DURATION.observe(labels, stats.serializer_time)
+        RENDER_DURATION.observe(labels, stats.render_time)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+
+    @staticmethod
+    def _server_timing(response, stats, duration):
+        response["Server-Timing"] = ", ".join(
+            (
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                f"ser;dur={stats.serializer_time * 1000:.1f}",
+                f"render;dur={stats.render_time * 1000:.1f}",
+                f"total;dur={duration * 1000:.1f}",
+            )
+        )
+
+
+class MetricsView(APIView):
+    # JWT de staff sau sesiunea din /admin/
+    authentication_classes = APIView.authentication_classes + [SessionAuthentication]
+    permission_classes = [IsAdminUser]
+    swagger_schema = None
+
+    def get(self, request):
+        body = "\n".join(histogram.expose() for histogram in HISTOGRAMS) + "\n"
+        return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,104 @@
+"""
+moderation.py
+
+Moderare pe loturi pentru evenimente si cereri de organizator (API-ul de staff si actiunile
+din admin folosesc aceleasi functii):
+
+- moderate_events / moderate_organizer_requests: un singur UPDATE per tabela pentru tot lotul;
+  notificarile catre organizatori sunt puse la coada (jobs) ca un singur job per lot
+- status_counts: numarul de randuri per status pentru ambele tabele, intr-un singur query
+  (GROUP BY status pe fiecare tabela, unite cu UNION ALL)
+- cached_pending_counts: acelasi rezultat tinut in cache, pentru mesajele din admin
+
+Randurile care nu mai sunt in asteptare (moderate intre timp de altcineva) sunt sarite.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, Count, Value
+from django.utils import timezone
+
+from events.models import Event
+from events.tasks import notify_moderated_events
+from interactions.tasks import send_notifications
+from users.authentication import invalidate_tokens
+from users.models import OrganizerRequest
+
+PENDING_CACHE_KEY = "moderation:status-counts"
+# cate id-uri accepta un singur apel al API-ului de moderare
+MAX_BATCH = 1000
+ADMIN_COUNT_CACHE_SECONDS = getattr(settings, "ADMIN_COUNT_CACHE_SECONDS", 60)
+
+REQUEST_MESSAGES = {
+    "approved": ("Cerere aprobată", "Cererea ta de organizator a fost aprobată. Acum poți crea evenimente."),
+    "rejected": ("Cerere respinsă", "Cererea ta de organizator a fost respinsă."),
+}
+
+
+def _lock(queryset, ids, statuses, *fields):
+    # SELECT ... FOR UPDATE: doi moderatori pe acelasi lot nu trimit notificari duble
+    queryset = queryset.select_for_update().filter(pk__in=ids)
+    if statuses is not None:
+        queryset = queryset.filter(status__in=statuses)
+    return list(queryset.values_list("pk", *fields))
+
+
+def moderate_events(ids, status, statuses=("pending",)):
+    """
+    Publica / respinge evenimentele date; intoarce id-urile modificate.
+    `statuses=None` modereaza din orice status (actiunile din admin).
+    """
+    with transaction.atomic():
+        ids = [pk for pk, in _lock(Event.objects.exclude(status=status), ids, statuses)]
+        if ids:
+            Event.objects.filter(pk__in=ids).update(status=status, updated_at=timezone.now())
+            notify_moderated_events.enqueue(event_ids=ids, status=status)
+    cache.delete(PENDING_CACHE_KEY)
+    return ids
+
+
+def moderate_organizer_requests(ids, status, statuses=("pending",)):
+    """
+    Aproba / respinge cererile date; la aprobare userii devin organizatori (si li se revoca
+    token-urile, ca noul rol sa apara in claims). Intoarce id-urile modificate.
+    """
+    with transaction.atomic():
+        rows = _lock(OrganizerRequest.objects.exclude(status=status), ids, statuses, "user_id")
+        if rows:
+            user_ids = [user_id for _, user_id in rows]
+            OrganizerRequest.objects.filter(pk__in=[pk for pk, _ in rows]).update(status=status)
+            if status == "approved":
+                invalidate_tokens(user_ids, is_organizer=True)
+            title, message = REQUEST_MESSAGES[status]
+            send_notifications.enqueue(user_ids=user_ids, title=title, message=message)
+    cache.delete(PENDING_CACHE_KEY)
+    return [pk for pk, _ in rows]
+
+
+def _grouped(queryset, kind):
+    return (
+        queryset.order_by()
+        .values("status")
+        .annotate(kind=Value(kind, output_field=CharField()), total=Count("pk"))
+        .values_list("kind", "status", "total")
+    )
+
+
+def status_counts():
+    """{"events": {"pending": 3, ...}, "organizer_requests": {...}}"""
+    counts = {"events": {}, "organizer_requests": {}}
+    rows = _grouped(Event.objects.all(), "events").union(
+        _grouped(OrganizerRequest.objects.all(), "organizer_requests"), all=True
+    )
+    for kind, status, total in rows:
+        counts[kind][status] = total
+    return counts
+
+
+def cached_pending_counts():
+    counts = cache.get(PENDING_CACHE_KEY)
+    if counts is None:
+        counts = status_counts()
+        cache.set(PENDING_CACHE_KEY, counts, ADMIN_COUNT_CACHE_SECONDS)
+    return counts
@@ -0,0 +1,69 @@
+"""
+query_budgets.py
+
+Bugetul de query-uri SQL al fiecarui endpoint din api/events, api/interactions si api/users.
+
+- QUERY_BUDGETS: ruta (ca in urls.py) -> metoda -> numarul maxim de query-uri per request
+- api_routes: rutele unei aplicatii, pentru verificarea ca fiecare are buget
+
+Bugetele sunt verificate de backend.testing.budgets.QueryBudgetTestCase (clasele <App>QueryBudgetTests
+din <app>/tests.py), care ruleaza fiecare endpoint cu 1, 10 si 100 de randuri legate.
+
+O modificare de serializer care adauga un query per rand pica testele. Daca un endpoint
+are nevoie legitim de mai multe query-uri, bugetul se mareste aici, explicit.
+"""
+
+from django.urls import URLResolver, get_resolver
+
+QUERY_BUDGETS = {
+    # events
+    "api/events/": {"GET": 1, "POST": 7},
+    "api/events/my/": {"GET": 2},
+    "api/events/import/": {"POST": 11},
+    "api/events/recommended/": {"GET": 2},
+    "api/events/<int:pk>/": {"GET": 1, "PATCH": 4, "DELETE": 7},
+    "api/events/<int:pk>/stats/": {"GET": 8},
+    "api/events/<int:pk>/attendees/": {"GET": 3},
+    "api/events/faculties/": {"GET": 1},
+    "api/events/faculties/<int:pk>/calendar.ics": {"GET": 3},
+    "api/events/departments/": {"GET": 1},
+    "api/events/categories/": {"GET": 1},
+    "api/events/locations/": {"GET": 1},
+    "api/events/admin/moderation/": {"GET": 4},
+    "api/events/admin/moderation/bulk/": {"POST": 6},
+    # interactions
+    "api/interactions/tickets/": {"GET": 3},
+    "api/interactions/tickets/buy/": {"POST": 7},
+    "api/interactions/tickets/<int:pk>/": {"DELETE": 5},
+    "api/interactions/favorites/": {"GET": 3, "POST": 5},
+    "api/interactions/favorites/<int:pk>/": {"DELETE": 4},
+    "api/interactions/favorites/event/<int:event_id>/": {"PUT": 3, "DELETE": 4},
+    "api/interactions/reviews/": {"POST": 5},
+    "api/interactions/notifications/": {"GET": 2},
+    "api/interactions/calendar/": {"GET": 2, "POST": 2},
+    "api/interactions/calendar/<str:token>.ics": {"GET": 3},
+    # uploads
+    "api/uploads/": {"POST": 2},
+    "api/uploads/<uuid:pk>/": {"GET": 2, "PATCH": 6, "DELETE": 3},
+    # users
+    "api/users/register/": {"POST": 2},
+    "api/users/profile/": {"GET": 1},
+    "api/users/change-password/": {"POST": 2},
+    "api/users/organizer-request/": {"POST": 3},
+    "api/users/organizer-request/me/": {"GET": 2},
+    "api/users/admin/organizer-requests/": {"GET": 2},
+    "api/users/admin/organizer-requests/<int:pk>/": {"PATCH": 8},
+    "api/users/admin/organizer-requests/bulk/": {"POST": 7},
+}
+
+# rute care nu pot fi rulate in teste, cu motivul
+UNBUDGETED_ROUTES = {
+    "api/users/google/": "valideaza un ID token real la Google",
+}
+
+def api_routes(prefix):
+    """Toate rutele (ca string-uri) incluse sub prefixul dat, ex. "api/events/"."""
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver) and str(pattern.pattern) == prefix:
+            return [prefix + str(child.pattern) for child in pattern.url_patterns]
+    return []
@@ -0,0 +1,177 @@
+"""
+query_inspector.py
+
+Detector de N+1 si jurnal de query-uri lente, pentru dezvoltare si teste (opt-in).
+
+- inspect_queries(): context manager care inregistreaza toate query-urile SQL si le
+  grupeaza dupa forma normalizata (fara valori) + stiva de apel din codul proiectului
+- QueryInspectorMiddleware: ruleaza fiecare request (sync sau async) sub inspect_queries cand
+  QUERY_INSPECTOR e activ; la N+1 logheaza sau (QUERY_INSPECTOR_RAISE) arunca NPlusOneError
+- query-urile mai lente de SLOW_QUERY_MS ajung in logger-ul "backend.slow_queries",
+  impreuna cu planul de executie (EXPLAIN)
+
+In teste se activeaza automat din backend.test_runner.QueryInspectorTestRunner.
+"""
+
+import logging
+import re
+import time
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger("backend.queries")
+slow_logger = logging.getLogger("backend.slow_queries")
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%s|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+# cadre din proiect care apar in orice stiva (middleware-uri, manage.py) si nu spun nimic
+_INFRA_FILES = ("manage.py", "backend/metrics.py", "backend/db_router.py", "backend/query_inspector.py")
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def normalize_sql(sql):
+    """Forma query-ului fara valori: WHERE id = 3 si WHERE id = 7 devin aceeasi forma."""
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def _project_stack(limit=6):
+    """Ultimele cadre din codul proiectului (fara Django/DRF si fara middleware-uri)."""
+    base_dir = str(settings.BASE_DIR)
+    frames = []
+    for frame in traceback.extract_stack():
+        if not frame.filename.startswith(base_dir) or "site-packages" in frame.filename:
+            continue
+        path = frame.filename[len(base_dir) + 1:]
+        if path not in _INFRA_FILES:
+            frames.append(f"{path}:{frame.lineno} in {frame.name}")
+    return tuple(frames[-limit:])
+
+
+class QueryInspector:
+    def __init__(self, threshold=None, slow_ms=None):
+        # 0 e o valoare valida ("orice repetare"), nu "nesetat"
+        self.threshold = threshold if threshold is not None else getattr(settings, "QUERY_INSPECTOR_THRESHOLD", 5)
+        self.slow_ms = slow_ms if slow_ms is not None else getattr(settings, "SLOW_QUERY_MS", 100)
+        self.groups = defaultdict(int)
+        self.total = 0
+        self._explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._explaining:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.total += 1
+            self.groups[(normalize_sql(sql), _project_stack())] += 1
+            if elapsed_ms >= self.slow_ms and not many:
+                self._log_slow(context["connection"], sql, params, elapsed_ms)
+
+    def _log_slow(self, connection, sql, params, elapsed_ms):
+        plan = ""
+        if sql.lstrip().upper().startswith("SELECT"):
+            self._explaining = True
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                    plan = "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+            except DatabaseError as exc:
+                plan = f"(EXPLAIN indisponibil: {exc})"
+            finally:
+                self._explaining = False
+
+        slow_logger.warning("%.1fms %s\n%s", elapsed_ms, sql, plan)
+
+    def repeated(self):
+        """Formele de query rulate de mai mult de `threshold` ori din acelasi loc."""
+        return sorted(
+            ((count, sql, stack) for (sql, stack), count in self.groups.items() if count > self.threshold),
+            reverse=True,
+        )
+
+    def report(self, label=""):
+        lines = []
+        for count, sql, stack in self.repeated():
+            lines.append(f"{count}x {sql}")
+            lines.extend(f"    {frame}" for frame in stack)
+        if not lines:
+            return ""
+        return f"N+1 in {label or 'bloc'} ({self.total} query-uri):\n" + "\n".join(lines)
+
+    def assert_no_n_plus_one(self, label=""):
+        message = self.report(label)
+        if message:
+            raise NPlusOneError(message)
+
+
+@contextmanager
+def inspect_queries(threshold=None, slow_ms=None):
+    """
+    with inspect_queries() as inspector:
+        ...
+    inspector.assert_no_n_plus_one()
+    """
+    inspector = QueryInspector(threshold, slow_ms)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield inspector
+
+
+class QueryInspectorMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSPECTOR", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with inspect_queries() as inspector:
+            response = self.get_response(request)
+        return self._check(request, inspector, response)
+
+    async def __acall__(self, request):
+        # wrapper-ele se pun pe conexiunile firului care ruleaza ORM-ul (sync_to_async)
+        context = inspect_queries()
+        inspector = await sync_to_async(context.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(context.__exit__)(None, None, None)
+        return self._check(request, inspector, response)
+
+    def _check(self, request, inspector, response):
+        message = inspector.report(f"{request.method} {request.path}")
+        if message:
+            if getattr(settings, "QUERY_INSPECTOR_RAISE", False):
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
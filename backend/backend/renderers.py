@@ -0,0 +1,26 @@
+"""
+renderers.py
+
+- TimedJSONRenderer: JSONRenderer-ul DRF care aduna timpul de randare in statisticile
+  request-ului curent (vezi backend/metrics.py); setat in DEFAULT_RENDERER_CLASSES
+"""
+
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # import local: metrics.py importa APIView, care citeste DEFAULT_RENDERER_CLASSES
+        from .metrics import current_stats
+
+        stats = current_stats()
+        if stats is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            stats.render_time += time.perf_counter() - started
@@ -15,6 +15,7 @@ from pathlib import Path
 from datetime import timedelta # 29.11.25 For setting token expiration times
 from dotenv import load_dotenv # 29.11.25 For loading environment variables from a .env file
 import os                      # 29.11.25 For accessing environment variables
+from corsheaders.defaults import default_headers  # headere CORS implicite, extinse pentru upload pe bucati
 
 load_dotenv()                  # 29.11.25 Load environment variables from a .env file if present
 
@@ -36,12 +37,77 @@ ALLOWED_HOSTS = ["*"] # 29.11.25 Set to allow all hosts for development purposes
 # 29.11.25 Django REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-      "rest_framework_simplejwt.authentication.JWTAuthentication",
+      "users.authentication.VersionedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
       "rest_framework.permissions.IsAuthenticated",
     ),
+    # JSONRenderer cronometrat pentru metrici (vezi backend/metrics.py)
+    "DEFAULT_RENDERER_CLASSES": (
+      "backend.renderers.TimedJSONRenderer",
+      "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # Token bucket pe endpoint-urile fierbinti (vezi backend/throttling.py)
+    "DEFAULT_THROTTLE_RATES": {
+      "ticket_buy": os.getenv("THROTTLE_TICKET_BUY", "10/min"),
+      "login": os.getenv("THROTTLE_LOGIN", "10/min"),
+      "register": os.getenv("THROTTLE_REGISTER", "10/hour"),
+    },
+}
+
+# Cache-uri: starea de throttling sta separat, ca sa poata fi mutata pe un backend partajat.
+# LocMemCache e per proces: cu mai multi workeri, "default" (versiunea token-urilor, vezi
+# users/authentication.py) si "throttle" trebuie mutate pe un cache partajat (Redis, Memcached)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    },
 }
+THROTTLE_CACHE = "throttle"
+
+# Pe ASGI (uvicorn) endpoint-urile de citire folosesc variantele async (vezi backend/async_views.py)
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "0") == "1"
+
+# Cate cumparari de bilete ruleaza simultan per eveniment; restul primesc imediat 429
+TICKET_PURCHASE_CONCURRENCY = int(os.getenv("TICKET_PURCHASE_CONCURRENCY", 4))
+
+# Detector N+1 / jurnal de query-uri lente (vezi backend/query_inspector.py); in teste e mereu activ
+QUERY_INSPECTOR = os.getenv("QUERY_INSPECTOR", "0") == "1"
+QUERY_INSPECTOR_RAISE = os.getenv("QUERY_INSPECTOR_RAISE", "0") == "1"
+QUERY_INSPECTOR_THRESHOLD = int(os.getenv("QUERY_INSPECTOR_THRESHOLD", 5))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+TEST_RUNNER = "backend.test_runner.QueryInspectorTestRunner"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_queries": {
+            "class": "logging.FileHandler",
+            "filename": os.getenv("SLOW_QUERY_LOG", BASE_DIR / "slow_queries.log"),
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "backend.queries": {"handlers": ["console"], "level": "WARNING"},
+        "backend.slow_queries": {"handlers": ["slow_queries"], "level": "WARNING", "propagate": False},
+    },
+}
+
+# Coada de job-uri (vezi jobs/queue.py): backoff la reincercari si timeout pentru job-uri abandonate
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", 10))
+JOB_RETRY_MAX_SECONDS = int(os.getenv("JOB_RETRY_MAX_SECONDS", 3600))
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", 15 * 60))
+
+# Admin pe tabele mari (vezi backend/admin_utils.py): peste limita, changelist-ul foloseste
+# estimarea Postgres in loc de COUNT(*); contoarele de "in asteptare" (backend/moderation.py) stau in cache
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", 10000))
+ADMIN_COUNT_CACHE_SECONDS = int(os.getenv("ADMIN_COUNT_CACHE_SECONDS", 60))
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -73,6 +139,8 @@ INSTALLED_APPS = [
     "users",                # 29.11.25 Custom user app
     "events",               # 29.11.25 Events app
     "interactions",         # 29.11.25 Interactions app
+    "jobs",                 # coada de job-uri in DB + manage.py run_worker
+    "uploads",              # upload pe bucati, reluabil (imagini / fisiere de eveniment)
     "rest_framework",       # 29.11.25 Added for Django REST Framework
     "corsheaders",          # 29.11.25 Added for handling CORS
     "django_filters",       # 29.11.25 Added for filtering support
@@ -81,10 +149,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.metrics.RequestMetricsMiddleware',  # durata / query-uri / Server-Timing per ruta (vezi /metrics)
+    'backend.query_inspector.QueryInspectorMiddleware',  # detector N+1, activ doar cu QUERY_INSPECTOR
     "corsheaders.middleware.CorsMiddleware",  # 29.11.25 CORS middleware
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'backend.db_router.ReplicaPinningMiddleware',  # citiri pe replici, pin pe primary dupa scrieri
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -96,7 +167,7 @@ ROOT_URLCONF = 'backend.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -127,6 +198,44 @@ DATABASES = {
     }
 }
 
+# Pool de conexiuni psycopg (Django >= 5.1); DB_POOL_MAX_SIZE=0 il dezactiveaza
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+
+if DB_POOL_MAX_SIZE > 0:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['OPTIONS'] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            # conexiunea e verificata inainte sa fie data din pool
+            "check": ConnectionPool.check_connection,
+        },
+    }
+else:
+    # fara pool: conexiuni persistente, verificate la inceputul fiecarui request
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv("DB_CONN_MAX_AGE", 60))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Replici de citire: DB_REPLICA_HOSTS="host1,host2:5433" => alias-urile replica_1, replica_2
+for i, replica in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    host, _, port = replica.strip().partition(":")
+    DATABASES[f"replica_{i}"] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ["backend.db_router.PrimaryReplicaRouter"]
+
+# Cat timp (secunde) citirile unui client raman pe primary dupa ce a scris
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+# Cache-ul in care se tine pin-ul; cu replici trebuie partajat intre workeri (nu LocMemCache),
+# altfel GET-ul de dupa un POST ajunge pe alt worker, care nu stie de pin
+REPLICA_PIN_CACHE = os.getenv("REPLICA_PIN_CACHE", "default")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -171,8 +280,27 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CORS_ALLOW_ALL_ORIGINS = True           # 29.11.25 Allow all origins for CORS (development only)
 CORS_ALLOWS_CREDENTIALS = True          # 29.11.25 Allow cookies to be included in cross-site HTTP requests
+CORS_ALLOW_HEADERS = (*default_headers, "upload-offset", "upload-checksum")  # upload pe bucati
+CORS_EXPOSE_HEADERS = ["Upload-Offset"]
 AUTH_USER_MODEL = 'users.CustomUser'    # 29.11.25 Use custom user model
 
 # 15.12.25 Media files settings
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Servirea media cu verificare de acces (vezi backend/media.py): "django" (streaming cu Range),
+# "nginx" (X-Accel-Redirect catre o location `internal` cu alias la MEDIA_ROOT) sau "sendfile"
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "django")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+# scurt, cu revalidare (ETag -> 304): un fisier public devine privat cand evenimentul e retras
+MEDIA_CACHE_SECONDS = int(os.getenv("MEDIA_CACHE_SECONDS", 300))
+# valabilitatea URL-urilor semnate pentru fisierele evenimentelor nepublicate
+MEDIA_SIGNATURE_MAX_AGE = int(os.getenv("MEDIA_SIGNATURE_MAX_AGE", 24 * 3600))
+MEDIA_ACCESS_CACHE_SECONDS = int(os.getenv("MEDIA_ACCESS_CACHE_SECONDS", 60))
+
+# Upload pe bucati (vezi uploads/views.py). Directorul temporar ar trebui sa fie pe acelasi disc
+# cu MEDIA_ROOT, ca fisierul terminat sa fie mutat (rename), nu copiat
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", os.path.join(BASE_DIR, 'upload_tmp'))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024))
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 100 * 1024 * 1024))
+UPLOAD_EXPIRE_HOURS = float(os.getenv("UPLOAD_EXPIRE_HOURS", 24))
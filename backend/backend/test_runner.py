@@ -0,0 +1,39 @@
+"""
+test_runner.py
+
+Runner-ul de teste al proiectului: `manage.py test` ruleaza cu detectorul de N+1 pornit
+(vezi backend/query_inspector.py), deci un request din teste care repeta acelasi query
+de mai mult de QUERY_INSPECTOR_THRESHOLD ori pica testul.
+
+--allow-n-plus-one: doar logheaza (util cand se investigheaza o regresie).
+"""
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class QueryInspectorTestRunner(DiscoverRunner):
+    def __init__(self, allow_n_plus_one=False, **kwargs):
+        super().__init__(**kwargs)
+        self.allow_n_plus_one = allow_n_plus_one
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--allow-n-plus-one",
+            action="store_true",
+            help="Logheaza query-urile N+1 in loc sa pice testele.",
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._inspector_settings = override_settings(
+            QUERY_INSPECTOR=True,
+            QUERY_INSPECTOR_RAISE=not self.allow_n_plus_one,
+        )
+        self._inspector_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._inspector_settings.disable()
+        super().teardown_test_environment(**kwargs)
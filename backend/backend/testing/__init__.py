@@ -0,0 +1,8 @@
+"""
+testing
+
+Baza comuna pentru testele din <app>/tests.py (nu e importata de codul de productie):
+
+- factories.ApiTestCase: APITestCase cu fabricile de date (make_user, make_events, ...)
+- budgets.QueryBudgetTestCase: verificarea bugetelor din backend/query_budgets.py
+"""
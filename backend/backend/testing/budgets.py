@@ -0,0 +1,99 @@
+"""
+budgets.py
+
+QueryBudgetTestCase: baza claselor <App>QueryBudgetTests; ruleaza fiecare endpoint cu 1, 10 si
+100 de randuri legate si verifica ca numarul de query-uri nu depinde de N si nu depaseste
+bugetul din backend/query_budgets.py. Testele de functionalitate folosesc factories.ApiTestCase.
+"""
+
+import re
+
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from backend.query_budgets import QUERY_BUDGETS, UNBUDGETED_ROUTES, api_routes
+from users.serializers import MyTokenObtainPairSerializer
+
+from .factories import ApiTestCase
+
+SIZES = (1, 10, 100)
+
+_CONVERTER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+class QueryBudgetTestCase(ApiTestCase):
+    # prefixul aplicatiei testate (ex. "api/events/"), obligatoriu in subclase
+    route_prefix = None
+
+    @classmethod
+    def setUpClass(cls):
+        if cls.route_prefix is None:
+            raise TypeError(f"{cls.__name__}: route_prefix lipseste")
+        super().setUpClass()
+
+    def test_routes_have_budgets(self):
+        missing = [
+            route
+            for route in api_routes(self.route_prefix)
+            if route not in QUERY_BUDGETS and route not in UNBUDGETED_ROUTES
+        ]
+        self.assertEqual(missing, [], "Rute fara buget in backend/query_budgets.py")
+
+    def _request(self, method, route, seeded):
+        path = "/" + _CONVERTER.sub(lambda m: str(seeded["kwargs"][m.group(1)]), route)
+        user = seeded.get("user")
+        if user is not None:
+            token = MyTokenObtainPairSerializer.get_token(user).access_token
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        else:
+            self.client.credentials()
+
+        # cache gol inainte de fiecare masurare: versiunea token-ului se citeste mereu din DB
+        for cache in caches.all():
+            cache.clear()
+
+        # corp brut (ex. bucatile de upload) sau JSON
+        if "content_type" in seeded:
+            options = {"content_type": seeded["content_type"]}
+        else:
+            options = {"format": "json"}
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method.lower())(
+                path, seeded.get("data"), **options, **seeded.get("headers", {})
+            )
+            # raspunsurile in streaming fac query-urile abia la citire
+            if getattr(response, "streaming", False):
+                response.streaming_content = list(response.streaming_content)
+        return response, queries
+
+    def assertQueryBudget(self, method, route, seed, status=200):
+        """
+        seed(n) creeaza n randuri legate si intoarce un dict cu:
+          user   - userul autentificat (optional)
+          kwargs - valorile pentru parametrii din ruta (optional)
+          data   - corpul request-ului (optional)
+          content_type - trimite `data` ca atare, cu acest Content-Type, in loc de JSON (optional)
+          headers      - header-e suplimentare, ex. {"HTTP_UPLOAD_OFFSET": "0"} (optional)
+        """
+        budget = QUERY_BUDGETS[route][method]
+        counts = {}
+        for n in SIZES:
+            with self.subTest(n=n), transaction.atomic():
+                seeded = seed(n)
+                seeded.setdefault("kwargs", {})
+                response, queries = self._request(method, route, seeded)
+                transaction.set_rollback(True)
+
+                self.assertEqual(response.status_code, status, getattr(response, "data", response))
+                counts[n] = len(queries)
+                self.assertLessEqual(
+                    counts[n],
+                    budget,
+                    f"{method} {route} cu N={n}: {counts[n]} query-uri, buget {budget}:\n"
+                    + "\n".join(q["sql"] for q in queries.captured_queries),
+                )
+
+        self.assertEqual(
+            len(set(counts.values())), 1, f"{method} {route}: numarul de query-uri depinde de N: {counts}"
+        )
@@ -0,0 +1,73 @@
+"""
+factories.py
+
+Date de test create direct in DB, fara endpoint-uri:
+
+- DataFactoryMixin: make_user, make_users, make_events, make_tickets
+- ApiTestCase: APITestCase + DataFactoryMixin, cu hasher de parole rapid
+"""
+
+import itertools
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import Category, Department, Event, Faculty, Location
+from interactions.models import Ticket
+from users.models import CustomUser
+
+_sequence = itertools.count()
+
+
+class DataFactoryMixin:
+    password = "parola-test-123"
+
+    def make_user(self, **fields):
+        fields.setdefault("email", f"user{next(_sequence)}@test.ro")
+        fields.setdefault("password", make_password(self.password))
+        return CustomUser.objects.create(**fields)
+
+    def make_users(self, n):
+        password = make_password(self.password)
+        return CustomUser.objects.bulk_create(
+            [CustomUser(email=f"user{next(_sequence)}@test.ro", password=password) for _ in range(n)]
+        )
+
+    def make_events(self, n, organizer=None, **fields):
+        organizer = organizer or self.make_user(is_organizer=True)
+        faculty = Faculty.objects.create(name=f"Facultate {next(_sequence)}", abbreviation="F")
+        department = Department.objects.create(faculty=faculty, name="Departament")
+        category = Category.objects.create(name="Categorie")
+        # cheia locatiei e unica: fiecare apel are sala lui
+        location = Location.objects.create(name=f"Aula {next(_sequence)}", address="Strada 1")
+        start = fields.pop("start_date", timezone.now() + timedelta(days=7))
+        defaults = {
+            "organizer": organizer,
+            "faculty": faculty,
+            "department": department,
+            "category": category,
+            "location": location,
+            "title": "Eveniment",
+            "description": "Descriere eveniment",
+            "start_date": start,
+            "end_date": fields.pop("end_date", start + timedelta(hours=2)),
+            "max_participants": 1000,
+            "status": "published",
+        }
+        defaults.update(fields)
+        return Event.objects.bulk_create([Event(**defaults) for _ in range(n)])
+
+    def make_tickets(self, pairs):
+        """Bilete pentru perechile (user, eveniment) date."""
+        return Ticket.objects.bulk_create(
+            [Ticket(user=user, event=event, qr_code_data=str(uuid.uuid4())) for user, event in pairs]
+        )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ApiTestCase(DataFactoryMixin, APITestCase):
+    pass
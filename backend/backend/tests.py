@@ -0,0 +1,338 @@
+import itertools
+import os
+import re
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.exceptions import Throttled
+
+from events.models import Category, Faculty
+from users.serializers import MyTokenObtainPairSerializer
+from . import db_router, metrics
+from .query_inspector import NPlusOneError, QueryInspectorMiddleware, inspect_queries, normalize_sql
+from .testing import factories
+from .throttling import THROTTLE_CACHE, EventPurchaseLimiter, TokenBucketThrottle
+
+
+class NormalizeSqlTests(TestCase):
+    def test_values_become_placeholders(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id = 3 AND name = 'O''Brien' AND x = %s"),
+            normalize_sql("SELECT * FROM t WHERE id = 7 AND name = 'Ana' AND x = ?"),
+        )
+        self.assertEqual(normalize_sql("SELECT 1.5,  'a'\n FROM t"), "SELECT ?, ? FROM t")
+
+    def test_in_lists_of_any_length_match(self):
+        self.assertEqual(normalize_sql("WHERE id IN (1, 2, 3)"), "WHERE id IN (...)")
+        self.assertEqual(normalize_sql("WHERE id IN (%s)"), normalize_sql("WHERE id IN (%s, %s)"))
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertEqual(normalize_sql('SELECT "t1"."col2" FROM t1'), 'SELECT "t1"."col2" FROM t1')
+
+
+class QueryInspectorTests(TestCase):
+    def lookups(self, count):
+        for pk in range(count):
+            Faculty.objects.filter(pk=pk).first()
+
+    def test_repeated_query_from_same_place_is_reported(self):
+        with inspect_queries(threshold=3) as inspector:
+            self.lookups(4)
+        [(count, sql, stack)] = inspector.repeated()
+        self.assertEqual(count, 4)
+        self.assertIn('FROM "events_faculty"', sql)
+        self.assertTrue(any("in lookups" in frame for frame in stack))
+        with self.assertRaises(NPlusOneError):
+            inspector.assert_no_n_plus_one("test")
+
+    def test_below_threshold_passes(self):
+        with inspect_queries(threshold=3) as inspector:
+            self.lookups(3)
+        self.assertEqual(inspector.repeated(), [])
+        self.assertEqual(inspector.total, 3)
+        inspector.assert_no_n_plus_one()
+
+    @override_settings(QUERY_INSPECTOR_THRESHOLD=10)
+    def test_zero_threshold_is_not_the_default(self):
+        with inspect_queries(threshold=0) as inspector:
+            self.lookups(1)
+        self.assertEqual(inspector.threshold, 0)
+        self.assertEqual(len(inspector.repeated()), 1)
+
+        with inspect_queries() as inspector:
+            self.lookups(1)
+        self.assertEqual(inspector.threshold, 10)
+
+    def test_slow_queries_are_logged_with_plan(self):
+        with self.assertLogs("backend.slow_queries", "WARNING") as logs:
+            with inspect_queries(slow_ms=0):
+                Faculty.objects.filter(name="x").exists()
+        query, plan = logs.output[0].split("\n", 1)
+        self.assertIn('FROM "events_faculty"', query)
+        # planul de executie (EXPLAIN) e atasat query-urilor SELECT
+        self.assertTrue(plan.strip())
+        self.assertNotIn("EXPLAIN indisponibil", plan)
+
+
+class QueryInspectorMiddlewareTests(TestCase):
+    @override_settings(QUERY_INSPECTOR=True, QUERY_INSPECTOR_RAISE=True)
+    async def test_async_requests_are_inspected(self):
+        async def view(request):
+            for pk in range(int(request.GET["n"])):
+                await Faculty.objects.filter(pk=pk).afirst()
+            return HttpResponse()
+
+        middleware = QueryInspectorMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().get("/", {"n": 5}))
+        with self.assertRaises(NPlusOneError):
+            await middleware(RequestFactory().get("/", {"n": 6}))
+
+
+class _TimedChild(metrics.TimedSerializerMixin, serializers.Serializer):
+    name = serializers.CharField()
+
+
+class _TimedParent(metrics.TimedSerializerMixin, serializers.Serializer):
+    name = serializers.CharField()
+    child = _TimedChild()
+
+
+class RequestMetricsTests(factories.ApiTestCase):
+    url = "/api/events/categories/"
+    labels = (("method", "GET"), ("view", "category-list"))
+
+    def setUp(self):
+        Category.objects.create(name="Categorie")
+        self.staff = self.make_user(is_staff=True)
+
+    def bearer(self, user):
+        return f"Bearer {MyTokenObtainPairSerializer.get_token(user).access_token}"
+
+    def observed_queries(self):
+        # (suma, numar) din histograma query-urilor per request
+        _, total, count = metrics.DB_QUERIES._series.get(self.labels, (None, 0, 0))
+        return total, count
+
+    def test_server_timing_only_for_staff_or_debug(self):
+        self.assertNotIn("Server-Timing", self.client.get(self.url))
+        self.assertNotIn("Server-Timing", self.client.get(self.url, HTTP_AUTHORIZATION=self.bearer(self.make_user())))
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.bearer(self.staff))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", ser;dur=[\d.]+, render;dur=[\d.]+, total;dur=')
+
+        with override_settings(DEBUG=True):
+            self.assertIn("Server-Timing", self.client.get(self.url))
+
+    def test_serializer_time_counts_each_top_level_object_once(self):
+        stats = metrics.RequestStats()
+        token = metrics._current.set(stats)
+        try:
+            # fiecare apel perf_counter avanseaza "ceasul" cu o secunda
+            with patch.object(metrics.time, "perf_counter", side_effect=itertools.count()):
+                data = _TimedParent([{"name": "a", "child": {"name": "b"}}] * 3, many=True).data
+        finally:
+            metrics._current.reset(token)
+        self.assertEqual(data[0]["child"], {"name": "b"})
+        # 3 elemente x 1s; copilul imbricat nu se mai cronometreaza separat
+        self.assertEqual(stats.serializer_time, 3)
+
+    def test_queries_are_observed_per_route(self):
+        total, count = self.observed_queries()
+        self.client.get(self.url)
+        new_total, new_count = self.observed_queries()
+        self.assertEqual(new_count, count + 1)
+        self.assertGreaterEqual(new_total, total + 1)
+
+    async def test_async_stack_counts_queries(self):
+        staff = self.bearer(self.staff)
+        total, count = self.observed_queries()
+        response = await self.async_client.get(self.url, headers={"Authorization": staff})
+        self.assertEqual(response.status_code, 200)
+
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreaterEqual(queries, 1)
+        self.assertEqual(self.observed_queries(), (total + queries, count + 1))
+
+
+class _ScopedView:
+    throttle_scope = "test"
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        caches[THROTTLE_CACHE].clear()
+        rates = patch.dict(TokenBucketThrottle.THROTTLE_RATES, {"test": "4/min"})
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+        self.request.user = None
+        self.now = 600.0  # inceputul unei ferestre de 60s
+
+    def allow(self):
+        throttle = TokenBucketThrottle()
+        throttle.timer = lambda: self.now
+        allowed = throttle.allow_request(self.request, _ScopedView())
+        return allowed, throttle.wait()
+
+    def test_burst_up_to_rate_then_throttled(self):
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True] * 4)
+        allowed, wait = self.allow()
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 60)
+
+    def test_rejected_requests_do_not_use_up_the_window(self):
+        for _ in range(10):
+            self.allow()
+        # o fereastra mai tarziu, la jumatate: conteaza doar jumatate din cele 4 reusite
+        self.now += 90
+        self.assertEqual([self.allow()[0] for _ in range(3)], [True, True, False])
+
+    def test_limit_is_per_client(self):
+        for _ in range(4):
+            self.allow()
+        self.assertFalse(self.allow()[0])
+        self.request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.2")
+        self.request.user = None
+        self.assertTrue(self.allow()[0])
+
+
+class EventPurchaseLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches[THROTTLE_CACHE]
+        self.cache.clear()
+        self.limiter = EventPurchaseLimiter(limit=2, retry_after=3)
+
+    def test_extra_purchases_fail_fast(self):
+        with self.limiter.slot(1), self.limiter.slot(1):
+            with self.assertRaises(Throttled) as raised:
+                with self.limiter.slot(1):
+                    pass
+            self.assertEqual(raised.exception.wait, 3)
+            # alt eveniment are propriul semafor
+            with self.limiter.slot(2):
+                pass
+        self.assertEqual(self.cache.get("purchase_slots_1"), 0)
+        with self.limiter.slot(1):
+            pass
+
+    def test_counter_never_goes_negative_after_expiry(self):
+        with self.limiter.slot(1):
+            # contorul expira cat timp slotul e ocupat, apoi e recreat de alta cumparare
+            self.cache.delete("purchase_slots_1")
+            with self.limiter.slot(1):
+                pass
+        self.assertEqual(self.cache.get("purchase_slots_1"), 0)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Doua baze SQLite: "default" (primary) si "replica_1", o replica goala care nu prinde scrierile."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # alias-ul se adauga dupa pornirea clasei: runner-ul nu trebuie sa creeze o baza de test
+        # pentru el, iar tranzactiile TestCase per test il includ de aici inainte
+        cls.tmp = tempfile.mkdtemp()
+        replica = {**connections.settings["default"], "NAME": os.path.join(cls.tmp, "replica.sqlite3")}
+        cls.replica_settings = patch.dict(settings.DATABASES, {"replica_1": replica})
+        cls.replica_settings.start()
+        cls.databases = {"default", "replica_1"}
+        with connections["replica_1"].schema_editor() as editor:
+            editor.create_model(Faculty)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.databases = {"default"}
+        connections["replica_1"].close()
+        del connections["replica_1"]
+        cls.replica_settings.stop()
+        shutil.rmtree(cls.tmp)
+        super().tearDownClass()
+
+    def setUp(self):
+        # pin-ul partajat intre "workeri": un cache pe disc, comun tuturor proceselor
+        cache_settings = override_settings(
+            CACHES={
+                **settings.CACHES,
+                "pins": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": os.path.join(self.tmp, "pins"),
+                },
+            },
+            REPLICA_PIN_CACHE="pins",
+        )
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+        caches["pins"].clear()
+
+        Faculty.objects.create(name="Facultate", abbreviation="F")
+        # scrierea de mai sus a fixat contextul testului pe primary
+        db_router._pinned.set(False)
+        self.requests = RequestFactory()
+
+    def worker(self):
+        """Un proces separat: propriul middleware, acelasi cache de pin-uri."""
+
+        def view(request):
+            if request.method == "POST":
+                Faculty.objects.create(name="Alta", abbreviation="A")
+            return HttpResponse(str(Faculty.objects.count()))
+
+        return db_router.ReplicaPinningMiddleware(view)
+
+    def read(self, worker, token):
+        return worker(self.requests.get("/", HTTP_AUTHORIZATION=token)).content.decode()
+
+    def test_router_sends_reads_to_replica_and_writes_to_primary(self):
+        self.assertEqual(db_router.replica_aliases(), ["replica_1"])
+        self.assertEqual(Faculty.objects.all().db, "replica_1")
+        self.assertEqual(Faculty.objects.count(), 0)
+        self.assertEqual(Faculty.objects.db_manager("default").count(), 1)
+
+        Faculty.objects.create(name="Noua", abbreviation="N")
+        # dupa o scriere, citirile din acelasi context raman pe primary
+        self.assertEqual(Faculty.objects.all().db, "default")
+        self.assertEqual(Faculty.objects.count(), 2)
+
+    def test_client_that_wrote_reads_from_primary_on_any_worker(self):
+        first, second = self.worker(), self.worker()
+        self.assertEqual(self.read(first, "Bearer a"), "0")
+
+        response = first(self.requests.post("/", HTTP_AUTHORIZATION="Bearer a"))
+        # in request-ul care scrie, citirea vede scrierea
+        self.assertEqual(response.content.decode(), "2")
+
+        self.assertEqual(self.read(second, "Bearer a"), "2")
+        self.assertEqual(self.read(second, "Bearer b"), "0")
+
+    async def test_async_workers_share_the_pin(self):
+        async def view(request):
+            if request.method == "POST":
+                await Faculty.objects.acreate(name="Alta", abbreviation="A")
+            return HttpResponse(str(await Faculty.objects.acount()))
+
+        first, second = db_router.ReplicaPinningMiddleware(view), db_router.ReplicaPinningMiddleware(view)
+        self.assertTrue(iscoroutinefunction(first))
+
+        response = await first(self.requests.post("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.assertEqual(response.content.decode(), "2")
+        response = await second(self.requests.get("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.assertEqual(response.content.decode(), "2")
+        response = await second(self.requests.get("/", HTTP_AUTHORIZATION="Bearer b"))
+        self.assertEqual(response.content.decode(), "0")
+
+    def test_local_pin_cache_is_rejected(self):
+        with override_settings(REPLICA_PIN_CACHE="default"):
+            with self.assertRaises(ImproperlyConfigured):
+                self.worker()
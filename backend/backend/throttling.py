@@ -0,0 +1,132 @@
+"""
+throttling.py
+
+Protectie pentru endpoint-urile "fierbinti" (cumparare bilete, login, inregistrare):
+
+- TokenBucketThrottle: limita per user (sau per IP pentru anonimi), pe scope.
+  Rata "N/perioada" din DEFAULT_THROTTLE_RATES = rafala de cel mult N, reincarcare N per perioada,
+  aproximata cu o fereastra glisanta (fereastra curenta + cea anterioara, ponderata).
+- EventPurchaseLimiter: limiteaza cate cumparari ruleaza simultan pentru acelasi eveniment;
+  cererile in plus primesc imediat 429 + Retry-After (nu ocupa workerul asteptand).
+
+Starea sta intr-un backend de cache Django (alias THROTTLE_CACHE) si se modifica doar cu
+operatii atomice ale cache-ului (add / incr / decr), deci limitele sunt corecte si intre
+procese cand backend-ul e partajat (Redis, Memcached). Implicit e LocMemCache: limite per proces.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import ScopedRateThrottle
+
+THROTTLE_CACHE = getattr(settings, "THROTTLE_CACHE", "default")
+
+
+def _incr(cache, key, ttl):
+    """incr atomic pe o cheie care poate sa nu existe (sau sa fi expirat intre add si incr)."""
+    cache.add(key, 0, ttl)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, ttl)
+        return cache.incr(key)
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    Se activeaza pe view-urile care au `throttle_scope`, la fel ca ScopedRateThrottle.
+    In cache se tine cate un contor per fereastra de `duration` secunde, per scope + user/IP.
+    """
+
+    cache = caches[THROTTLE_CACHE]
+    cache_format = "bucket_%(scope)s_%(ident)s"
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.num_requests is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = f"{self.key}_{int(window)}"
+
+        # rezervam intai (incr atomic), apoi verificam; cererea respinsa isi elibereaza locul
+        current = _incr(self.cache, current_key, 2 * self.duration)
+        previous = self.cache.get(f"{self.key}_{int(window) - 1}", 0)
+        # din fereastra anterioara mai conteaza doar partea care se suprapune cu ultima perioada
+        used = previous * (1 - elapsed / self.duration) + current
+        if used <= self.num_requests:
+            return True
+
+        try:
+            self.cache.decr(current_key)
+        except ValueError:
+            pass
+        refill_per_second = self.num_requests / self.duration
+        self._wait = min(self.duration, (used - self.num_requests) / refill_per_second)
+        return False
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class EventPurchaseLimiter:
+    """
+    Semafor per eveniment, tinut in cache (contor modificat cu incr / decr atomice).
+
+    Utilizare:
+        with purchase_limiter.slot(event_id):
+            ... cumparare ...
+    """
+
+    slot_ttl = 60  # daca un worker moare cu slotul ocupat, contorul expira singur
+
+    def __init__(self, limit, retry_after=1, cache_alias=THROTTLE_CACHE):
+        self.limit = limit
+        self.retry_after = retry_after
+        self.cache = caches[cache_alias]
+
+    def _key(self, event_id):
+        return f"purchase_slots_{event_id}"
+
+    def _release(self, key):
+        try:
+            if self.cache.decr(key) < 0:
+                # cheia a expirat si a fost recreata cat timp slotul era ocupat
+                self.cache.incr(key)
+        except ValueError:
+            # cheia a expirat intre timp
+            pass
+
+    def _acquire(self, key):
+        in_flight = _incr(self.cache, key, self.slot_ttl)
+        # fiecare cumparare noua prelungeste viata contorului: nu expira cat timp e folosit
+        self.cache.touch(key, self.slot_ttl)
+        if in_flight <= self.limit:
+            return True
+        self._release(key)
+        return False
+
+    @contextmanager
+    def slot(self, event_id):
+        key = self._key(event_id)
+        if not self._acquire(key):
+            raise Throttled(
+                wait=self.retry_after,
+                detail="Prea multe cereri simultane pentru acest eveniment. Încearcă din nou.",
+            )
+        try:
+            yield
+        finally:
+            self._release(key)
+
+
+purchase_limiter = EventPurchaseLimiter(limit=getattr(settings, "TICKET_PURCHASE_CONCURRENCY", 4))
@@ -1,12 +1,12 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from .swagger import schema_view
-from rest_framework_simplejwt.views import TokenRefreshView
+from .media import MediaView
+from .metrics import MetricsView
 
-from users.views import MyTokenObtainPairView 
+from users.views import MyTokenObtainPairView, MyTokenRefreshView
 
 from django.conf import settings             
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,10 +15,14 @@ urlpatterns = [
     path("api/users/", include("users.urls")),
     path("api/events/", include("events.urls")),
     path("api/interactions/", include("interactions.urls")),
+    path("api/uploads/", include("uploads.urls")),
     
     # Rutele pentru JWT Authentication
     path("api/token/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/token/refresh/", MyTokenRefreshView.as_view(), name="token_refresh"),
+
+    # Metrici Prometheus (doar staff)
+    path("metrics", MetricsView.as_view(), name="metrics"),
 
     # Documentatie Swagger
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
@@ -26,6 +30,7 @@ urlpatterns = [
     path("swagger.json", schema_view.without_ui(cache_timeout=0), name="schema-json"),
 ]
 
-# 15.12.25 Serve media files during development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Fisierele media trec prin verificarea de acces si in productie (vezi backend/media.py)
+urlpatterns += [
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$", MediaView.as_view(), name="media"),
+]
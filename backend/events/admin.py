@@ -1,32 +1,69 @@
 from django.contrib import admin
+
+from backend.admin_utils import LargeTableAdmin
+from backend.moderation import cached_pending_counts, moderate_events
 from .models import Faculty, Department, Category, Location, Event
+from .images import image_files
+from .tasks import delete_image_files, generate_image_variants
+
+# Configurare simpla pentru nomenclatoare (tablele mici, fixe);
+# search_fields e necesar pentru campurile autocomplete din EventAdmin
+@admin.register(Faculty)
+class FacultyAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
 
-# Configurare simpla pentru nomenclatoare (tablele mici, fixe)
-admin.site.register(Faculty)
-admin.site.register(Location)
-admin.site.register(Category)
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = ('name', 'address')
 
 # Configurare pentru Departamente (cu filtrare dupa facultate)
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ('name', 'faculty')
     list_filter = ('faculty',)
+    list_select_related = ('faculty',)
+    search_fields = ('name', 'faculty__name')
+
+    # __str__ foloseste facultatea (si in rezultatele autocomplete din EventAdmin)
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('faculty')
 
 # Configurare complexa pentru Evenimente
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
-    # Ce coloane vedem in tabel
+class EventAdmin(LargeTableAdmin):
+    # Ce coloane vedem in tabel (organizer si faculty vin din acelasi JOIN)
     list_display = ('title', 'organizer', 'status', 'start_date', 'faculty')
-    
-    # Filtre in dreapta
+    list_select_related = ('organizer', 'faculty')
+
+    # Filtre in dreapta; organizatorii sunt multi, deci se cauta prin autocomplete
     list_filter = ('status', 'faculty', 'category', 'start_date')
     search_fields = ('title', 'organizer__email')
+    autocomplete_fields = ('organizer', 'faculty', 'department', 'category', 'location')
 
     # --- ACTIUNI RAPIDE ---
     actions = ['approve_events', 'reject_events']
 
+    def save_model(self, request, obj, form, change):
+        # imagine noua: variantele redimensionate se regenereaza in worker, fisierele vechi se sterg
+        replaced = []
+        if 'image' in form.changed_data:
+            if change:
+                old = Event.objects.filter(pk=obj.pk).values_list('image', 'image_variants').first()
+                replaced = image_files(*old) if old else []
+            obj.image_variants = {}
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data and obj.image:
+            generate_image_variants.enqueue(event_id=obj.pk)
+        replaced = [name for name in replaced if name != obj.image.name]
+        if replaced:
+            delete_image_files.enqueue(names=replaced)
+
     def changelist_view(self, request, extra_context=None):
-        pending_count = Event.objects.filter(status='pending').count()
+        pending_count = cached_pending_counts()['events'].get('pending', 0)
 
         if pending_count > 0:
             self.message_user(
@@ -37,10 +74,11 @@ class EventAdmin(admin.ModelAdmin):
 
         return super().changelist_view(request, extra_context)
 
+    # un singur UPDATE pentru tot lotul; organizatorii sunt notificati prin coada de job-uri
     @admin.action(description='Valideaza evenimentele selectate (Publica)')
     def approve_events(self, request, queryset):
-        queryset.update(status='published')
+        moderate_events(list(queryset.values_list('pk', flat=True)), 'published', statuses=None)
 
     @admin.action(description='Respinge evenimentele selectate')
     def reject_events(self, request, queryset):
-        queryset.update(status='rejected')
\ No newline at end of file
+        moderate_events(list(queryset.values_list('pk', flat=True)), 'rejected', statuses=None)
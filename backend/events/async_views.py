@@ -0,0 +1,38 @@
+"""
+Variante async (ASGI) pentru endpoint-urile de citire din events.
+Raspunsurile sunt identice cu cele ale view-urilor DRF din views.py.
+"""
+
+from django.http import Http404
+
+from backend.async_views import AsyncReadView
+from .models import Event
+from .views import CategoryListView, DepartmentListView, EventDetailView, EventListCreateView, FacultyListView
+
+
+class EventListAsyncView(AsyncReadView):
+    sync_view = EventListCreateView
+
+
+class EventDetailAsyncView(AsyncReadView):
+    sync_view = EventDetailView
+
+    async def get_data(self, request, pk):
+        view = self.drf_view(request, pk=pk)
+        try:
+            event = await (await self.filtered_queryset(view)).aget(pk=pk)
+        except Event.DoesNotExist:
+            raise Http404("No Event matches the given query.")
+        return view.get_serializer(event).data
+
+
+class FacultyListAsyncView(AsyncReadView):
+    sync_view = FacultyListView
+
+
+class DepartmentListAsyncView(AsyncReadView):
+    sync_view = DepartmentListView
+
+
+class CategoryListAsyncView(AsyncReadView):
+    sync_view = CategoryListView
@@ -0,0 +1,197 @@
+"""
+calendar.py (events app)
+
+Feed-uri iCalendar (RFC 5545) pentru aplicatiile de calendar, care le interogheaza des:
+
+- feed_version: ETag + Last-Modified dintr-un singur query agregat peste evenimentele feed-ului
+  (numar, suma id-urilor, ultimul updated_at; la feed-ul personal si biletele / favoritele
+  userului); un poll fara schimbari primeste 304 doar cu atat
+- ics_response: StreamingHttpResponse care scrie VEVENT-urile pe masura ce le citeste cu
+  .iterator(), deci memoria nu creste cu numarul de evenimente
+- get_calendar_token / rotate_calendar_token / calendar_user_id: token-ul secret din URL-ul
+  feed-ului personal (aplicatiile de calendar nu pot trimite JWT)
+"""
+
+import secrets
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, FilteredRelation, Max, Q, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from users.models import CustomUser
+
+PRODID = "-//UniEvent//Calendar//RO"
+CHUNK_SIZE = 500
+# evenimentele terminate de mai mult de atat nu mai apar in feed
+FEED_PAST_DAYS = 90
+TOKEN_CACHE_SECONDS = 300
+
+
+# ---- token ----
+
+def _token_cache_key(token):
+    return f"calendar:token:{token}"
+
+
+def rotate_calendar_token(user):
+    """Token nou; URL-ul vechi nu mai functioneaza."""
+    if user.calendar_token:
+        cache.delete(_token_cache_key(user.calendar_token))
+    user.calendar_token = secrets.token_urlsafe(32)
+    CustomUser.objects.filter(pk=user.pk).update(calendar_token=user.calendar_token)
+    return user.calendar_token
+
+
+def get_calendar_token(user):
+    return user.calendar_token or rotate_calendar_token(user)
+
+
+def calendar_user_id(token):
+    """Userul caruia ii apartine token-ul (None daca nu exista); tinut in cache intre poll-uri."""
+    key = _token_cache_key(token)
+    user_id = cache.get(key)
+    if user_id is None:
+        user_id = CustomUser.objects.filter(calendar_token=token, is_active=True).values_list("pk", flat=True).first()
+        cache.set(key, user_id or 0, TOKEN_CACHE_SECONDS)
+    return user_id or None
+
+
+# ---- feed ----
+
+def feed_events(events):
+    """Fereastra de timp a feed-ului: evenimentele viitoare si cele din ultimele FEED_PAST_DAYS zile."""
+    return events.filter(end_date__gte=timezone.now() - timedelta(days=FEED_PAST_DAYS))
+
+
+def feed_version(events, user_id=None):
+    """
+    (etag, last_modified); se schimba la orice eveniment adaugat, scos sau editat.
+
+    Cu user_id (feed-ul personal) ETag-ul include si biletele / favoritele userului: un bilet
+    cumparat pentru un eveniment deja favorit schimba STATUS-ul, fara sa schimbe evenimentele.
+    Last-Modified lipseste atunci: un favorit nou poate avea updated_at mai vechi decat feed-ul,
+    iar o stergere il poate face sa scada, deci If-Modified-Since ar da 304 gresit.
+    """
+    aggregates = {"count": Count("id"), "ids": Sum("id"), "last": Max("updated_at")}
+    if user_id is not None:
+        # cel mult un bilet / favorit per (user, eveniment): JOIN-ul nu multiplica randurile
+        events = events.annotate(
+            own_ticket=FilteredRelation("tickets", condition=Q(tickets__user_id=user_id)),
+            own_favorite=FilteredRelation("favorited_by", condition=Q(favorited_by__user_id=user_id)),
+        )
+        aggregates.update(
+            tickets=Sum("own_ticket__id"),
+            bought=Max("own_ticket__purchased_at"),
+            favorites=Sum("own_favorite__id"),
+            added=Max("own_favorite__added_at"),
+        )
+    stats = events.order_by().aggregate(**aggregates)
+    parts = [
+        int(value.timestamp()) if hasattr(value, "timestamp") else value or 0
+        for value in stats.values()
+    ]
+    etag = '"' + "-".join(str(part) for part in parts) + '"'
+    return etag, stats["last"] if user_id is None else None
+
+
+def _escape(text):
+    return (
+        (text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Liniile de peste 75 de octeti se continua pe randul urmator, cu un spatiu in fata."""
+    if len(line.encode()) <= 75:
+        return line + "\r\n"
+    parts, current, size = [], "", 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > 75:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += length
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _vevent(event, host):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.pk}@{host}",
+        f"DTSTAMP:{_utc(event.updated_at)}",
+        f"LAST-MODIFIED:{_utc(event.updated_at)}",
+        f"DTSTART:{_utc(event.start_date)}",
+        f"DTEND:{_utc(max(event.end_date, event.start_date))}",
+        f"SUMMARY:{_escape(event.title)}",
+        f"DESCRIPTION:{_escape(event.description)}",
+        # feed-ul personal: biletele sunt confirmate, favoritele doar "poate"
+        f"STATUS:{'CONFIRMED' if getattr(event, 'has_ticket', True) else 'TENTATIVE'}",
+    ]
+    location = event.location
+    if location is not None:
+        place = ", ".join(part for part in (location.name, location.address) if part)
+        lines.append(f"LOCATION:{_escape(place)}")
+        if location.latitude is not None and location.longitude is not None:
+            lines.append(f"GEO:{location.latitude};{location.longitude}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def _render(events, name, host):
+    yield "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+            f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+            # sugestie pentru aplicatii: nu mai des de o ora
+            "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+            "X-PUBLISHED-TTL:PT1H",
+        )
+    )
+    for event in events.select_related("location").order_by("start_date").iterator(chunk_size=CHUNK_SIZE):
+        yield _vevent(event, host)
+    yield "END:VCALENDAR\r\n"
+
+
+def not_modified(request, version):
+    """Raspunsul 304 (sau None) pentru versiunea curenta a feed-ului."""
+    etag, last = version
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last.timestamp()) if last else None
+    )
+
+
+def ics_response(request, events, name, version, filename, public=False):
+    etag, last = version
+    response = StreamingHttpResponse(
+        _render(events, name, request.get_host().split(":")[0]),
+        content_type="text/calendar; charset=utf-8",
+    )
+    response["ETag"] = etag
+    if last is not None:
+        response["Last-Modified"] = http_date(last.timestamp())
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    # feed-ul personal contine un token: nu are ce cauta in cache-urile partajate
+    response["Cache-Control"] = "public, max-age=900" if public else "private, max-age=900"
+    return response
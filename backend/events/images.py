@@ -0,0 +1,114 @@
+"""
+images.py (events app)
+
+Variante redimensionate ale imaginilor de eveniment, ca grid-ul de pe home sa nu descarce
+pozele originale (cativa MB de la telefon) pentru un card de 180px.
+
+- VARIANTS: variantele generate ("card" pentru EventCard, "hero" pentru detaliu), fiecare
+  la 1x si 2x, in WebP si JPEG (fallback)
+- render_variants: citeste originalul din storage, scrie variantele langa el
+  (event_images/poza.jpg -> event_images/poza__card-400.webp etc.) si intoarce metadatele
+  salvate in Event.image_variants
+- srcset: metadatele -> src / srcset / sizes, cu URL-uri gata de pus in <picture>
+- image_files: originalul + fisierele variantelor, de sters cand imaginea e inlocuita
+
+Generarea ruleaza in afara request-ului: task-ul events.tasks.generate_image_variants
+dupa upload si comanda generate_image_variants pentru imaginile existente.
+"""
+
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+VARIANTS = {
+    "card": {"widths": (400, 800), "sizes": "(max-width: 600px) 100vw, 400px"},
+    "hero": {"widths": (960, 1600), "sizes": "(max-width: 1000px) 100vw, 960px"},
+}
+
+# extensie -> (format PIL, optiuni de salvare)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def variant_name(name, variant, width, ext):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}__{variant}-{width}.{ext}"
+
+
+def _open_rgb(name, storage, max_width):
+    with storage.open(name, "rb") as fh:
+        image = Image.open(fh)
+        # JPEG: decodare direct la o scara redusa (1/2, 1/4, 1/8), cel putin max_width pe ambele laturi
+        image.draft("RGB", (max_width, max_width))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode in ("RGBA", "LA", "P"):
+        # transparenta -> fundal alb (JPEG nu are canal alfa)
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_variants(name, storage=default_storage):
+    """Genereaza toate variantele pentru imaginea `name`; intoarce metadatele lor."""
+    max_width = max(width for spec in VARIANTS.values() for width in spec["widths"])
+    image = _open_rgb(name, storage, max_width)
+
+    variants = {}
+    for variant, spec in VARIANTS.items():
+        entries = []
+        # fara upscaling: o imagine mica produce o singura latime, cea originala
+        for width in sorted({min(width, image.width) for width in spec["widths"]}):
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            entry = {"width": width, "height": height}
+            for ext, (fmt, options) in FORMATS.items():
+                buffer = BytesIO()
+                resized.save(buffer, fmt, **options)
+                target = variant_name(name, variant, width, ext)
+                # regenerare: suprascriem, altfel storage-ul ar adauga un sufix aleator
+                if storage.exists(target):
+                    storage.delete(target)
+                entry[ext] = storage.save(target, ContentFile(buffer.getvalue()))
+            entries.append(entry)
+        variants[variant] = entries
+    return variants
+
+
+def srcset(variants, build_url):
+    """
+    {"card": {"src": ..., "width": 400, "height": 267, "sizes": ..., "webp": "u1 400w, u2 800w",
+    "jpeg": "..."}, ...}; `build_url` transforma numele din storage in URL.
+    """
+    result = {}
+    for variant, entries in variants.items():
+        if not entries or variant not in VARIANTS:
+            continue
+        first = entries[0]
+        result[variant] = {
+            "src": build_url(first["jpeg"]),
+            "width": first["width"],
+            "height": first["height"],
+            "sizes": VARIANTS[variant]["sizes"],
+            **{
+                ext: ", ".join(f"{build_url(entry[ext])} {entry['width']}w" for entry in entries)
+                for ext in FORMATS
+            },
+        }
+    return result
+
+
+def image_files(name, variants):
+    """Toate fisierele unei imagini: originalul si variantele din metadatele lui."""
+    files = [name] if name else []
+    for entries in (variants or {}).values():
+        files.extend(entry[ext] for entry in entries for ext in FORMATS if entry.get(ext))
+    return files
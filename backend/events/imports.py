@@ -0,0 +1,194 @@
+"""
+imports.py (events app)
+
+Importul in bloc al evenimentelor (programul unui semestru) din CSV sau JSON:
+
+- read_rows: randurile din fisier (CSV cu "," sau ";", JSON lista sau {"events": [...]})
+- EventImportSerializer: regulile din EventCreateSerializer.validate, cu facultatea / departamentul /
+  categoria cautate (dupa id sau nume) in dictionare incarcate o singura data pentru tot importul
+- import_events: valideaza toate randurile, verifica suprapunerile de locatie intr-un singur query,
+  apoi creeaza locatiile si evenimentele cu bulk_create, intr-o singura tranzactie; daca un rand
+  are erori nu se creeaza nimic (reimportul fisierului corectat nu dubleaza evenimente)
+"""
+
+import csv
+import io
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .locations import get_or_create_locations, location_key
+from .models import Category, Department, Event, Faculty
+from .schedule import BOOKING_STATUSES, conflict_message
+from .serializers import EventCreateSerializer
+
+MAX_ROWS = 1000
+BATCH_SIZE = 500
+
+_AMBIGUOUS = object()
+
+
+def read_rows(fileobj, name=""):
+    """Randurile (dict-uri) din fisierul urcat; ValueError cu mesajul pentru organizator."""
+    raw = fileobj.read()
+    text = raw.decode("utf-8-sig") if isinstance(raw, bytes) else raw
+    if name.lower().endswith(".json") or text.lstrip().startswith(("[", "{")):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            raise ValueError("Fișierul JSON nu este valid.")
+        return rows_from_data(data)
+
+    # Excel cu setari regionale romanesti salveaza CSV-ul cu ";"
+    try:
+        dialect = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.DictReader(io.StringIO(text), dialect=dialect))
+
+
+def rows_from_data(data):
+    if isinstance(data, dict):
+        data = data.get("events")
+    if not isinstance(data, list):
+        raise ValueError('Se așteaptă o listă de evenimente sau {"events": [...]}.')
+    return data
+
+
+class _PreloadedRelatedField(serializers.PrimaryKeyRelatedField):
+    """FK dupa id sau nume, din context["lookups"][nume camp], fara query per rand."""
+
+    default_error_messages = {
+        **serializers.PrimaryKeyRelatedField.default_error_messages,
+        "ambiguous": "„{value}” corespunde mai multor înregistrări; folosește id-ul.",
+    }
+
+    def to_internal_value(self, data):
+        obj = self.context["lookups"][self.field_name].get(str(data).strip().lower())
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        if obj is _AMBIGUOUS:
+            self.fail("ambiguous", value=data)
+        return obj
+
+
+class EventImportSerializer(EventCreateSerializer):
+    faculty = _PreloadedRelatedField(queryset=Faculty.objects.all())
+    department = _PreloadedRelatedField(queryset=Department.objects.all(), required=False, allow_null=True)
+    category = _PreloadedRelatedField(queryset=Category.objects.all(), required=False, allow_null=True)
+    # publicarea trece tot prin moderare
+    status = serializers.ChoiceField(choices=["draft", "pending"], required=False)
+
+    class Meta(EventCreateSerializer.Meta):
+        fields = [
+            field
+            for field in EventCreateSerializer.Meta.fields
+            if field not in ("image", "file", "image_upload", "file_upload")
+        ]
+
+    def _venue_conflict(self, attrs):
+        # verificata pentru tot importul deodata, in import_events
+        return None
+
+
+def _lookup(objects, *names):
+    """{id / nume in lowercase: obiect}; numele repetate sunt marcate ambigue."""
+    table = {}
+    for obj in objects:
+        table[str(obj.pk)] = obj
+        for value in {(getattr(obj, name) or "").strip().lower() for name in names} - {""}:
+            table[value] = _AMBIGUOUS if value in table and table[value] is not obj else obj
+    return table
+
+
+def _load_lookups():
+    # tabele de referinta mici: cate un query, indiferent de numarul de randuri
+    return {
+        "faculty": _lookup(Faculty.objects.all(), "name", "abbreviation"),
+        "department": _lookup(Department.objects.all(), "name"),
+        "category": _lookup(Category.objects.all(), "name"),
+    }
+
+
+def _clean_row(row):
+    # celulele goale din CSV inseamna "netrimis", nu string gol
+    return {key.strip(): value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _venue_conflicts(valid):
+    """Erorile de suprapunere: cu evenimentele existente (un query) si intre randurile importate."""
+    bookings = [
+        (index, location_key(data["location_name"], data.get("location_address", "")), data)
+        for index, data in valid
+        if data.get("status", "draft") in BOOKING_STATUSES
+    ]
+    if not bookings:
+        return []
+
+    taken = defaultdict(list)
+    existing = Event.objects.filter(
+        status__in=BOOKING_STATUSES,
+        location__key__in={key for _, key, _ in bookings},
+        start_date__lt=max(data["end_date"] for _, _, data in bookings),
+        end_date__gt=min(data["start_date"] for _, _, data in bookings),
+    ).values_list("location__key", "title", "start_date", "end_date")
+    for key, title, start, end in existing:
+        taken[key].append((title, start, end))
+
+    errors = []
+    for index, key, data in bookings:
+        start, end = data["start_date"], data["end_date"]
+        clash = next((booked for booked in taken[key] if booked[1] < end and booked[2] > start), None)
+        if clash is not None:
+            errors.append({"row": index, "errors": {"location_name": [conflict_message(*clash)]}})
+        else:
+            taken[key].append((data["title"], start, end))
+    return errors
+
+
+def import_events(rows, organizer_id, dry_run=False):
+    """
+    -> (evenimentele create, erori); erorile sunt [{"row": n, "errors": {camp: [mesaje]}}],
+    cu n numarul randului de date (1 = primul rand dupa antet).
+    """
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f"Cel mult {MAX_ROWS} de evenimente per import.")
+
+    context = {"lookups": _load_lookups()}
+    valid, errors = [], []
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": index, "errors": {"non_field_errors": ["Rândul trebuie să fie un obiect."]}})
+            continue
+        serializer = EventImportSerializer(data=_clean_row(row), context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"row": index, "errors": serializer.errors})
+
+    errors += _venue_conflicts(valid)
+    if errors or dry_run:
+        return [], sorted(errors, key=lambda error: error["row"])
+
+    with transaction.atomic():
+        locations = get_or_create_locations(
+            (
+                data["location_name"],
+                data.get("location_address", ""),
+                data.get("google_maps_link", ""),
+                data.get("latitude"),
+                data.get("longitude"),
+            )
+            for _, data in valid
+        )
+        events = []
+        for _, data in valid:
+            data = dict(data)
+            key = location_key(data.pop("location_name"), data.pop("location_address", ""))
+            for field in ("google_maps_link", "latitude", "longitude"):
+                data.pop(field, None)
+            events.append(Event(organizer_id=organizer_id, location=locations[key], **data))
+        events = Event.objects.bulk_create(events, batch_size=BATCH_SIZE)
+    return events, []
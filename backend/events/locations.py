@@ -0,0 +1,219 @@
+"""
+locations.py (events app)
+
+Registrul de locatii: aceeasi sala ("Aula Magna", "aula  magna", "Aula Magnă") e un singur
+rand Location, refolosit de toate evenimentele care au loc acolo.
+
+- normalize: lowercase, fara diacritice / punctuatie, spatii comprimate
+- location_key: cheia unica (nume + adresa normalizate) dupa care se deduplica
+- get_or_create_location: locatia existenta cu aceeasi cheie sau una noua; coordonatele trimise
+  explicit corecteaza locatia existenta doar pentru staff sau pentru organizatorul care e singurul
+  cu evenimente acolo (altfel doar completeaza coordonatele lipsa)
+- get_or_create_locations: acelasi lucru pentru mai multe locatii deodata (importul in bloc),
+  cu un numar fix de query-uri
+- search_locations: autocomplete dupa textul normalizat (index trigram pe Postgres)
+- coordinates_from_link: latitudine / longitudine din link-urile Google Maps care le contin
+- filter_near: evenimentele pe o raza in jurul unui punct; bounding box pe indexul
+  (latitude, longitude) al locatiilor, apoi distanta exacta (haversine) doar pe candidati
+"""
+
+import math
+import re
+import unicodedata
+from urllib.parse import parse_qs, unquote, urlparse
+
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+from .models import Event, Location
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+NEAR_DEFAULT_RADIUS_KM = 5.0
+NEAR_MAX_RADIUS_KM = 50.0
+
+_COORDS = r"(-?\d{1,2}(?:\.\d+)?),\s*(-?\d{1,3}(?:\.\d+)?)"
+# .../@44.43,26.10,17z  si  ...!3d44.43!4d26.10 (pin-ul, mai precis decat centrul hartii)
+_PIN_RE = re.compile(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)")
+_AT_RE = re.compile(r"@" + _COORDS)
+_PAIR_RE = re.compile(r"^\s*" + _COORDS + r"\s*$")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_NON_WORD_RE.sub(" ", text.lower()).split())
+
+
+def location_key(name, address):
+    key = f"{normalize(name)}|{normalize(address)}"
+    return key[:Location._meta.get_field("key").max_length]
+
+
+def _valid_coordinates(latitude, longitude):
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+
+def coordinates_from_link(url):
+    """(lat, lng) din link-ul de harta sau None (ex. link-uri scurte maps.app.goo.gl)."""
+    if not url:
+        return None
+    url = unquote(url)
+    for pattern in (_PIN_RE, _AT_RE):
+        match = pattern.search(url)
+        if match:
+            break
+    else:
+        # ?q=44.43,26.10 / ?ll=... / ?query=... / ?destination=...
+        params = parse_qs(urlparse(url).query)
+        match = next(
+            (
+                _PAIR_RE.match(value)
+                for key in ("q", "ll", "query", "destination", "center")
+                for value in params.get(key, [])
+                if _PAIR_RE.match(value)
+            ),
+            None,
+        )
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    return (latitude, longitude) if _valid_coordinates(latitude, longitude) else None
+
+
+def _can_correct(location, editor):
+    """Locatia e partajata: coordonatele existente le corecteaza doar staff-ul sau organizatorul
+    ale carui evenimente sunt singurele din sala (altfel ar muta evenimentele altora)."""
+    if editor is None:
+        return False
+    if editor.is_staff:
+        return True
+    return not Event.objects.filter(location=location).exclude(organizer_id=editor.pk).exists()
+
+
+def get_or_create_location(name, address="", google_maps_link="", latitude=None, longitude=None, editor=None):
+    explicit = latitude is not None and longitude is not None
+    if not explicit:
+        latitude, longitude = coordinates_from_link(google_maps_link) or (None, None)
+
+    location, created = Location.objects.get_or_create(
+        key=location_key(name, address),
+        defaults={
+            "name": name.strip(),
+            "address": (address or "").strip(),
+            "google_maps_link": google_maps_link or None,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    )
+    # primul link de harta / primele coordonate primite completeaza locatia existenta;
+    # coordonatele introduse explicit de `editor` o corecteaza doar daca _can_correct
+    if not created:
+        changed = []
+        if google_maps_link and not location.google_maps_link:
+            location.google_maps_link = google_maps_link
+            changed.append("google_maps_link")
+        if latitude is not None and (
+            location.latitude is None
+            or (
+                explicit
+                and (location.latitude, location.longitude) != (latitude, longitude)
+                and _can_correct(location, editor)
+            )
+        ):
+            location.latitude, location.longitude = latitude, longitude
+            changed += ["latitude", "longitude"]
+        if changed:
+            location.save(update_fields=changed)
+    return location
+
+
+def get_or_create_locations(specs):
+    """
+    specs: (name, address, google_maps_link, latitude, longitude) -> {cheie: Location}.
+    Locatiile existente raman neschimbate; cele noi se insereaza cu un singur bulk_create.
+    """
+    wanted = {}
+    for name, address, google_maps_link, latitude, longitude in specs:
+        wanted.setdefault(location_key(name, address), (name, address, google_maps_link, latitude, longitude))
+
+    found = {location.key: location for location in Location.objects.filter(key__in=wanted)}
+    missing = []
+    for key, (name, address, google_maps_link, latitude, longitude) in wanted.items():
+        if key in found:
+            continue
+        if latitude is None or longitude is None:
+            latitude, longitude = coordinates_from_link(google_maps_link) or (None, None)
+        name, address = name.strip(), (address or "").strip()
+        # bulk_create nu trece prin Location.save(): cheia si textul de cautare se pun aici
+        missing.append(
+            Location(
+                name=name,
+                address=address,
+                google_maps_link=google_maps_link or None,
+                latitude=latitude,
+                longitude=longitude,
+                key=key,
+                search_text=normalize(f"{name} {address}"),
+            )
+        )
+    if missing:
+        # o locatie creata intre timp de alt request nu strica importul
+        Location.objects.bulk_create(missing, ignore_conflicts=True)
+        found.update(
+            (location.key, location)
+            for location in Location.objects.filter(key__in=[location.key for location in missing])
+        )
+    return found
+
+
+def search_locations(query, limit=10):
+    """Locatiile care contin textul cautat, cele folosite de cele mai multe evenimente primele."""
+    # acelasi text normalizat ca in coloana: LIKE '%...%' poate folosi indexul gin_trgm_ops
+    return (
+        Location.objects.filter(search_text__contains=normalize(query))
+        .annotate(events_count=Count("event"))
+        .order_by("-events_count", "name")[:limit]
+    )
+
+
+def parse_near(near, radius=None):
+    """"lat,lng" si raza in km (optional) -> (lat, lng, raza); ValueError cu mesajul pentru client."""
+    match = _PAIR_RE.match(near or "")
+    if not match:
+        raise ValueError("Format așteptat: near=lat,lng (ex. near=44.4355,26.1008).")
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if not _valid_coordinates(latitude, longitude):
+        raise ValueError("Coordonate în afara intervalului valid.")
+    try:
+        radius = float(radius) if radius not in (None, "") else NEAR_DEFAULT_RADIUS_KM
+    except ValueError:
+        raise ValueError("radius trebuie să fie un număr (km).")
+    if not 0 < radius <= NEAR_MAX_RADIUS_KM:
+        raise ValueError(f"radius trebuie să fie între 0 și {NEAR_MAX_RADIUS_KM:g} km.")
+    return latitude, longitude, radius
+
+
+def filter_near(queryset, latitude, longitude, radius_km, prefix="location__"):
+    """Randurile (evenimente, prin `prefix`) la cel mult radius_km, cu distance_km adnotat."""
+    lat_field, lng_field = f"{prefix}latitude", f"{prefix}longitude"
+
+    # 1) bounding box: doua intervale pe coloane indexate, fara trigonometrie per rand
+    lat_delta = radius_km / KM_PER_DEGREE
+    queryset = queryset.filter(**{f"{lat_field}__range": (latitude - lat_delta, latitude + lat_delta)})
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat > 0.01:
+        lng_delta = min(radius_km / (KM_PER_DEGREE * cos_lat), 180)
+        queryset = queryset.filter(**{f"{lng_field}__range": (longitude - lng_delta, longitude + lng_delta)})
+
+    # 2) haversine, doar pentru randurile din cutie (colturile ei sunt mai departe de raza)
+    half_dlat = Radians(F(lat_field) - Value(latitude)) / 2
+    half_dlng = Radians(F(lng_field) - Value(longitude)) / 2
+    a = Power(Sin(half_dlat), 2) + Value(cos_lat) * Cos(Radians(F(lat_field))) * Power(Sin(half_dlng), 2)
+    distance = Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a))
+    return queryset.annotate(distance_km=ExpressionWrapper(distance, output_field=FloatField())).filter(
+        distance_km__lte=radius_km
+    )
+
@@ -0,0 +1,84 @@
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+from users.models import CustomUser
+from users.serializers import MyTokenObtainPairSerializer
+
+DEFAULT_PATHS = [
+    "/api/events/",
+    "/api/events/faculties/",
+    "/api/events/categories/",
+    "/api/interactions/tickets/",
+    "/api/interactions/notifications/",
+]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark pentru endpoint-urile de citire la concurenta mare. Comparatie sync vs async:\n"
+        "  uvicorn backend.wsgi:application --interface wsgi --port 8001\n"
+        "  ASYNC_READ_VIEWS=1 uvicorn backend.asgi:application --port 8002\n"
+        "  python manage.py bench_reads --base-url http://127.0.0.1:8001\n"
+        "  python manage.py bench_reads --base-url http://127.0.0.1:8002"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=2000, help="Numar total de cereri.")
+        parser.add_argument("--user", help="Email-ul userului in numele caruia se fac cererile.")
+        parser.add_argument("--path", action="append", dest="paths", help="Poate fi repetat.")
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/")
+        paths = options["paths"] or DEFAULT_PATHS
+
+        user = (
+            CustomUser.objects.get(email=options["user"])
+            if options["user"]
+            else CustomUser.objects.order_by("id").first()
+        )
+        headers = {}
+        if user is not None:
+            headers["Authorization"] = f"Bearer {MyTokenObtainPairSerializer.get_token(user).access_token}"
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+
+        def hit(i):
+            path = paths[i % len(paths)]
+            started = time.perf_counter()
+            try:
+                ok = requests.get(base_url + path, headers=headers, timeout=60).status_code < 400
+            except requests.RequestException:
+                ok = False
+            latencies[path].append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors[path] += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            list(pool.map(hit, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{base_url}: {options['requests']} cereri, concurenta {options['concurrency']}, "
+            f"{elapsed:.1f}s, {options['requests'] / elapsed:.1f} req/s"
+        )
+        for path in paths:
+            values = latencies[path]
+            self.stdout.write(
+                f"  {path:<36} p50={statistics.median(values):8.1f}ms "
+                f"p95={_percentile(values, 95):8.1f}ms p99={_percentile(values, 99):8.1f}ms "
+                f"erori={errors[path]}"
+            )
@@ -0,0 +1,57 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from events.images import render_variants
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Genereaza variantele redimensionate (WebP/JPEG, vezi events/images.py) pentru imaginile "
+        "de eveniment existente. Redimensionarea ruleaza pe un pool de procese; doar procesul "
+        "principal scrie in DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procese paralele.")
+        parser.add_argument("--all", action="store_true", help="Regenereaza si imaginile care au deja variante.")
+        parser.add_argument("--batch", type=int, default=100, help="Imagini trimise odata catre pool.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.exclude(image="").exclude(image__isnull=True)
+        if not options["all"]:
+            events = events.filter(image_variants={})
+        pending = list(events.order_by("pk").values_list("pk", "image"))
+        if not pending:
+            self.stdout.write("Nicio imagine de procesat.")
+            return
+
+        self.stdout.write(f"{len(pending)} imagini, {options['workers']} procese")
+        # procesele copil nu au voie sa foloseasca conexiunile DB mostenite la fork
+        connections.close_all()
+
+        started = time.perf_counter()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            for offset in range(0, len(pending), options["batch"]):
+                batch = pending[offset:offset + options["batch"]]
+                futures = {pool.submit(render_variants, name): (pk, name) for pk, name in batch}
+                for future in as_completed(futures):
+                    pk, name = futures[future]
+                    try:
+                        variants = future.result()
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"EROARE eveniment #{pk} ({name}): {exc}")
+                        continue
+                    # nu suprascriem daca imaginea a fost schimbata intre timp
+                    Event.objects.filter(pk=pk, image=name).update(image_variants=variants)
+                    done += 1
+                self.stdout.write(f"{done + failed}/{len(pending)}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Gata in {elapsed:.1f}s: {done} imagini, {failed} erori."))
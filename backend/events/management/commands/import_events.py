@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.imports import import_events, read_rows
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Importa in bloc evenimente dintr-un fisier CSV sau JSON (vezi events/imports.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="fisierul .csv sau .json")
+        parser.add_argument("--organizer", required=True, help="email-ul organizatorului")
+        parser.add_argument("--dry-run", action="store_true", help="doar valideaza, nu creeaza nimic")
+
+    def handle(self, *args, **options):
+        organizer_id = (
+            CustomUser.objects.filter(email=options["organizer"]).values_list("pk", flat=True).first()
+        )
+        if organizer_id is None:
+            raise CommandError(f"Organizator inexistent: {options['organizer']}")
+
+        try:
+            with open(options["path"], "rb") as fh:
+                rows = read_rows(fh, options["path"])
+            events, errors = import_events(rows, organizer_id, dry_run=options["dry_run"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in errors:
+            for field, messages in error["errors"].items():
+                self.stderr.write(f"rand {error['row']}, {field}: {' '.join(map(str, messages))}")
+        if errors:
+            raise CommandError(f"{len(errors)} randuri cu erori; nu a fost importat niciun eveniment.")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{len(rows)} evenimente valide (dry run)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(events)} evenimente importate."))
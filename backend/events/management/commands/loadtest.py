@@ -0,0 +1,317 @@
+import itertools
+import json
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+
+from events.models import Category, Event, Faculty
+from interactions.models import Notification, Ticket
+from users.models import CustomUser
+from users.serializers import MyTokenObtainPairSerializer
+
+SEARCH_TERMS = ["conferinta", "workshop", "concert", "hackathon", "seminar", "targ", "sport"]
+
+# Mixuri de scenarii: pondere relativa pentru fiecare actiune a unui utilizator virtual
+MIXES = {
+    "browse": {"list": 6, "list_filtered": 3, "search": 2, "detail": 4},
+    "mixed": {
+        "list": 4, "list_filtered": 2, "search": 1, "detail": 3,
+        "buy": 1, "my_tickets": 2, "notifications": 2, "stats": 1,
+    },
+    "purchase": {"list": 2, "detail": 2, "buy": 4, "my_tickets": 1},
+}
+
+DEFAULT_OUTPUT = Path(settings.BASE_DIR) / "loadtest_results"
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class BuyerPool:
+    """
+    Token-uri ale altor useri, folosite pe rand la cumparari: throttle-ul ticket_buy e per user
+    (10/min implicit), deci cu un singur user per VU masuram 429-uri, nu cumpararea.
+    """
+
+    def __init__(self, tokens):
+        self._tokens = itertools.cycle(tokens)
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            return next(self._tokens)
+
+
+class VirtualUser:
+    """Un student (sau organizator) care navigheaza aplicatia dupa mixul ales."""
+
+    def __init__(self, base_url, token, rng, data, organizer_events, buyers=None):
+        self.base_url = base_url
+        self.rng = rng
+        self.data = data
+        self.organizer_events = organizer_events
+        self.buyers = buyers
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def action(self, name):
+        """Intoarce (eticheta endpoint, metoda, path, body) pentru actiunea data."""
+        rng, data = self.rng, self.data
+        if name == "list":
+            return "GET /api/events/", "GET", "/api/events/", None
+        if name == "list_filtered":
+            params = rng.choice(
+                [
+                    f"faculty={rng.choice(data['faculties'])}",
+                    f"category={rng.choice(data['categories'])}" if data["categories"] else "ordering=trending",
+                    "ordering=trending",
+                ]
+            )
+            return "GET /api/events/?filter", "GET", f"/api/events/?{params}", None
+        if name == "search":
+            return "GET /api/events/?search", "GET", f"/api/events/?search={rng.choice(SEARCH_TERMS)}", None
+        if name == "detail":
+            return "GET /api/events/<id>/", "GET", f"/api/events/{rng.choice(data['events'])}/", None
+        if name == "buy":
+            event_id = rng.choice(data["upcoming"])
+            return "POST /api/interactions/tickets/buy/", "POST", "/api/interactions/tickets/buy/", {"event_id": event_id}
+        if name == "my_tickets":
+            return "GET /api/interactions/tickets/", "GET", "/api/interactions/tickets/", None
+        if name == "notifications":
+            return "GET /api/interactions/notifications/", "GET", "/api/interactions/notifications/", None
+        if name == "stats" and self.organizer_events:
+            event_id = rng.choice(self.organizer_events)
+            return "GET /api/events/<id>/stats/", "GET", f"/api/events/{event_id}/stats/", None
+        return self.action("list")
+
+    def run(self, mix, stop, results, lock):
+        names, weights = zip(*mix.items())
+        while not stop.is_set():
+            label, method, path, body = self.action(self.rng.choices(names, weights)[0])
+            headers = None
+            if method == "POST" and self.buyers is not None:
+                headers = {"Authorization": f"Bearer {self.buyers.next()}"}
+            started = time.perf_counter()
+            try:
+                status = self.session.request(
+                    method, self.base_url + path, json=body, headers=headers, timeout=60
+                ).status_code
+            except requests.RequestException:
+                status = "error"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                results[label].append((elapsed_ms, status))
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de incarcare pe scenarii realiste, contra unui server pornit local pe un DB populat:\n"
+        "  python manage.py loadtest --mix mixed --users 50 --duration 60\n"
+        "Raporteaza throughput si p50/p95/p99 per endpoint si salveaza rezultatul in JSON\n"
+        "(loadtest_results/), ca rularile de pe commit-uri diferite sa poata fi comparate (--compare).\n"
+        "Cumpararile (buy) sunt limitate de throttle-ul ticket_buy (10/min per user): fiecare cumparare\n"
+        "foloseste urmatorul user din --buyers. Daca apar totusi 429 la buy, porneste serverul cu o rata\n"
+        "mai mare, ex. THROTTLE_TICKET_BUY=100000/min python manage.py runserver."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+        parser.add_argument("--users", type=int, default=50, help="Utilizatori virtuali simultani.")
+        parser.add_argument("--duration", type=float, default=60.0, help="Durata (secunde).")
+        parser.add_argument("--warmup", type=float, default=5.0, help="Secunde ignorate la inceput.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--label", help="Eticheta rularii (implicit: commit-ul curent).")
+        parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Director pentru rezultate.")
+        parser.add_argument("--compare", help="Fisier JSON dintr-o rulare anterioara.")
+        parser.add_argument(
+            "--buyers",
+            type=int,
+            default=2000,
+            help="Useri distincti folositi pe rand la cumparari (throttle-ul ticket_buy e per user).",
+        )
+
+    def _data(self):
+        now = timezone.now()
+        published = Event.objects.filter(status="published")
+        data = {
+            "events": list(published.values_list("id", flat=True)[:2000]),
+            "upcoming": list(published.filter(start_date__gt=now).values_list("id", flat=True)[:500]),
+            "faculties": list(Faculty.objects.values_list("id", flat=True)),
+            "categories": list(Category.objects.values_list("id", flat=True)),
+        }
+        if not data["events"] or not data["upcoming"] or not data["faculties"]:
+            raise CommandError("DB-ul nu are destule date (evenimente publicate viitoare, facultati).")
+        return data
+
+    def _users(self, count, rng):
+        # studenti care au deja bilete/notificari, ca "biletele mele" sa nu fie liste goale
+        active = list(
+            CustomUser.objects.filter(is_active=True, is_organizer=False)
+            .annotate(n=Count("tickets"))
+            .order_by("-n", "id")
+            .values_list("id", flat=True)[: count * 4]
+        )
+        if not active:
+            raise CommandError("Nu exista utilizatori in DB.")
+        return list(CustomUser.objects.filter(pk__in=rng.sample(active, min(count, len(active)))))
+
+    def _buyers(self, count, exclude):
+        # useri fara bilete intai: cumpararile lor nu se lovesc de "ai deja bilet"
+        ids = (
+            CustomUser.objects.filter(is_active=True, is_organizer=False)
+            .exclude(pk__in=exclude)
+            .annotate(n=Count("tickets"))
+            .order_by("n", "id")
+            .values_list("id", flat=True)[:count]
+        )
+        return [
+            str(MyTokenObtainPairSerializer.get_token(user).access_token)
+            for user in CustomUser.objects.filter(pk__in=list(ids))
+        ]
+
+    def _organizer_events(self):
+        # stats sunt disponibile doar pentru evenimente terminate, doar organizatorului
+        ended = Event.objects.filter(end_date__lt=timezone.now()).values_list("organizer_id", "id")
+        by_organizer = defaultdict(list)
+        for organizer_id, event_id in ended[:5000]:
+            by_organizer[organizer_id].append(event_id)
+        return by_organizer
+
+    def _summary(self, results, elapsed):
+        endpoints = {}
+        for label, samples in sorted(results.items()):
+            latencies = [ms for ms, _ in samples]
+            statuses = defaultdict(int)
+            for _, status in samples:
+                statuses[str(status)] += 1
+            endpoints[label] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50": round(statistics.median(latencies), 1),
+                "p95": round(_percentile(latencies, 95), 1),
+                "p99": round(_percentile(latencies, 99), 1),
+                "statuses": dict(statuses),
+            }
+        return endpoints
+
+    def _print(self, endpoints, total, elapsed, previous=None):
+        self.stdout.write(f"{total} cereri in {elapsed:.1f}s, {total / elapsed:.1f} req/s")
+        for label, row in endpoints.items():
+            line = (
+                f"  {label:<40} n={row['requests']:<6} {row['rps']:7.1f} req/s "
+                f"p50={row['p50']:7.1f}ms p95={row['p95']:7.1f}ms p99={row['p99']:7.1f}ms "
+                + " ".join(f"{k}:{v}" for k, v in sorted(row["statuses"].items()))
+            )
+            old = (previous or {}).get(label)
+            if old:
+                line += f"  (p95 {row['p95'] - old['p95']:+.1f}ms vs {old['p95']:.1f})"
+            self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/")
+        rng = random.Random(options["seed"])
+        mix = MIXES[options["mix"]]
+
+        data = self._data()
+        organizer_events = self._organizer_events()
+        users = self._users(options["users"], rng)
+        organizers = [
+            CustomUser.objects.get(pk=organizer_id) for organizer_id in list(organizer_events)[: max(1, len(users) // 10)]
+        ]
+
+        buyers = None
+        if "buy" in mix:
+            tokens = self._buyers(options["buyers"], [user.pk for user in users + organizers])
+            buyers = BuyerPool(tokens) if tokens else None
+
+        vus = [
+            VirtualUser(
+                base_url,
+                str(MyTokenObtainPairSerializer.get_token(user).access_token),
+                random.Random(options["seed"] * 1000 + i),
+                data,
+                organizer_events.get(user.id, []),
+                buyers,
+            )
+            for i, user in enumerate(users + organizers)
+        ]
+
+        results, lock, stop = defaultdict(list), threading.Lock(), threading.Event()
+        threads = [threading.Thread(target=vu.run, args=(mix, stop, results, lock)) for vu in vus]
+
+        self.stdout.write(
+            f"Mix '{options['mix']}' pe {base_url}: {len(vus)} utilizatori virtuali, "
+            f"{options['warmup']}s incalzire + {options['duration']}s masurare..."
+        )
+        for thread in threads:
+            thread.start()
+        time.sleep(options["warmup"])
+        with lock:
+            results.clear()
+        started = time.perf_counter()
+        time.sleep(options["duration"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        endpoints = self._summary(results, elapsed)
+        total = sum(row["requests"] for row in endpoints.values())
+
+        previous = None
+        if options["compare"]:
+            previous = json.loads(Path(options["compare"]).read_text())["endpoints"]
+        self._print(endpoints, total, elapsed, previous)
+        throttled = endpoints.get("POST /api/interactions/tickets/buy/", {}).get("statuses", {}).get("429")
+        if throttled:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{throttled} cumparari respinse cu 429: mareste --buyers sau THROTTLE_TICKET_BUY pe server."
+                )
+            )
+
+        label = options["label"] or _git_revision()
+        report = {
+            "label": label,
+            "created_at": timezone.now().isoformat(),
+            "mix": options["mix"],
+            "users": len(vus),
+            "duration": round(elapsed, 2),
+            "seed": options["seed"],
+            "throughput": round(total / elapsed, 2),
+            "volume": {
+                "events": Event.objects.count(),
+                "users": CustomUser.objects.count(),
+                "tickets": Ticket.objects.count(),
+                "notifications": Notification.objects.count(),
+            },
+            "endpoints": endpoints,
+        }
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        path = output / f"{timezone.now():%Y%m%d-%H%M%S}-{label}-{options['mix']}.json"
+        path.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Rezultate salvate in {path}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from events.trending import recompute_all
+
+
+class Command(BaseCommand):
+    help = "Recalculeaza scorurile trending ale evenimentelor din tot istoricul de activitate."
+
+    def handle(self, *args, **options):
+        updated = recompute_all()
+        self.stdout.write(self.style.SUCCESS(f"Scor trending recalculat pentru {updated} evenimente."))
@@ -0,0 +1,313 @@
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from events.locations import get_or_create_locations
+from events.models import Category, Department, Event, Faculty, Location
+from events.trending import recompute_all
+from interactions.models import Favorite, Notification, Review, Ticket
+from users.models import CustomUser
+
+SEED_DOMAIN = "seed.unievent.test"
+SEED_PREFIX = "Seed"
+SEED_PASSWORD = "seed-parola-123"
+
+EVENT_KINDS = ["Conferinta", "Workshop", "Concert", "Hackathon", "Seminar", "Targ", "Sport", "Gala"]
+TOPICS = ["AI", "Robotica", "Energie", "Antreprenoriat", "Muzica", "Cariera", "Design", "Fotbal", "Securitate"]
+CATEGORIES = ["Cultural", "Sportiv", "Academic", "Social", "Cariera", "Voluntariat", "Tehnic", "Arta"]
+FIRST_NAMES = ["Andrei", "Maria", "Ioana", "Mihai", "Elena", "Alex", "Ana", "Radu", "Diana", "Ionut"]
+LAST_NAMES = ["Popescu", "Ionescu", "Pop", "Dumitru", "Stan", "Stoica", "Gheorghe", "Matei", "Rusu"]
+
+# ponderile statusurilor pentru evenimente
+STATUSES = [("published", 70), ("draft", 10), ("pending", 10), ("rejected", 10)]
+
+NOTIFICATION_TITLES = [
+    ("Bilet confirmat", "Biletul tau a fost inregistrat."),
+    ("Eveniment actualizat", "Organizatorul a modificat detaliile evenimentului."),
+    ("Reminder", "Evenimentul la care esti inscris incepe in curand."),
+]
+
+
+@contextmanager
+def _manual_timestamps(*fields):
+    """Dezactiveaza temporar auto_now / auto_now_add, ca datele sa fie imprastiate in timp."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Genereaza un volum mare de date sintetice, determinist din --seed, pentru benchmark-uri "
+        "(loadtest, bench_reads, build_recommendations). Userii primesc toti aceeasi parola "
+        f"('{SEED_PASSWORD}'), hash-uita o singura data. --scale 0.01 pentru o rulare rapida."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiplicator pentru toate volumele.")
+        parser.add_argument("--faculties", type=int, default=30)
+        parser.add_argument("--departments", type=int, default=5, help="Departamente per facultate.")
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--organizers", type=float, default=0.01, help="Fractiunea de organizatori.")
+        parser.add_argument("--events", type=int, default=5_000)
+        parser.add_argument("--years", type=float, default=4, help="Interval acoperit de evenimente (ani).")
+        parser.add_argument("--tickets", type=int, default=20, help="Bilete per user (medie).")
+        parser.add_argument("--favorites", type=int, default=10, help="Favorite per user (medie).")
+        parser.add_argument("--reviews", type=float, default=0.3, help="Fractiunea biletelor trecute cu review.")
+        parser.add_argument("--notifications", type=int, default=10, help="Notificari per user (medie).")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--flush", action="store_true", help="Sterge intai datele generate anterior.")
+
+    # ---- utilitare ----
+
+    def _step(self, label, started):
+        self.stdout.write(f"  {label:<32} {time.perf_counter() - started:7.1f}s")
+
+    def _insert(self, model, objects, batch_size):
+        objects = model.objects.bulk_create(objects, batch_size=batch_size)
+        return [obj.pk for obj in objects]
+
+    def _stream(self, model, rows, batch_size):
+        """bulk_create pe loturi dintr-un generator, fara sa tina totul in memorie."""
+        batch, total = [], 0
+        for obj in rows:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def _flush(self):
+        seed_users = CustomUser.objects.filter(email__endswith="@" + SEED_DOMAIN)
+        # tabelele mari se sterg cu un singur DELETE fiecare (fara cascade in Python)
+        for model in (Notification, Review, Favorite, Ticket):
+            model.objects.filter(user__in=seed_users).delete()
+        Event.objects.filter(organizer__in=seed_users).delete()
+        seed_users.delete()
+        Faculty.objects.filter(name__startswith=SEED_PREFIX).delete()
+        Category.objects.filter(name__startswith=SEED_PREFIX).delete()
+        Location.objects.filter(name__startswith=SEED_PREFIX).delete()
+
+    # ---- generare ----
+
+    def _catalog(self, rng, options):
+        faculties = [
+            Faculty(name=f"{SEED_PREFIX} Facultatea {i:02d}", abbreviation=f"SF{i:02d}")
+            for i in range(options["faculties"])
+        ]
+        faculty_ids = self._insert(Faculty, faculties, options["batch_size"])
+        departments = [
+            Department(faculty_id=faculty_id, name=f"Departamentul {TOPICS[j % len(TOPICS)]} {j}")
+            for faculty_id in faculty_ids
+            for j in range(options["departments"])
+        ]
+        department_ids = self._insert(Department, departments, options["batch_size"])
+        departments_by_faculty = {}
+        for department, pk in zip(departments, department_ids):
+            departments_by_faculty.setdefault(department.faculty_id, []).append(pk)
+
+        category_ids = self._insert(
+            Category, [Category(name=f"{SEED_PREFIX} {name}") for name in CATEGORIES], options["batch_size"]
+        )
+        # prin registrul de locatii: bulk_create simplu ar lasa key / search_text goale
+        locations = get_or_create_locations(
+            (f"{SEED_PREFIX} Sala {i}", f"Strada Universitatii {i}, Bucuresti", "", None, None)
+            for i in range(max(10, options["faculties"] * 3))
+        )
+        location_ids = sorted(location.pk for location in locations.values())
+        return faculty_ids, departments_by_faculty, category_ids, location_ids
+
+    def _users(self, rng, count, organizer_ratio, batch_size, now):
+        # un singur hash pentru toti: CustomUserManager.create_user ar face PBKDF2 per user
+        password = make_password(SEED_PASSWORD)
+        users = [
+            CustomUser(
+                email=f"user{i:06d}@{SEED_DOMAIN}",
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                is_organizer=rng.random() < organizer_ratio,
+                date_joined=now - timedelta(days=rng.uniform(0, 4 * 365)),
+            )
+            for i in range(count)
+        ]
+        ids = self._insert(CustomUser, users, batch_size)
+        organizers = [pk for user, pk in zip(users, ids) if user.is_organizer] or ids[:1]
+        return ids, organizers
+
+    def _events(self, rng, options, organizers, catalog, now):
+        faculty_ids, departments_by_faculty, category_ids, location_ids = catalog
+        span = timedelta(days=365 * options["years"])
+        # 3/4 din interval in trecut, 1/4 in viitor
+        first_start = now - span * 0.75
+        statuses, weights = zip(*STATUSES)
+
+        events = []
+        for i in range(options["events"]):
+            faculty_id = rng.choice(faculty_ids)
+            start = first_start + span * rng.random()
+            kind, topic = rng.choice(EVENT_KINDS), rng.choice(TOPICS)
+            created = start - timedelta(days=rng.uniform(7, 60))
+            events.append(
+                Event(
+                    organizer_id=rng.choice(organizers),
+                    faculty_id=faculty_id,
+                    department_id=rng.choice(departments_by_faculty[faculty_id]) if rng.random() < 0.7 else None,
+                    category_id=rng.choice(category_ids),
+                    location_id=rng.choice(location_ids),
+                    title=f"{kind} {topic} #{i}",
+                    description=f"{kind} despre {topic.lower()} organizat in campus.",
+                    start_date=start,
+                    end_date=start + timedelta(hours=rng.choice([2, 3, 4, 8, 24])),
+                    max_participants=rng.choice([50, 100, 200, 500, 1000, 5000]),
+                    status=rng.choices(statuses, weights)[0],
+                    created_at=created,
+                    updated_at=created,
+                )
+            )
+        ids = self._insert(Event, events, options["batch_size"])
+        return [(pk, event) for pk, event in zip(ids, events) if event.status == "published"]
+
+    def _tickets_and_reviews(self, rng, options, user_ids, published, now):
+        # popularitate Zipf: putine evenimente foarte cautate, coada lunga de evenimente mici
+        order = list(range(len(published)))
+        rng.shuffle(order)
+        cum_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(order))))
+        sold = [0] * len(published)
+        reviews = []
+
+        def tickets():
+            for user_id in user_ids:
+                wanted = rng.randint(0, 2 * options["tickets"])
+                if not wanted:
+                    continue
+                # set => (user, event) unic, ca in unique_together
+                picks = {order[i] for i in rng.choices(range(len(order)), cum_weights=cum_weights, k=wanted)}
+                for index in picks:
+                    event_id, event = published[index]
+                    if sold[index] >= event.max_participants:
+                        continue
+                    sold[index] += 1
+                    purchased_at = min(now, event.start_date - timedelta(days=rng.uniform(0, 30)))
+                    past = event.end_date < now
+                    if past and rng.random() < options["reviews"]:
+                        reviews.append(
+                            Review(
+                                user_id=user_id,
+                                event_id=event_id,
+                                rating=rng.choices(range(1, 6), (1, 1, 3, 6, 5))[0],
+                                comment="Recenzie generata.",
+                                created_at=event.end_date + timedelta(hours=rng.uniform(1, 72)),
+                            )
+                        )
+                    yield Ticket(
+                        user_id=user_id,
+                        event_id=event_id,
+                        qr_code_data=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                        is_checked_in=past and rng.random() < 0.8,
+                        purchased_at=purchased_at,
+                    )
+
+                if len(reviews) >= options["batch_size"]:
+                    Review.objects.bulk_create(reviews)
+                    reviews.clear()
+
+        total_tickets = self._stream(Ticket, tickets(), options["batch_size"])
+        Review.objects.bulk_create(reviews)
+        return total_tickets, Review.objects.filter(user__email__endswith="@" + SEED_DOMAIN).count()
+
+    def _favorites(self, rng, options, user_ids, published, now):
+        def rows():
+            for user_id in user_ids:
+                wanted = min(rng.randint(0, 2 * options["favorites"]), len(published))
+                for event_id, event in rng.sample(published, wanted):
+                    yield Favorite(
+                        user_id=user_id,
+                        event_id=event_id,
+                        added_at=min(now, event.start_date - timedelta(days=rng.uniform(0, 30))),
+                    )
+
+        return self._stream(Favorite, rows(), options["batch_size"])
+
+    def _notifications(self, rng, options, user_ids, now):
+        def rows():
+            for user_id in user_ids:
+                for _ in range(rng.randint(0, 2 * options["notifications"])):
+                    title, message = rng.choice(NOTIFICATION_TITLES)
+                    yield Notification(
+                        user_id=user_id,
+                        title=title,
+                        message=message,
+                        is_read=rng.random() < 0.6,
+                        created_at=now - timedelta(days=rng.uniform(0, 365)),
+                    )
+
+        return self._stream(Notification, rows(), options["batch_size"])
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        for key in ("users", "events"):
+            options[key] = max(1, int(options[key] * scale))
+        options["faculties"] = max(1, int(options["faculties"] * min(1.0, scale * 10)))
+
+        if CustomUser.objects.filter(email__endswith="@" + SEED_DOMAIN).exists() and not options["flush"]:
+            raise CommandError("Exista deja date generate. Foloseste --flush ca sa le regenerezi.")
+
+        rng = random.Random(options["seed"])
+        # momentul de referinta e fixat (ziua curenta), ca doua rulari in aceeasi zi sa dea aceleasi date
+        now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        started = time.perf_counter()
+
+        timestamp_fields = [
+            Event._meta.get_field("created_at"),
+            Event._meta.get_field("updated_at"),
+            Ticket._meta.get_field("purchased_at"),
+            Review._meta.get_field("created_at"),
+            Favorite._meta.get_field("added_at"),
+            Notification._meta.get_field("created_at"),
+        ]
+
+        with _manual_timestamps(*timestamp_fields), transaction.atomic():
+            if options["flush"]:
+                self._flush()
+                self._step("stergere date vechi", started)
+
+            catalog = self._catalog(rng, options)
+            user_ids, organizers = self._users(
+                rng, options["users"], options["organizers"], options["batch_size"], now
+            )
+            self._step(f"{len(user_ids)} useri", started)
+
+            published = self._events(rng, options, organizers, catalog, now)
+            self._step(f"{options['events']} evenimente ({len(published)} publicate)", started)
+
+            tickets, reviews = self._tickets_and_reviews(rng, options, user_ids, published, now)
+            self._step(f"{tickets} bilete, {reviews} review-uri", started)
+
+            favorites = self._favorites(rng, options, user_ids, published, now)
+            self._step(f"{favorites} favorite", started)
+
+            notifications = self._notifications(rng, options, user_ids, now)
+            self._step(f"{notifications} notificari", started)
+
+        recompute_all()
+        self._step("scoruri trending", started)
+        self.stdout.write(self.style.SUCCESS(f"Gata in {time.perf_counter() - started:.1f}s."))
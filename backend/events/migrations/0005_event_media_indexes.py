@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='file',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='event_files/'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='event_images/'),
+        ),
+    ]
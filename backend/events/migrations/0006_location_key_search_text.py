@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_media_indexes'),
+    ]
+
+    operations = [
+        # nullable pana cand 0007 calculeaza cheile si uneste duplicatele
+        migrations.AddField(
+            model_name='location',
+            name='key',
+            field=models.CharField(editable=False, max_length=360, null=True),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='search_text',
+            field=models.CharField(default='', editable=False, max_length=360),
+        ),
+    ]
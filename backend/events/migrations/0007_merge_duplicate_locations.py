@@ -0,0 +1,69 @@
+"""
+Calculeaza cheile de deduplicare pentru locatiile existente si uneste duplicatele: evenimentele
+trec pe locatia cu cel mai mic id din fiecare grup, restul randurilor se sterg.
+"""
+
+import re
+import unicodedata
+
+from django.db import migrations
+
+BATCH = 1000
+
+# copie a functiilor din events.locations de la momentul migrarii: migrarea trebuie sa
+# ruleze la fel si dupa ce modulul aplicatiei se schimba (sau functiile sunt redenumite)
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_NON_WORD_RE.sub(" ", text.lower()).split())
+
+
+def location_key(name, address, max_length):
+    return f"{normalize(name)}|{normalize(address)}"[:max_length]
+
+
+def merge_duplicates(apps, schema_editor):
+    Location = apps.get_model('events', 'Location')
+    Event = apps.get_model('events', 'Event')
+    max_length = Location._meta.get_field('key').max_length
+
+    survivors = {}      # cheie -> locatia pastrata
+    duplicates = {}     # id locatia pastrata -> [id-urile duplicatelor]
+    to_update = []
+    for location in Location.objects.order_by('pk').iterator(chunk_size=BATCH):
+        key = location_key(location.name, location.address, max_length)
+        survivor = survivors.get(key)
+        if survivor is None:
+            location.key = key
+            location.search_text = normalize(f"{location.name} {location.address}")
+            survivors[key] = location
+            to_update.append(location)
+            continue
+        duplicates.setdefault(survivor.pk, []).append(location.pk)
+        if not survivor.google_maps_link and location.google_maps_link:
+            survivor.google_maps_link = location.google_maps_link
+
+    Location.objects.bulk_update(to_update, ['key', 'search_text', 'google_maps_link'], batch_size=BATCH)
+
+    # un UPDATE per grup de duplicate, un DELETE per lot
+    removed = []
+    for survivor_id, duplicate_ids in duplicates.items():
+        Event.objects.filter(location_id__in=duplicate_ids).update(location_id=survivor_id)
+        removed.extend(duplicate_ids)
+    for start in range(0, len(removed), BATCH):
+        Location.objects.filter(pk__in=removed[start:start + BATCH]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_location_key_search_text'),
+    ]
+
+    operations = [
+        # ireversibila ca date (duplicatele sterse nu se refac), dar schema se poate intoarce
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+    ]
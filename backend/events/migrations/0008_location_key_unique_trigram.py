@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+TRIGRAM_INDEX = 'events_location_search_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    # doar Postgres; pe alte baze autocomplete-ul face LIKE fara index (tabel mic)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON events_location USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_merge_duplicate_locations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='location',
+            name='key',
+            field=models.CharField(editable=False, max_length=360, unique=True),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,41 @@
+"""
+Indexurile pentru verificarile de suprapunere din events/schedule.py. Pe Postgres: GiST pe
+tstzrange(start_date, end_date) (cu location_id in fata, prin btree_gist, pentru conflictele
+de sala); pe celelalte baze un index B-tree (location_id, start_date, end_date).
+"""
+
+from django.db import migrations
+
+# aceeasi expresie ca in events.schedule.Overlaps.as_postgresql
+PERIOD = "tstzrange(start_date, GREATEST(end_date, start_date), '[)')"
+
+
+def create_period_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS event_location_period_gist ON events_event USING gist (location_id, {PERIOD})'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS event_period_gist ON events_event USING gist ({PERIOD})'
+        )
+    else:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS event_location_period_idx ON events_event (location_id, start_date, end_date)'
+        )
+
+
+def drop_period_indexes(apps, schema_editor):
+    for name in ('event_location_period_gist', 'event_period_gist', 'event_location_period_idx'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_location_key_unique_trigram'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_period_indexes, drop_period_indexes),
+    ]
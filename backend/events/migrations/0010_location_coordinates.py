@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:27
+
+import re
+from urllib.parse import parse_qs, unquote, urlparse
+
+from django.db import migrations, models
+
+# copie a events.locations.coordinates_from_link de la momentul migrarii: migrarea trebuie
+# sa ruleze la fel si dupa ce modulul aplicatiei se schimba
+_COORDS = r"(-?\d{1,2}(?:\.\d+)?),\s*(-?\d{1,3}(?:\.\d+)?)"
+_PIN_RE = re.compile(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)")
+_AT_RE = re.compile(r"@" + _COORDS)
+_PAIR_RE = re.compile(r"^\s*" + _COORDS + r"\s*$")
+
+
+def coordinates_from_link(url):
+    if not url:
+        return None
+    url = unquote(url)
+    for pattern in (_PIN_RE, _AT_RE):
+        match = pattern.search(url)
+        if match:
+            break
+    else:
+        params = parse_qs(urlparse(url).query)
+        match = next(
+            (
+                _PAIR_RE.match(value)
+                for key in ("q", "ll", "query", "destination", "center")
+                for value in params.get(key, [])
+                if _PAIR_RE.match(value)
+            ),
+            None,
+        )
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None
+
+
+def coordinates_from_links(apps, schema_editor):
+    # locatiile existente cu link de harta care contine coordonatele
+    Location = apps.get_model('events', 'Location')
+    located = []
+    for location in Location.objects.exclude(google_maps_link__isnull=True).exclude(google_maps_link='').iterator(chunk_size=1000):
+        coordinates = coordinates_from_link(location.google_maps_link)
+        if coordinates:
+            location.latitude, location.longitude = coordinates
+            located.append(location)
+    Location.objects.bulk_update(located, ['latitude', 'longitude'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_period_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['latitude', 'longitude'], name='location_lat_lng_idx'),
+        ),
+        migrations.RunPython(coordinates_from_links, migrations.RunPython.noop),
+    ]
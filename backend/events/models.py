@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.conf import settings  
 
@@ -32,9 +33,40 @@ class Location(models.Model):
     address = models.CharField(max_length=255)
     google_maps_link = models.URLField(blank=True, null=True)
 
+    # nume + adresa normalizate (vezi events/locations.py): o locatie fizica = un singur rand
+    key = models.CharField(max_length=360, unique=True, editable=False)
+    # textul dupa care cauta autocomplete-ul (index trigram pe Postgres, vezi migratia 0008)
+    search_text = models.CharField(max_length=360, editable=False, default='')
+    # din google_maps_link cand se poate, altfel trimise de organizator (vezi events/locations.py)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # bounding box-ul din filter_near: interval pe latitude, apoi pe longitude
+            models.Index(fields=['latitude', 'longitude'], name='location_lat_lng_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+    def clean(self):
+        from .locations import location_key
+
+        duplicate = Location.objects.filter(key=location_key(self.name, self.address)).exclude(pk=self.pk)
+        if duplicate.exists():
+            raise ValidationError("Există deja o locație cu acest nume și această adresă.")
+
+    def save(self, *args, **kwargs):
+        from .locations import location_key, normalize
+
+        self.key = location_key(self.name, self.address)
+        self.search_text = normalize(f"{self.name} {self.address}")
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "key", "search_text"}
+        super().save(*args, **kwargs)
+
 class Event(models.Model):
     # Statusurile posibile pentru fluxul de validare
     STATUS_CHOICES = [
@@ -58,18 +90,28 @@ class Event(models.Model):
     end_date = models.DateTimeField()
     
     # --- MEDIA ---
-    image = models.ImageField(upload_to='event_images/', null=True, blank=True)
-    file = models.FileField(upload_to='event_files/', null=True, blank=True)
+    # indexate: backend/media.py cauta evenimentul dupa numele fisierului servit
+    image = models.ImageField(upload_to='event_images/', null=True, blank=True, db_index=True)
+    file = models.FileField(upload_to='event_files/', null=True, blank=True, db_index=True)
+    # variantele redimensionate ale imaginii (vezi events/images.py); {} = inca negenerate
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # --- SETARI ---
     max_participants = models.PositiveIntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
 
+    # --- TRENDING ---
+    # log din scorul cu decay (vezi events/trending.py); 0 = nicio activitate
+    trending_score = models.FloatField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-start_date'] 
+        indexes = [
+            models.Index(fields=['status', '-trending_score'], name='event_status_trending_idx'),
+        ]
 
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -2,4 +2,5 @@ from rest_framework.permissions import BasePermission
 
 class IsEventOrganizer(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.organizer == request.user or request.user.is_staff
+        # dupa id: merge si cu userul din claim-uri, fara a incarca organizatorul
+        return obj.organizer_id == request.user.id or request.user.is_staff
@@ -0,0 +1,71 @@
+"""
+schedule.py (events app)
+
+Suprapuneri de program, fiecare verificata printr-un singur query indexat:
+
+- Overlaps: conditia "intervalul [start_date, end_date) al randului se suprapune cu [start, end)";
+  pe Postgres e scrisa ca tstzrange && tstzrange, exact expresia din indexul GiST (migratia 0009),
+  pe celelalte baze ca doua comparatii acoperite de indexul (location, start_date, end_date)
+- venue_conflict: alt eveniment (in asteptare sau publicat) in aceeasi locatie, in acelasi timp
+- BOOKING_STATUSES: statusurile care ocupa locatia; ciornele si cele respinse nu o ocupa
+- conflict_message: mesajul pentru organizator, comun formularului si importului in bloc
+"""
+
+from django.db.models import BooleanField, DateTimeField, F, Func, Value
+from django.utils import timezone
+
+from .models import Event
+
+BOOKING_STATUSES = ("pending", "published")
+
+
+class Overlaps(Func):
+    """Overlaps("start_date", "end_date", start, end); prefix pentru relatii: "event__"."""
+
+    arity = 4
+    output_field = BooleanField()
+
+    def __init__(self, row_start, row_end, start, end):
+        super().__init__(
+            F(row_start),
+            F(row_end),
+            Value(start, output_field=DateTimeField()),
+            Value(end, output_field=DateTimeField()),
+        )
+
+    def _compile(self, compiler):
+        return [compiler.compile(expression) for expression in self.get_source_expressions()]
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (row_start, p1), (row_end, p2), (start, p3), (end, p4) = self._compile(compiler)
+        return f"({row_start} < {end} AND {row_end} > {start})", [*p1, *p4, *p2, *p3]
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        (row_start, p1), (row_end, p2), (start, p3), (end, p4) = self._compile(compiler)
+        # GREATEST: un interval inversat (end < start, posibil la ciorne) ar arunca eroare in tstzrange
+        sql = (
+            f"tstzrange({row_start}, GREATEST({row_end}, {row_start}), '[)') "
+            f"&& tstzrange({start}, GREATEST({end}, {start}), '[)')"
+        )
+        return sql, [*p1, *p2, *p1, *p3, *p4, *p3]
+
+
+def venue_conflict(start, end, location_key=None, location_id=None, exclude_pk=None):
+    """Primul eveniment care ocupa locatia in intervalul dat (sau None)."""
+    events = Event.objects.filter(status__in=BOOKING_STATUSES).filter(
+        Overlaps("start_date", "end_date", start, end)
+    )
+    if location_id is not None:
+        events = events.filter(location_id=location_id)
+    else:
+        events = events.filter(location__key=location_key)
+    if exclude_pk is not None:
+        events = events.exclude(pk=exclude_pk)
+    return events.only("id", "title", "start_date", "end_date").first()
+
+
+def conflict_message(title, start, end):
+    return (
+        f"Locația este ocupată în acest interval de „{title}” "
+        f"({timezone.localtime(start):%d.%m.%Y %H:%M} - {timezone.localtime(end):%H:%M})."
+    )
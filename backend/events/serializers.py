@@ -1,15 +1,25 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
+from uploads.models import Upload
+from .images import image_files, srcset
+from .locations import get_or_create_location, location_key
+from .schedule import BOOKING_STATUSES, conflict_message, venue_conflict
 from .models import Faculty, Department, Category, Location, Event
+from .tasks import delete_image_files, generate_image_variants
 from users.serializers import UserSerializer
+from backend import media
+from backend.metrics import TimedSerializerMixin
+from backend.moderation import MAX_BATCH
 
-class FacultySerializer(serializers.ModelSerializer):
+class FacultySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Faculty
         fields = ["id", "name", "abbreviation"]
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     faculty = FacultySerializer(read_only=True)
     faculty_id = serializers.PrimaryKeyRelatedField(
         queryset=Faculty.objects.all(), source="faculty", write_only=True
@@ -20,25 +30,36 @@ class DepartmentSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "faculty", "faculty_id"]
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name"]
 
 
-class LocationSerializer(serializers.ModelSerializer):
+class LocationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Location
-        fields = ["id", "name", "address", "google_maps_link"]
+        fields = ["id", "name", "address", "google_maps_link", "latitude", "longitude"]
+
+# relatiile afisate de EventSerializer, de incarcat cu select_related odata cu evenimentul
+EVENT_RELATED = ("organizer", "faculty", "department__faculty", "category", "location")
 
 # Serializer for Event model
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     organizer = UserSerializer(read_only=True)
     tickets_count = serializers.IntegerField(read_only=True)
     seats_left = serializers.SerializerMethodField(read_only=True)
+    image_variants = serializers.SerializerMethodField(read_only=True)
+    # doar pentru ?near=lat,lng (vezi events/locations.py filter_near)
+    distance_km = serializers.SerializerMethodField(read_only=True)
 
     def get_tickets_count(self, obj):
-        return getattr(obj, "tickets_count", None) or obj.tickets.count()
+        count = getattr(obj, "tickets_count", None)
+        return obj.tickets.count() if count is None else count
+
+    def get_distance_km(self, obj):
+        distance = getattr(obj, "distance_km", None)
+        return None if distance is None else round(distance, 2)
 
     def get_seats_left(self, obj):
         if obj.max_participants is None:
@@ -46,6 +67,28 @@ class EventSerializer(serializers.ModelSerializer):
         sold = self.get_tickets_count(obj)
         return max(obj.max_participants - sold, 0)
 
+    def get_image_variants(self, obj):
+        # None pana cand worker-ul genereaza variantele; frontend-ul foloseste atunci `image`
+        if not obj.image or not obj.image_variants:
+            return None
+        request = self.context.get("request")
+
+        def build_url(name):
+            url = default_storage.url(name)
+            url = request.build_absolute_uri(url) if request else url
+            return url if obj.status == "published" else media.signed_url(url, name)
+
+        return srcset(obj.image_variants, build_url)
+
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        # fisierele evenimentelor nepublicate nu sunt publice: URL semnat (vezi backend/media.py)
+        if obj.status != "published":
+            for field in ("image", "file"):
+                if data.get(field):
+                    data[field] = media.signed_url(data[field], getattr(obj, field).name)
+        return data
+
 
     faculty = FacultySerializer(read_only=True)
     faculty_id = serializers.PrimaryKeyRelatedField(
@@ -75,13 +118,13 @@ class EventSerializer(serializers.ModelSerializer):
             "faculty", "faculty_id",
             "department", "department_id",
             "category", "category_id",
-            "location", "location_id",
+            "location", "location_id", "distance_km",
             "start_date", "end_date",
             "max_participants",
             "tickets_count",     
             "seats_left",
             "status",
-            "image", "file",
+            "image", "image_variants", "file",
             "created_at", "updated_at",
         ]
         read_only_fields = ["id", "organizer", "created_at", "updated_at", "status"]
@@ -91,50 +134,106 @@ class EventCreateSerializer(serializers.ModelSerializer):
     location_name = serializers.CharField(write_only=True)
     location_address = serializers.CharField(write_only=True, required=False, allow_blank=True)
     google_maps_link = serializers.URLField(write_only=True, required=False, allow_blank=True)
+    # optionale: fara ele se incearca extragerea din google_maps_link
+    latitude = serializers.FloatField(write_only=True, required=False, allow_null=True, min_value=-90, max_value=90)
+    longitude = serializers.FloatField(write_only=True, required=False, allow_null=True, min_value=-180, max_value=180)
 
     # FK-uri 
     faculty = serializers.PrimaryKeyRelatedField(queryset=Faculty.objects.all(), required=True)
     department = serializers.PrimaryKeyRelatedField(queryset=Department.objects.all(), required=False, allow_null=True)
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False, allow_null=True)
 
+    # fisiere urcate inainte pe bucati (/api/uploads/); alternativa la image / file trimise inline
+    image_upload = serializers.PrimaryKeyRelatedField(
+        queryset=Upload.objects.filter(kind="image", status="complete"),
+        pk_field=serializers.UUIDField(), write_only=True, required=False,
+    )
+    file_upload = serializers.PrimaryKeyRelatedField(
+        queryset=Upload.objects.filter(kind="file", status="complete"),
+        pk_field=serializers.UUIDField(), write_only=True, required=False,
+    )
+
     class Meta:
         model = Event
         fields = [
             "title", "description", 
             "faculty", "department", "category",
             "location_name", "location_address", "google_maps_link", 
+            "latitude", "longitude",
             "start_date", "end_date", 
             "max_participants", 
             "status",
-            "image", "file"
+            "image", "file",
+            "image_upload", "file_upload",
         ]
-    
+
+    def _validate_upload(self, upload):
+        request = self.context.get("request")
+        if request is None or upload.owner_id != request.user.id:
+            raise serializers.ValidationError("Upload inexistent.")
+        return upload
+
+    validate_image_upload = validate_file_upload = _validate_upload
+
+    def _editor(self):
+        # cine poate corecta coordonatele unei locatii partajate (vezi locations.get_or_create_location)
+        request = self.context.get("request")
+        return request.user if request is not None else None
+
+    def _attach_uploads(self, validated_data):
+        """
+        image_upload / file_upload -> numele fisierului, deja mutat in storage la finalizare.
+        Randul de upload se sterge inainte de salvarea evenimentului: daca salvarea esueaza
+        ramane cel mult un fisier orfan, niciodata un eveniment cu fisierul sters de purge_uploads.
+        """
+        attached = []
+        for field in ("image", "file"):
+            upload = validated_data.pop(f"{field}_upload", None)
+            if upload is not None:
+                validated_data[field] = upload.stored_name
+                attached.append(upload.pk)
+        if attached:
+            Upload.objects.filter(pk__in=attached).delete()
+
     def update(self, instance, validated_data):
         loc_name = validated_data.pop("location_name", None)
         loc_addr = validated_data.pop("location_address", None)
         g_link = validated_data.pop("google_maps_link", None)
-
-        # update location (dacă există)
-        if instance.location:
-            if loc_name is not None:
-                instance.location.name = loc_name
-            if loc_addr is not None:
-                instance.location.address = loc_addr
-            if g_link is not None:
-                instance.location.google_maps_link = g_link
-            instance.location.save()
-        else:
-            if loc_name:
-                instance.location = Location.objects.create(
-                    name=loc_name,
-                    address=loc_addr or "",
-                    google_maps_link=g_link or ""
+        latitude = validated_data.pop("latitude", None)
+        longitude = validated_data.pop("longitude", None)
+
+        # locatia e partajata intre evenimente: nu o modificam, ci trecem pe cea din registru
+        # care corespunde noilor valori (campurile netrimise raman cele vechi)
+        if any(value is not None for value in (loc_name, loc_addr, g_link, latitude, longitude)):
+            current = instance.location
+            name = loc_name if loc_name is not None else (current.name if current else "")
+            address = loc_addr if loc_addr is not None else (current.address if current else "")
+            if g_link is None:
+                g_link = current.google_maps_link if current else ""
+            if name:
+                instance.location = get_or_create_location(
+                    name, address, g_link, latitude, longitude, editor=self._editor()
                 )
 
+        self._attach_uploads(validated_data)
+
+        # imagine noua: variantele vechi nu mai corespund, se regenereaza in worker
+        replaced = []
+        if "image" in validated_data:
+            replaced = image_files(instance.image.name, instance.image_variants)
+            validated_data["image_variants"] = {}
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
         instance.save()
+        if "image" in validated_data and instance.image:
+            generate_image_variants.enqueue(event_id=instance.pk)
+        # fisierele vechi se sterg in worker, doar dupa ce salvarea s-a confirmat (on_commit ruleaza
+        # imediat in autocommit, sau la commit-ul tranzactiei exterioare, daca exista una)
+        replaced = [name for name in replaced if name != instance.image.name]
+        if replaced:
+            transaction.on_commit(lambda: delete_image_files.enqueue(names=replaced))
         return instance
     
     def validate(self, attrs):
@@ -152,6 +251,10 @@ class EventCreateSerializer(serializers.ModelSerializer):
 
         errors = {}
 
+        for field in ("image", "file"):
+            if attrs.get(field) and attrs.get(f"{field}_upload"):
+                errors[f"{field}_upload"] = f"Trimite fie {field}, fie {field}_upload."
+
         if max_participants is not None and max_participants < 1:
             errors["max_participants"] = "Numărul de participanți trebuie să fie cel puțin 1."
 
@@ -182,25 +285,65 @@ class EventCreateSerializer(serializers.ModelSerializer):
             elif start_date is not None and end_date <= start_date:
                 errors["end_date"] = "Data de sfârșit trebuie să fie după data de început."
 
+        if not errors:
+            conflict = self._venue_conflict(attrs)
+            if conflict is not None:
+                errors["location_name"] = conflict_message(conflict.title, conflict.start_date, conflict.end_date)
+
         if errors:
             raise serializers.ValidationError(errors)
 
         return attrs
-    
+
+    def _venue_conflict(self, attrs):
+        """Alt eveniment in aceeasi locatie si in acelasi timp (doar pentru cele care ocupa sala)."""
+        instance = self.instance
+        status = attrs.get("status") or (instance.status if instance else "draft")
+        start = attrs.get("start_date", instance.start_date if instance else None)
+        end = attrs.get("end_date", instance.end_date if instance else None)
+        if status not in BOOKING_STATUSES or start is None or end is None or end <= start:
+            return None
+
+        exclude_pk = instance.pk if instance else None
+        if "location_name" in attrs or "location_address" in attrs:
+            # aceeasi rezolvare ca in create / update, fara sa cream locatia
+            current = instance.location if instance else None
+            name = attrs.get("location_name", current.name if current else "")
+            address = attrs.get("location_address", current.address if current else "")
+            if not name:
+                return None
+            return venue_conflict(start, end, location_key=location_key(name, address), exclude_pk=exclude_pk)
+        if instance is not None and instance.location_id is not None:
+            return venue_conflict(start, end, location_id=instance.location_id, exclude_pk=exclude_pk)
+        return None
+
     def create(self, validated_data):
         # 1. Extragem datele despre locatie din request
         loc_name = validated_data.pop('location_name')
         loc_addr = validated_data.pop('location_address', '')
         g_link = validated_data.pop('google_maps_link', '')
+        latitude = validated_data.pop('latitude', None)
+        longitude = validated_data.pop('longitude', None)
 
-        # 2. Cream o noua locatie
-        new_location = Location.objects.create(
-            name=loc_name,
-            address=loc_addr,
-            google_maps_link=g_link
+        # 2. Locatia din registru (refolosita daca mai exista un eveniment in aceeasi sala)
+        new_location = get_or_create_location(
+            loc_name, loc_addr, g_link, latitude, longitude, editor=self._editor()
         )
 
         # 3. Cream evenimentul legat de aceasta noua locatie
+        self._attach_uploads(validated_data)
         event = Event.objects.create(location=new_location, **validated_data)
-        
-        return event
\ No newline at end of file
+
+        # thumbnail-urile se genereaza in afara request-ului (vezi events/images.py)
+        if event.image:
+            generate_image_variants.enqueue(event_id=event.pk)
+
+        return event
+
+
+# Serializer for bulk publish / reject (vezi backend/moderation.py)
+class EventBulkModerationSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_BATCH
+    )
+    status = serializers.ChoiceField(choices=["published", "rejected"])
@@ -0,0 +1,64 @@
+"""
+tasks.py (events app)
+
+Task-uri rulate de worker-ul din jobs (vezi jobs/queue.py).
+"""
+
+from django.core.files.storage import default_storage
+from django.db.models import Q
+
+from interactions.models import Notification
+from jobs.queue import task
+from .images import image_files, render_variants
+from .models import Event
+from .trending import recompute_all
+
+# notificarea trimisa organizatorului dupa moderare (vezi backend/moderation.py)
+MODERATION_MESSAGES = {
+    "published": ("Eveniment aprobat", "Evenimentul „{title}” a fost aprobat și este acum public."),
+    "rejected": ("Eveniment respins", "Evenimentul „{title}” a fost respins de administratori."),
+}
+
+
+@task(priority=-10)
+def recompute_trending():
+    """Recalculare completa a scorurilor trending (costisitoare, prioritate mica)."""
+    recompute_all()
+
+
+@task
+def notify_moderated_events(event_ids, status):
+    """Cate o notificare per eveniment moderat, catre organizatorul lui, intr-un singur INSERT."""
+    title, message = MODERATION_MESSAGES[status]
+    Notification.objects.bulk_create(
+        [
+            Notification(user_id=organizer_id, title=title, message=message.format(title=event_title))
+            for organizer_id, event_title in Event.objects.filter(pk__in=event_ids).values_list(
+                "organizer_id", "title"
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+@task
+def generate_image_variants(event_id):
+    """Thumbnail-urile WebP/JPEG pentru imaginea evenimentului, dupa upload."""
+    name = Event.objects.filter(pk=event_id).values_list("image", flat=True).first()
+    if not name:
+        return
+    variants = render_variants(name)
+    # daca imaginea s-a schimbat intre timp, job-ul pus pentru noua imagine scrie variantele,
+    # iar cele abia generate pentru imaginea veche ar ramane orfane
+    if not Event.objects.filter(pk=event_id, image=name).update(image_variants=variants):
+        delete_image_files(names=image_files(None, variants))
+
+
+@task
+def delete_image_files(names):
+    """Sterge fisierele unei imagini inlocuite (originalul si variantele), daca nu le mai foloseste nimeni."""
+    still_used = Event.objects.filter(Q(image__in=names) | Q(file__in=names)).values_list("image", "file")
+    used = {name for pair in still_used for name in pair}
+    for name in names:
+        if name not in used:
+            default_storage.delete(name)
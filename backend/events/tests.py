@@ -1,3 +1,1003 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+from PIL import Image
+
+from backend import moderation
+from backend.testing import budgets, factories
+from interactions.models import Favorite, Notification, Recommendation, Review, Ticket
+from jobs import queue
+from jobs.models import Job
+from users.models import CustomUser, OrganizerRequest
+from . import async_views, views
+from .locations import coordinates_from_link, get_or_create_location, location_key
+from .models import Category, Department, Event, Faculty, Location
+from .serializers import EventSerializer
+from .images import render_variants
+from .tasks import delete_image_files, generate_image_variants, notify_moderated_events
+from . import trending
+
+# AsyncReadViewTests: aceeasi ruta, o data prin view-ul DRF si o data prin varianta async
+urlpatterns = [
+    path("sync/events/", views.EventListCreateView.as_view()),
+    path("sync/events/<int:pk>/", views.EventDetailView.as_view()),
+    path("async/events/", async_views.EventListAsyncView.as_view()),
+    path("async/events/<int:pk>/", async_views.EventDetailAsyncView.as_view()),
+    path("async/faculties/", async_views.FacultyListAsyncView.as_view()),
+]
+
+
+class EventQueryBudgetTests(budgets.QueryBudgetTestCase):
+    """Bugetele de query-uri pentru rutele din events/urls.py (vezi backend/query_budgets.py)."""
+
+    route_prefix = "api/events/"
+
+    def test_event_list(self):
+        def seed(n):
+            self.make_events(n)
+            return {}
+
+        self.assertQueryBudget("GET", "api/events/", seed)
+
+    def test_event_list_near(self):
+        def seed(n):
+            location = Location.objects.create(name=f"Corp {n}", address="Campus", latitude=44.4355, longitude=26.1008)
+            self.make_events(n, location=location)
+            return {"data": {"near": "44.4360,26.1000", "radius": "2"}}
+
+        self.assertQueryBudget("GET", "api/events/", seed)
+
+    def test_event_create(self):
+        def seed(n):
+            organizer = self.make_user(is_organizer=True)
+            event = self.make_events(n, organizer=organizer)[0]
+            start = timezone.now() + timedelta(days=3)
+            return {
+                "user": organizer,
+                "data": {
+                    "title": "Eveniment nou",
+                    "description": "Descriere",
+                    "faculty": event.faculty_id,
+                    "location_name": "Aula Magna",
+                    "start_date": start.isoformat(),
+                    "end_date": (start + timedelta(hours=2)).isoformat(),
+                    "max_participants": 50,
+                    "status": "draft",
+                },
+            }
+
+        self.assertQueryBudget("POST", "api/events/", seed, status=201)
+
+    def test_event_import(self):
+        def seed(n):
+            organizer = self.make_user(is_organizer=True)
+            event = self.make_events(n, organizer=organizer)[0]
+            start = timezone.now() + timedelta(days=30)
+            row = {
+                "title": "Eveniment importat",
+                "description": "Descriere",
+                "faculty": event.faculty_id,
+                "category": event.category_id,
+                "location_address": event.location.address,
+                "max_participants": 50,
+                "status": "pending",
+            }
+            return {
+                "user": organizer,
+                "data": [
+                    {**row, "location_name": event.location.name, "start_date": start.isoformat(),
+                     "end_date": (start + timedelta(hours=2)).isoformat()},
+                    {**row, "location_name": "Aula Noua", "start_date": start.isoformat(),
+                     "end_date": (start + timedelta(hours=2)).isoformat()},
+                ],
+            }
+
+        self.assertQueryBudget("POST", "api/events/import/", seed, status=201)
+
+    def test_my_events(self):
+        def seed(n):
+            organizer = self.make_user(is_organizer=True)
+            self.make_events(n, organizer=organizer)
+            return {"user": organizer}
+
+        self.assertQueryBudget("GET", "api/events/my/", seed)
+
+    def test_recommended_events(self):
+        def seed(n):
+            user = self.make_user()
+            Recommendation.objects.bulk_create(
+                [
+                    Recommendation(user=user, event=event, score=1.0, rank=rank)
+                    for rank, event in enumerate(self.make_events(n))
+                ]
+            )
+            return {"user": user}
+
+        self.assertQueryBudget("GET", "api/events/recommended/", seed)
+
+    def _event_with_tickets(self, n, **fields):
+        organizer = self.make_user(is_organizer=True)
+        event = self.make_events(1, organizer=organizer, **fields)[0]
+        tickets = self.make_tickets((user, event) for user in self.make_users(n))
+        return organizer, event, tickets
+
+    def test_event_detail(self):
+        def seed(n):
+            _, event, _ = self._event_with_tickets(n)
+            return {"kwargs": {"pk": event.pk}}
+
+        self.assertQueryBudget("GET", "api/events/<int:pk>/", seed)
+
+    def test_event_update(self):
+        def seed(n):
+            organizer, event, _ = self._event_with_tickets(n)
+            return {"user": organizer, "kwargs": {"pk": event.pk}, "data": {"title": "Titlu modificat"}}
+
+        self.assertQueryBudget("PATCH", "api/events/<int:pk>/", seed)
+
+    def test_event_delete(self):
+        def seed(n):
+            organizer, event, _ = self._event_with_tickets(n)
+            return {"user": organizer, "kwargs": {"pk": event.pk}}
+
+        self.assertQueryBudget("DELETE", "api/events/<int:pk>/", seed, status=204)
+
+    def test_event_stats(self):
+        def seed(n):
+            start = timezone.now() - timedelta(days=2)
+            organizer, event, tickets = self._event_with_tickets(n, start_date=start)
+            Review.objects.bulk_create(
+                [Review(user=ticket.user, event=event, rating=5, comment="Foarte bun") for ticket in tickets]
+            )
+            return {"user": organizer, "kwargs": {"pk": event.pk}}
+
+        self.assertQueryBudget("GET", "api/events/<int:pk>/stats/", seed)
+
+    def test_attendees_export(self):
+        def seed(n):
+            organizer, event, _ = self._event_with_tickets(n)
+            return {"user": organizer, "kwargs": {"pk": event.pk}}
+
+        self.assertQueryBudget("GET", "api/events/<int:pk>/attendees/", seed)
+
+    def test_faculties(self):
+        def seed(n):
+            Faculty.objects.bulk_create([Faculty(name=f"Facultatea {i}", abbreviation="F") for i in range(n)])
+            return {}
+
+        self.assertQueryBudget("GET", "api/events/faculties/", seed)
+
+    def test_departments(self):
+        def seed(n):
+            faculties = Faculty.objects.bulk_create(
+                [Faculty(name=f"Facultatea {i}", abbreviation="F") for i in range(n)]
+            )
+            Department.objects.bulk_create([Department(faculty=faculty, name="Dep") for faculty in faculties])
+            return {}
+
+        self.assertQueryBudget("GET", "api/events/departments/", seed)
+
+    def test_categories(self):
+        def seed(n):
+            Category.objects.bulk_create([Category(name=f"Categoria {i}") for i in range(n)])
+            return {}
+
+        self.assertQueryBudget("GET", "api/events/categories/", seed)
+
+    def test_location_autocomplete(self):
+        def seed(n):
+            for i in range(n):
+                Location.objects.create(name=f"Aula {i}", address="Strada 1")
+            return {"user": self.make_user(is_organizer=True), "kwargs": {}}
+
+        self.assertQueryBudget("GET", "api/events/locations/", seed)
+
+    def test_faculty_calendar(self):
+        def seed(n):
+            event = self.make_events(n)[0]
+            return {"kwargs": {"pk": event.faculty_id}}
+
+        self.assertQueryBudget("GET", "api/events/faculties/<int:pk>/calendar.ics", seed)
+
+
+    def test_moderation_queue(self):
+        def seed(n):
+            self.make_events(n, status="pending")
+            OrganizerRequest.objects.bulk_create(
+                [OrganizerRequest(user=user, organization_name="Asociatia") for user in self.make_users(n)]
+            )
+            return {"user": self.make_user(is_staff=True)}
+
+        self.assertQueryBudget("GET", "api/events/admin/moderation/", seed)
+
+    def test_bulk_moderation(self):
+        def seed(n):
+            events = self.make_events(n, status="pending")
+            return {
+                "user": self.make_user(is_staff=True),
+                "data": {"ids": [event.pk for event in events], "status": "published"},
+            }
+
+        self.assertQueryBudget("POST", "api/events/admin/moderation/bulk/", seed)
+
+
+class EventModerationTests(factories.ApiTestCase):
+    """Publicarea pe loturi: un UPDATE, notificari puse la coada, randurile deja moderate sarite."""
+
+    def test_bulk_publish_skips_moderated_events_and_enqueues_notifications(self):
+        organizer = self.make_user(is_organizer=True)
+        pending = self.make_events(3, organizer=organizer, status="pending")
+        draft = self.make_events(1, organizer=organizer, status="draft")[0]
+        ids = [event.pk for event in pending] + [draft.pk, 999999]
+        self.client.force_authenticate(self.make_user(is_staff=True))
+
+        response = self.client.post("/api/events/admin/moderation/bulk/", {"ids": ids, "status": "published"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data["updated"]), sorted(event.pk for event in pending))
+        self.assertEqual(response.data["skipped"], [draft.pk, 999999])
+        self.assertEqual(Event.objects.filter(status="published").count(), 3)
+        [job] = Job.objects.filter(name=notify_moderated_events.task_name)
+        queue.run_job(job)
+        self.assertEqual(Notification.objects.filter(user=organizer, title="Eveniment aprobat").count(), 3)
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(self.make_user())
+        response = self.client.post("/api/events/admin/moderation/bulk/", {"ids": [1], "status": "published"}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_queue_limit_is_clamped(self):
+        self.make_events(3, status="pending")
+        self.client.force_authenticate(self.make_user(is_staff=True))
+
+        for limit, expected in (("-1", 1), ("0", 1), ("2", 2), ("100000", 3)):
+            response = self.client.get(reverse("moderation-queue"), {"limit": limit})
+            self.assertEqual(response.status_code, 200, limit)
+            self.assertEqual(len(response.data["events"]), expected, limit)
+        self.assertEqual(self.client.get(reverse("moderation-queue"), {"limit": "x"}).status_code, 400)
+
+    def test_status_counts_single_query(self):
+        self.make_events(2, status="pending")
+        self.make_events(1, status="published")
+        OrganizerRequest.objects.create(user=self.make_user(), organization_name="Asociatia")
+
+        with self.assertNumQueries(1):
+            counts = moderation.status_counts()
+
+        self.assertEqual(counts["events"], {"pending": 2, "published": 1})
+        self.assertEqual(counts["organizer_requests"], {"pending": 1})
+
+
+class EventAdminTests(factories.ApiTestCase):
+    """Changelist-ul din admin citeste organizatorul si facultatea in acelasi query cu lista."""
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.client.force_login(self.make_user(is_staff=True, is_superuser=True))
+        counts = []
+        for n in (1, 20):
+            self.make_events(n, status="pending")
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("admin:events_event_changelist"))
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(response.context["cl"].result_count, 21)
+
+
+class EventImageVariantTests(factories.ApiTestCase):
+    """Variantele WebP/JPEG se genereaza in worker si apar in EventSerializer."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _jpeg(self, width, height):
+        buffer = BytesIO()
+        Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, "JPEG")
+        return buffer.getvalue()
+
+    def test_upload_enqueues_job(self):
+        organizer = self.make_user(is_organizer=True)
+        faculty = self.make_events(1)[0].faculty
+        start = timezone.now() + timedelta(days=3)
+        self.client.force_authenticate(organizer)
+
+        response = self.client.post("/api/events/", {
+            "title": "Eveniment cu afis",
+            "description": "Descriere",
+            "faculty": faculty.pk,
+            "location_name": "Aula Magna",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(hours=2)).isoformat(),
+            "max_participants": 50,
+            "image": ContentFile(self._jpeg(50, 40), name="afis.jpg"),
+        }, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Job.objects.filter(name=generate_image_variants.task_name).exists())
+
+    def test_variants_are_generated_without_upscaling(self):
+        event = self.make_events(1)[0]
+        event.image.save("afis.jpg", ContentFile(self._jpeg(1200, 800)))
+        self.assertIsNone(EventSerializer(event).data["image_variants"])
+
+        generate_image_variants(event_id=event.pk)
+        event.refresh_from_db()
+
+        card, hero = event.image_variants["card"], event.image_variants["hero"]
+        self.assertEqual([(v["width"], v["height"]) for v in card], [(400, 267), (800, 533)])
+        # 1600 > 1200: originalul nu e marit, se opreste la latimea lui
+        self.assertEqual([v["width"] for v in hero], [960, 1200])
+        self.assertTrue(card[0]["webp"].startswith("event_images/afis__card-400"))
+        with event.image.storage.open(card[0]["webp"]) as fh:
+            self.assertEqual(Image.open(fh).format, "WEBP")
+
+        data = EventSerializer(event).data["image_variants"]
+        self.assertEqual(data["card"]["src"], "/media/" + card[0]["jpeg"])
+        self.assertEqual(data["card"]["webp"], f"/media/{card[0]['webp']} 400w, /media/{card[1]['webp']} 800w")
+
+
+    def test_replacing_image_deletes_old_files(self):
+        organizer = self.make_user(is_organizer=True)
+        event = self.make_events(1, organizer=organizer)[0]
+        event.image.save("afis.jpg", ContentFile(self._jpeg(1200, 800)))
+        generate_image_variants(event_id=event.pk)
+        event.refresh_from_db()
+        old_files = [event.image.name] + [
+            entry[ext] for entries in event.image_variants.values() for entry in entries for ext in ("webp", "jpeg")
+        ]
+        self.assertTrue(all(default_storage.exists(name) for name in old_files))
+        self.assertTrue(any("__card-" in name for name in old_files))
+        self.assertTrue(any("__hero-" in name for name in old_files))
+
+        self.client.force_authenticate(organizer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/events/{event.pk}/",
+                {"image": ContentFile(self._jpeg(50, 40), name="afis-nou.jpg")},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        for job in Job.objects.filter(name=delete_image_files.task_name):
+            queue.run_job(job)
+        event.refresh_from_db()
+        self.assertFalse(any(default_storage.exists(name) for name in old_files))
+        self.assertTrue(default_storage.exists(event.image.name))
+
+    def test_old_files_are_deleted_only_after_commit(self):
+        organizer = self.make_user(is_organizer=True)
+        event = self.make_events(1, organizer=organizer)[0]
+        event.image.save("afis.jpg", ContentFile(self._jpeg(100, 80)))
+
+        self.client.force_authenticate(organizer)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.patch(
+                f"/api/events/{event.pk}/",
+                {"image": ContentFile(self._jpeg(50, 40), name="afis-nou.jpg")},
+                format="multipart",
+            )
+            self.assertEqual(response.status_code, 200)
+            # tranzactia inca deschisa: nicio stergere programata
+            self.assertFalse(Job.objects.filter(name=delete_image_files.task_name).exists())
+        for callback in callbacks:
+            callback()
+        self.assertTrue(Job.objects.filter(name=delete_image_files.task_name).exists())
+
+    def test_variants_for_replaced_image_are_discarded(self):
+        event = self.make_events(1)[0]
+        event.image.save("afis.jpg", ContentFile(self._jpeg(500, 400)))
+        variants = render_variants(event.image.name)
+        generated = [entry["webp"] for entry in variants["card"]]
+
+        def replaced_while_rendering(name):
+            # imaginea se schimba cat timp job-ul ruleaza: variantele lui nu mai apartin nimanui
+            Event.objects.filter(pk=event.pk).update(image="event_images/alta.jpg")
+            return variants
+
+        with patch("events.tasks.render_variants", side_effect=replaced_while_rendering):
+            generate_image_variants(event_id=event.pk)
+        self.assertFalse(any(default_storage.exists(name) for name in generated))
+        self.assertEqual(Event.objects.get(pk=event.pk).image_variants, {})
+
+
+class MediaServingTests(factories.ApiTestCase):
+    """/media/: acces dupa statusul evenimentului, Range, ETag si predarea catre nginx."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        self.organizer = self.make_user(is_organizer=True)
+        self.event = self.make_events(1, organizer=self.organizer, status="draft")[0]
+        self.event.file.save("program.pdf", ContentFile(b"0123456789"))
+        self.url = f"/media/{self.event.file.name}"
+
+    def publish(self):
+        Event.objects.filter(pk=self.event.pk).update(status="published")
+        cache.clear()
+
+    def test_draft_file_only_for_organizer_or_signed_url(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        signed = EventSerializer(self.event).data["file"]
+        self.assertIn("?sig=", signed)
+        response = self.client.get(signed)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Cache-Control"].startswith("private"))
+        self.assertEqual(self.client.get(self.url + "?sig=0:fals").status_code, 404)
+
+        self.client.force_authenticate(self.make_user(is_organizer=True))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.force_authenticate(self.organizer)
+        self.assertEqual(b"".join(self.client.get(self.url).streaming_content), b"0123456789")
+
+    def test_published_file_is_public_and_ranged(self):
+        self.publish()
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Cache-Control"], "public, max-age=300, must-revalidate")
+
+        self.assertEqual(b"".join(self.client.get(self.url, HTTP_RANGE="bytes=-3").streaming_content), b"789")
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=20-").status_code, 416)
+        # If-Range cu alt ETag: fisierul s-a schimbat, se trimite intreg
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"vechi"')
+        self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_image_variants_follow_original(self):
+        self.event.image.save("afis.jpg", ContentFile(b"jpeg"))
+        self.event.image_variants = {"card": [{"width": 400, "height": 300, "webp": "x", "jpeg": "x"}]}
+        self.event.save()
+        variant = self.event.image.storage.save("event_images/afis__card-400.webp", ContentFile(b"webp"))
+
+        self.assertEqual(self.client.get(f"/media/{variant}").status_code, 404)
+        self.publish()
+        self.assertEqual(self.client.get(f"/media/{variant}").status_code, 200)
+
+    def test_unknown_and_traversal_paths_are_hidden(self):
+        self.assertEqual(self.client.get("/media/../manage.py").status_code, 404)
+        self.assertEqual(self.client.get("/media/event_files/altul.pdf").status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE="nginx")
+    def test_nginx_handoff(self):
+        self.publish()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.event.file.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_access_lookup_is_cached(self):
+        self.publish()
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class LocationRegistryTests(factories.ApiTestCase):
+    """O sala = o singura locatie, indiferent de majuscule, diacritice sau spatii."""
+
+    def test_same_place_is_reused(self):
+        first = get_or_create_location("Aula Magnă", "Str. Universității 13")
+        second = get_or_create_location("  aula   magna ", "str universitatii 13", "https://maps.app.goo.gl/x")
+
+        self.assertEqual(first.pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual(first.google_maps_link, "https://maps.app.goo.gl/x")
+        self.assertEqual(Location.objects.count(), 1)
+
+    def test_event_update_does_not_mutate_shared_location(self):
+        organizer = self.make_user(is_organizer=True)
+        shared = get_or_create_location("Aula Magna", "Strada 1")
+        first, second = self.make_events(2, organizer=organizer, location=shared)
+        self.client.force_authenticate(organizer)
+
+        response = self.client.patch(f"/api/events/{first.pk}/", {"location_name": "Sala 2"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        shared.refresh_from_db()
+        self.assertEqual((first.location.name, first.location.address), ("Sala 2", "Strada 1"))
+        self.assertEqual(shared.name, "Aula Magna")
+        self.assertEqual(Event.objects.get(pk=second.pk).location_id, shared.pk)
+
+    def test_autocomplete_ignores_diacritics_and_ranks_by_use(self):
+        organizer = self.make_user(is_organizer=True)
+        rare = get_or_create_location("Sala Mică", "Corp A")
+        popular = get_or_create_location("Aula Mică", "Corp B")
+        self.make_events(2, organizer=organizer, location=popular)
+        self.make_events(1, organizer=organizer, location=rare)
+        self.client.force_authenticate(organizer)
+
+        response = self.client.get("/api/events/locations/", {"q": "mica"})
+
+        self.assertEqual([item["id"] for item in response.data], [popular.pk, rare.pk])
+        self.assertEqual(self.client.get("/api/events/locations/", {"q": "m"}).data, [])
+
+    def test_autocomplete_requires_organizer(self):
+        self.client.force_authenticate(self.make_user())
+        self.assertEqual(self.client.get("/api/events/locations/", {"q": "aula"}).status_code, 403)
+
+    def test_admin_rejects_duplicate(self):
+        get_or_create_location("Aula Magna", "Strada 1")
+        duplicate = Location(name="AULA MAGNA", address="strada 1")
+        self.assertEqual(location_key(duplicate.name, duplicate.address), "aula magna|strada 1")
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+
+
+class VenueConflictTests(factories.ApiTestCase):
+    """Doua evenimente trimise / publicate nu pot ocupa aceeasi sala in acelasi timp."""
+
+    def setUp(self):
+        self.organizer = self.make_user(is_organizer=True)
+        self.location = get_or_create_location("Aula Magna", "Strada 1")
+        self.start = timezone.now() + timedelta(days=10)
+        self.booked = self.make_events(
+            1, organizer=self.organizer, location=self.location, title="Gala",
+            start_date=self.start, end_date=self.start + timedelta(hours=3),
+        )[0]
+        self.client.force_authenticate(self.organizer)
+
+    def payload(self, start, status="pending", **extra):
+        return {
+            "title": "Concert coral",
+            "description": "Descriere",
+            "faculty": self.booked.faculty_id,
+            "category": self.booked.category_id,
+            "location_name": "aula magnă",
+            "location_address": "Strada 1",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(hours=2)).isoformat(),
+            "max_participants": 50,
+            "status": status,
+            **extra,
+        }
+
+    def test_overlapping_booking_is_rejected(self):
+        response = self.client.post("/api/events/", self.payload(self.start + timedelta(hours=1)), format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Gala", response.data["location_name"][0])
+
+    def test_drafts_and_free_slots_are_allowed(self):
+        draft = self.client.post("/api/events/", self.payload(self.start, status="draft"), format="json")
+        later = self.client.post("/api/events/", self.payload(self.start + timedelta(hours=3)), format="json")
+
+        self.assertEqual((draft.status_code, later.status_code), (201, 201))
+
+    def test_moving_an_event_onto_a_booked_slot(self):
+        other = self.make_events(
+            1, organizer=self.organizer, location=self.location, status="pending",
+            start_date=self.start + timedelta(days=1),
+        )[0]
+
+        response = self.client.patch(
+            f"/api/events/{other.pk}/", {"start_date": (self.start + timedelta(hours=2)).isoformat()}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # evenimentul insusi nu e un conflict cu el insusi
+        response = self.client.patch(f"/api/events/{self.booked.pk}/", {"title": "Gala anuala"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+
+class ProximitySearchTests(factories.ApiTestCase):
+    """?near=lat,lng&radius=km: evenimentele din raza, cele mai apropiate intai."""
+
+    def test_coordinates_from_maps_links(self):
+        self.assertEqual(coordinates_from_link("https://www.google.com/maps?q=44.4355,26.1008"), (44.4355, 26.1008))
+        self.assertEqual(
+            coordinates_from_link("https://www.google.com/maps/place/Aula/@44.43,26.10,17z/data=!3d44.4355!4d26.1008"),
+            (44.4355, 26.1008),
+        )
+        self.assertIsNone(coordinates_from_link("https://maps.app.goo.gl/AbCdEf"))
+        self.assertIsNone(coordinates_from_link("https://www.google.com/maps?q=99.1,26.1"))
+
+    def test_explicit_coordinates_update_registry(self):
+        location = get_or_create_location("Aula", "Universitate", "https://www.google.com/maps?q=44.4355,26.1008")
+        # coordonatele deduse din link nu suprascriu, cele introduse explicit da
+        get_or_create_location("Aula", "Universitate", "https://www.google.com/maps?q=45.0,25.0")
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.longitude), (44.4355, 26.1008))
+
+        organizer = self.make_user(is_organizer=True)
+        event, = self.make_events(1, organizer=organizer, location=location)
+        self.client.force_authenticate(organizer)
+        response = self.client.patch(
+            f"/api/events/{event.pk}/", {"latitude": 44.4356, "longitude": 26.1009}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.longitude), (44.4356, 26.1009))
+        self.assertEqual(Event.objects.get(pk=event.pk).location_id, location.pk)
+
+    def test_shared_location_is_not_moved_by_another_organizer(self):
+        location = get_or_create_location("Aula", "Universitate", latitude=44.4355, longitude=26.1008)
+        owner, other = self.make_user(is_organizer=True), self.make_user(is_organizer=True)
+        self.make_events(1, organizer=owner, location=location)
+        event, = self.make_events(1, organizer=other, location=location, start_date=timezone.now() + timedelta(days=9))
+
+        self.client.force_authenticate(other)
+        response = self.client.patch(f"/api/events/{event.pk}/", {"latitude": 45.0, "longitude": 25.0}, format="json")
+        self.assertEqual(response.status_code, 200)
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.longitude), (44.4355, 26.1008))
+
+        # staff-ul poate corecta locatia pentru toti
+        get_or_create_location("Aula", "Universitate", latitude=45.0, longitude=25.0, editor=self.make_user(is_staff=True))
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.longitude), (45.0, 25.0))
+
+    def test_near_filters_by_radius_and_orders_by_distance(self):
+        # Universitate -> ~1.1 km pana la Piata Romana, ~200 km pana la Brasov (afara din cutie)
+        here = get_or_create_location("Aula", "Universitate", "https://www.google.com/maps?q=44.4355,26.1008")
+        close = get_or_create_location("Sala", "Piata Romana", latitude=44.4467, longitude=26.0977)
+        far = get_or_create_location("Aula", "Brasov", latitude=45.6427, longitude=25.5887)
+        unlocated = get_or_create_location("Fara coordonate", "Necunoscuta")
+        for location in (close, here, far, unlocated):
+            self.make_events(1, location=location)
+
+        response = self.client.get("/api/events/", {"near": "44.4355,26.1008", "radius": "3"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item["location"]["id"] for item in data], [here.pk, close.pk])
+        self.assertEqual(data[0]["distance_km"], 0)
+        self.assertAlmostEqual(data[1]["distance_km"], 1.27, delta=0.1)
+
+    def test_invalid_near(self):
+        for params in ({"near": "bucuresti"}, {"near": "44.4,26.1", "radius": "500"}):
+            response = self.client.get("/api/events/", params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("near", response.json())
+
+
+
+class AttendeeExportTests(factories.ApiTestCase):
+    """Exportul participantilor: doar organizatorul / staff, CSV si XLSX."""
+
+    def setUp(self):
+        self.organizer = self.make_user(is_organizer=True)
+        self.event = self.make_events(1, organizer=self.organizer, title="Hackathon UniEvent")[0]
+        users = self.make_users(3)
+        CustomUser.objects.filter(pk=users[0].pk).update(first_name="Ana", last_name="=HYPERLINK(1)")
+        self.tickets = self.make_tickets((user, self.event) for user in users)
+        Ticket.objects.filter(pk=self.tickets[0].pk).update(is_checked_in=True)
+        self.url = reverse("event-attendees-export", kwargs={"pk": self.event.pk})
+
+    def export(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(self.url, params)
+
+    def test_only_organizer_or_staff(self):
+        self.assertEqual(self.export(self.make_user()).status_code, 403)
+        self.assertEqual(self.export(self.make_user(is_staff=True)).status_code, 200)
+
+    def test_csv(self):
+        response = self.export(self.organizer)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hackathon-unievent", response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(body.splitlines()))
+
+        self.assertEqual(rows[0][0], "Bilet")
+        self.assertEqual(len(rows), 4)
+        first = rows[1]
+        self.assertEqual(first[:3], [str(self.tickets[0].pk), "Ana", "'=HYPERLINK(1)"])
+        self.assertEqual(first[4], "da")
+
+    def test_xlsx(self):
+        response = self.export(self.organizer, type="xlsx")
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertEqual(sheet.count("<row>"), 4)
+        self.assertIn("<t>=HYPERLINK(1)</t>", sheet)
+
+    def test_unknown_type(self):
+        self.assertEqual(self.export(self.organizer, type="pdf").status_code, 400)
+
+
+class EventImportTests(factories.ApiTestCase):
+    """Importul in bloc: CSV / JSON, validare pe randuri, totul sau nimic."""
+
+    def setUp(self):
+        self.organizer = self.make_user(is_organizer=True)
+        self.client.force_authenticate(self.organizer)
+        self.faculty = Faculty.objects.create(name="Automatică și Calculatoare", abbreviation="ACS")
+        self.category = Category.objects.create(name="Workshop")
+        self.start = timezone.localtime(timezone.now() + timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+
+    def row(self, hours=0, **fields):
+        start = self.start + timedelta(hours=hours)
+        return {
+            "title": "Workshop Django",
+            "description": "Introducere in Django",
+            "faculty": "ACS",
+            "category": "workshop",
+            "location_name": "Sala EC105",
+            "location_address": "Splaiul Independentei 313",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(hours=2)).isoformat(),
+            "max_participants": "40",
+            "status": "pending",
+            **fields,
+        }
+
+    def post_csv(self, rows, delimiter=";", **params):
+        header = list(rows[0])
+        lines = [delimiter.join(header)] + [delimiter.join(str(row[key]) for key in header) for row in rows]
+        upload = SimpleUploadedFile("program.csv", "\n".join(lines).encode("utf-8-sig"), content_type="text/csv")
+        url = reverse("event-import") + ("?dry_run=1" if params.get("dry_run") else "")
+        return self.client.post(url, {"file": upload}, format="multipart")
+
+    def test_csv_import_resolves_names_and_shares_location(self):
+        response = self.post_csv([self.row(), self.row(hours=3, title="Workshop React")])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 2)
+
+        events = Event.objects.filter(pk__in=response.data["ids"])
+        self.assertEqual({event.faculty_id for event in events}, {self.faculty.pk})
+        self.assertEqual({event.category_id for event in events}, {self.category.pk})
+        self.assertEqual({event.organizer_id for event in events}, {self.organizer.pk})
+        self.assertEqual(Location.objects.filter(name="Sala EC105").count(), 1)
+        self.assertEqual(events[0].location.key, location_key("Sala EC105", "Splaiul Independentei 313"))
+
+    def test_invalid_rows_are_reported_and_nothing_is_created(self):
+        past = timezone.now() - timedelta(days=1)
+        rows = [
+            self.row(),
+            self.row(start_date=past.isoformat(), end_date=(past + timedelta(hours=1)).isoformat()),
+            self.row(hours=1, title="Suprapus"),
+            self.row(hours=5, faculty="Inexistenta"),
+        ]
+        response = self.client.post(reverse("event-import"), {"events": rows}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3, 4])
+        self.assertIn("start_date", response.data["errors"][0]["errors"])
+        self.assertIn("Workshop Django", response.data["errors"][1]["errors"]["location_name"][0])
+        self.assertIn("faculty", response.data["errors"][2]["errors"])
+        self.assertFalse(Event.objects.exists())
+
+    def test_conflict_with_existing_event(self):
+        location = get_or_create_location("Sala EC105", "Splaiul Independentei 313")
+        self.make_events(1, title="Hackathon", location=location, start_date=self.start)
+        response = self.client.post(reverse("event-import"), [self.row(hours=1)], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Hackathon", response.data["errors"][0]["errors"]["location_name"][0])
+
+    def test_dry_run(self):
+        response = self.post_csv([self.row()], delimiter=",", dry_run=True)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["valid"], 1)
+        self.assertFalse(Event.objects.exists())
+
+    # pe SQLite (max. 999 parametri per query) bulk_create imparte INSERT-ul in loturi,
+    # pe care detectorul de N+1 le-ar vedea ca repetate; pe Postgres e un singur INSERT
+    @override_settings(QUERY_INSPECTOR_THRESHOLD=20)
+    def test_large_import_uses_fixed_number_of_queries(self):
+        rows = [self.row(hours=3 * i, location_name=f"Sala {i % 20}") for i in range(500)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("event-import"), rows, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Event.objects.count(), 500)
+        self.assertEqual(Location.objects.filter(name__startswith="Sala ").count(), 20)
+        # lookup-uri + suprapuneri + locatii + bulk_create in loturi, nu cate un query per rand
+        self.assertLess(len(queries), 25)
+
+    def test_management_command(self):
+        path = tempfile.mktemp(suffix=".json")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump([self.row(status="draft")], fh)
+
+        call_command("import_events", path, organizer=self.organizer.email, stdout=StringIO())
+        self.assertEqual(Event.objects.filter(organizer=self.organizer, status="draft").count(), 1)
+
+        with self.assertRaises(CommandError):
+            call_command("import_events", path, organizer="nimeni@test.ro", stdout=StringIO())
+
+
+class TrendingTests(factories.ApiTestCase):
+    def setUp(self):
+        self.event, self.other = self.make_events(2)
+        self.user = self.make_user()
+
+    def score(self, event=None):
+        return Event.objects.get(pk=(event or self.event).pk).trending_score
+
+    def test_record_activity_matches_log_sum_exp(self):
+        first = timezone.now() - timedelta(hours=5)
+        second = timezone.now()
+        trending.record_activity(self.event.pk, "ticket", first)
+        trending.record_activity(self.event.pk, "favorite", second)
+
+        expected = trending._logaddexp(
+            trending._log_contribution(trending.WEIGHTS["ticket"], first),
+            trending._log_contribution(trending.WEIGHTS["favorite"], second),
+        )
+        self.assertAlmostEqual(self.score(), expected, places=6)
+        self.assertAlmostEqual(
+            trending.current_score(self.score(), second),
+            3.0 * 2 ** (-5 / 48) + 2.0,
+            places=6,
+        )
+
+    def test_recent_activity_outranks_older(self):
+        now = timezone.now()
+        # doua bilete vechi de 4 zile (2 timpi de injumatatire) valoreaza cat jumatate de bilet nou
+        trending.record_activity(self.event.pk, "ticket", now - timedelta(days=4))
+        trending.record_activity(self.event.pk, "ticket", now - timedelta(days=4))
+        trending.record_activity(self.other.pk, "ticket", now)
+        self.assertGreater(self.score(self.other), self.score())
+
+    def test_current_score_halves_after_half_life(self):
+        now = timezone.now()
+        trending.record_activity(self.event.pk, "ticket", now)
+        stored = self.score()
+        self.assertAlmostEqual(trending.current_score(stored, now), 3.0, places=6)
+        self.assertAlmostEqual(trending.current_score(stored, now + trending.HALF_LIFE), 1.5, places=6)
+        self.assertEqual(trending.current_score(0), 0.0)
+
+    def test_recompute_all_matches_incremental_scores(self):
+        ticket, = self.make_tickets([(self.user, self.event)])
+        favorite = Favorite.objects.create(user=self.user, event=self.event)
+        trending.record_activity(self.event.pk, "ticket", ticket.purchased_at)
+        trending.record_activity(self.event.pk, "favorite", favorite.added_at)
+        incremental = self.score()
+        Event.objects.filter(pk=self.other.pk).update(trending_score=123.0)
+
+        self.assertEqual(trending.recompute_all(), 1)
+        self.assertAlmostEqual(self.score(), incremental, places=6)
+        self.assertEqual(self.score(self.other), 0)
+
+    def test_remove_activity_subtracts_contribution(self):
+        ticket_at = timezone.now() - timedelta(hours=1)
+        favorite_at = timezone.now()
+        trending.record_activity(self.event.pk, "ticket", ticket_at)
+        ticket_only = self.score()
+        trending.record_activity(self.event.pk, "favorite", favorite_at)
+
+        trending.remove_activity(self.event.pk, "favorite", favorite_at)
+        self.assertAlmostEqual(self.score(), ticket_only, places=6)
+        trending.remove_activity(self.event.pk, "ticket", ticket_at)
+        self.assertEqual(self.score(), 0)
+        # anularea unei activitati deja scazute nu duce scorul sub 0
+        trending.remove_activity(self.event.pk, "ticket", ticket_at)
+        self.assertEqual(self.score(), 0)
+
+    def test_deleting_ticket_or_favorite_lowers_score(self):
+        self.client.force_authenticate(self.user)
+        ticket, = self.make_tickets([(self.user, self.event)])
+        trending.record_activity(self.event.pk, "ticket", ticket.purchased_at)
+        ticket_only = self.score()
+
+        response = self.client.put(f"/api/interactions/favorites/event/{self.event.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.score(), ticket_only)
+        response = self.client.delete(f"/api/interactions/favorites/event/{self.event.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(self.score(), ticket_only, places=6)
+
+        response = self.client.delete(f"/api/interactions/tickets/{ticket.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.score(), 0)
+
+
+class SeedDataTests(factories.ApiTestCase):
+    def test_seed_data_small_scale(self):
+        out = StringIO()
+        call_command("seed_data", scale=0.001, stdout=out)
+        self.assertIn("Gata", out.getvalue())
+
+        locations = Location.objects.filter(name__startswith="Seed ")
+        self.assertTrue(locations.exists())
+        self.assertFalse(locations.filter(key="").exists())
+        self.assertFalse(locations.filter(search_text="").exists())
+        self.assertTrue(Event.objects.filter(location__in=locations).exists())
+
+        # a doua rulare cere --flush, apoi refoloseste / recreeaza locatiile fara conflicte
+        with self.assertRaises(CommandError):
+            call_command("seed_data", scale=0.001, stdout=StringIO())
+        call_command("seed_data", scale=0.001, flush=True, stdout=StringIO())
+        self.assertEqual(CustomUser.objects.filter(email__endswith="@seed.unievent.test").count(), 100)
+
+
+@override_settings(ROOT_URLCONF="events.tests")
+class AsyncReadViewTests(factories.ApiTestCase):
+    """View-urile async intorc exact ce intorc view-urile DRF, cu aceleasi filtre."""
+
+    def setUp(self):
+        self.events = self.make_events(2, title="Concert de jazz")
+        self.make_events(1, title="Seminar", description="Despre jazz", faculty=self.events[0].faculty)
+        self.make_events(1, title="Ciorna", status="draft")
+
+    def async_get(self, path, params=None):
+        return async_to_sync(self.async_client.get)(path, params or {})
+
+    def assertSameResponse(self, path, params=None):
+        expected = self.client.get(f"/sync/{path}", params or {})
+        response = self.async_get(f"/async/{path}", params)
+        self.assertEqual(response.status_code, expected.status_code, params)
+        self.assertEqual(response.json(), expected.json(), params)
+
+    def test_list_filters_match_the_drf_view(self):
+        faculty = self.events[0].faculty_id
+        for params in (
+            {},
+            {"faculty": faculty},
+            {"faculty": faculty, "search": "jazz"},
+            {"search": "concert, jazz"},
+            {"status": "draft"},
+            {"category": self.events[0].category_id, "ordering": "trending"},
+            {"start_date": self.events[0].start_date.isoformat()},
+            # erori de validare din filterset
+            {"faculty": "abc"},
+            {"faculty": 999999},
+            {"start_date": "maine"},
+            {"near": "bucuresti"},
+        ):
+            with self.subTest(params=params):
+                self.assertSameResponse("events/", params)
+
+    def test_detail_matches_the_drf_view(self):
+        self.assertSameResponse(f"events/{self.events[0].pk}/")
+        self.assertSameResponse("events/999999/")
+
+    def test_allow_lists_only_implemented_methods(self):
+        response = async_to_sync(self.async_client.options)("/async/faculties/")
+        self.assertEqual(response["Allow"], "GET, HEAD, OPTIONS")
+        response = async_to_sync(self.async_client.post)("/async/faculties/", {})
+        self.assertEqual(response.status_code, 405)
+
+        # acelasi Allow ca view-urile DRF
+        for path in ("events/", f"events/{self.events[0].pk}/"):
+            expected = self.client.options(f"/sync/{path}")["Allow"]
+            self.assertEqual(async_to_sync(self.async_client.options)(f"/async/{path}")["Allow"], expected)
+        response = async_to_sync(self.async_client.post)(f"/async/events/{self.events[0].pk}/", {})
+        self.assertEqual(response.status_code, 405)
+
+    def test_head_is_answered_like_get(self):
+        for path in ("events/", f"events/{self.events[0].pk}/", "faculties/"):
+            response = async_to_sync(self.async_client.head)(f"/async/{path}")
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response.content, b"")
+
+    def test_writes_are_delegated(self):
+        response = async_to_sync(self.async_client.post)("/async/events/", {}, content_type="application/json")
+        self.assertEqual(response.status_code, 401)
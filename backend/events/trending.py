@@ -0,0 +1,116 @@
+"""
+trending.py (events app)
+
+Scor "trending" per eveniment, din activitate recenta (bilete, favorite, review-uri)
+cu decay exponential, fara agregari la fiecare request.
+
+Folosim "forward decay": in loc sa scadem periodic scorurile tuturor evenimentelor,
+fiecare activitate de la momentul t contribuie cu  w * 2^((t - EPOCH) / HALF_LIFE).
+Impartirea la 2^((now - EPOCH) / HALF_LIFE) e aceeasi pentru toate evenimentele,
+deci ordinea dupa valoarea stocata e exact ordinea dupa scorul cu decay aplicat.
+Ca exponentul sa nu faca overflow in timp, stocam logaritmul sumei (log-sum-exp).
+Orice activitate de dupa EPOCH are logaritm pozitiv, deci 0 inseamna "nicio activitate".
+
+Fiecare activitate = un singur UPDATE atomic pe randul evenimentului. La anulare (bilet
+sters, favorit scos) remove_activity scade exact aceeasi contributie (log-diff-exp), pe baza
+momentului la care a fost adaugata. recompute_all reface scorurile din istoric si corecteaza
+orice deriva (ex. review-uri sterse din admin, care nu trec prin remove_activity).
+"""
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from .models import Event
+
+HALF_LIFE = timedelta(hours=48)
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+WEIGHTS = {
+    "ticket": 3.0,
+    "favorite": 2.0,
+    "review": 1.0,
+}
+
+_LN2 = math.log(2)
+
+# sub e^-50 contributia e neglijabila; limita evita underflow la EXP() in PostgreSQL
+_MIN_EXPONENT = -50.0
+# la scadere: un rest mai mic de atat (relativ) e eroare de rotunjire, adica "nimic ramas"
+_REMOVE_EPSILON = 1e-6
+
+
+def _log_contribution(weight, when):
+    return math.log(weight) + (when - EPOCH) / HALF_LIFE * _LN2
+
+
+def _logaddexp(a, b):
+    if a is None:
+        return b
+    hi, lo = max(a, b), min(a, b)
+    return hi + math.log1p(math.exp(lo - hi))
+
+
+def record_activity(event_id, kind, when=None):
+    """Adauga contributia unei activitati (`kind` din WEIGHTS) la scorul evenimentului."""
+    x = Value(_log_contribution(WEIGHTS[kind], when or timezone.now()))
+    score = F("trending_score")
+
+    Event.objects.filter(pk=event_id).update(
+        trending_score=Greatest(score, x) + Ln(Value(1.0) + Exp(Greatest(-Abs(score - x), Value(_MIN_EXPONENT))))
+    )
+
+
+def remove_activity(event_id, kind, when):
+    """Scade contributia unei activitati anulate; `when` = momentul la care a fost adaugata."""
+    x = Value(_log_contribution(WEIGHTS[kind], when))
+    score = F("trending_score")
+
+    # log(e^s - e^x) = s + log(1 - e^(x - s)); daca x >= s nu mai ramane nimic
+    Event.objects.filter(pk=event_id).update(
+        trending_score=Case(
+            When(
+                trending_score__gt=x + Value(_REMOVE_EPSILON),
+                then=score + Ln(Value(1.0) - Exp(Greatest(x - score, Value(_MIN_EXPONENT)))),
+            ),
+            default=Value(0.0),
+        )
+    )
+
+
+def current_score(stored, now=None):
+    """Scorul cu decay aplicat la momentul `now`, pornind de la valoarea stocata."""
+    if not stored:
+        return 0.0
+    return math.exp(stored - ((now or timezone.now()) - EPOCH) / HALF_LIFE * _LN2)
+
+
+def recompute_all():
+    """
+    Recalculeaza de la zero scorurile tuturor evenimentelor din istoricul complet.
+    Util dupa migrare sau daca se schimba WEIGHTS / HALF_LIFE.
+    """
+    from interactions.models import Favorite, Review, Ticket
+
+    scores = {}
+    sources = [
+        (Ticket.objects.values_list("event_id", "purchased_at"), WEIGHTS["ticket"]),
+        (Favorite.objects.values_list("event_id", "added_at"), WEIGHTS["favorite"]),
+        (Review.objects.values_list("event_id", "created_at"), WEIGHTS["review"]),
+    ]
+    for qs, weight in sources:
+        for event_id, when in qs.iterator(chunk_size=5000):
+            scores[event_id] = _logaddexp(scores.get(event_id), _log_contribution(weight, when))
+
+    with transaction.atomic():
+        Event.objects.update(trending_score=0)
+        Event.objects.bulk_update(
+            [Event(pk=event_id, trending_score=score) for event_id, score in scores.items()],
+            ["trending_score"],
+            batch_size=1000,
+        )
+    return len(scores)
@@ -1,22 +1,55 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
   EventListCreateView, 
   EventDetailView,
+  EventImportView,
   FacultyListView, 
   DepartmentListView, 
   CategoryListView,
+  LocationAutocompleteView,
+  FacultyCalendarView,
   MyEventsListView,
   EventStatsView,
+  EventAttendeesExportView,
+  RecommendedEventListView,
+  ModerationQueueAdminView,
+  EventBulkModerationAdminView,
 )
 
+from .async_views import (
+  EventListAsyncView,
+  EventDetailAsyncView,
+  FacultyListAsyncView,
+  DepartmentListAsyncView,
+  CategoryListAsyncView,
+)
+
+# Pe ASGI citirile merg prin view-urile async; scrierile sunt delegate tot view-urilor DRF
+async_reads = settings.ASYNC_READ_VIEWS
+event_list_view = EventListAsyncView if async_reads else EventListCreateView
+event_detail_view = EventDetailAsyncView if async_reads else EventDetailView
+faculty_list_view = FacultyListAsyncView if async_reads else FacultyListView
+department_list_view = DepartmentListAsyncView if async_reads else DepartmentListView
+category_list_view = CategoryListAsyncView if async_reads else CategoryListView
+
 urlpatterns = [
-    path("", EventListCreateView.as_view()),
+    path("", event_list_view.as_view()),
     path("my/", MyEventsListView.as_view(), name="my-events"),
-    path("<int:pk>/", EventDetailView.as_view()),
+    path("import/", EventImportView.as_view(), name="event-import"),
+    path("recommended/", RecommendedEventListView.as_view(), name="recommended-events"),
+    path("<int:pk>/", event_detail_view.as_view()),
     path("<int:pk>/stats/", EventStatsView.as_view(), name="event-stats"),
+    path("<int:pk>/attendees/", EventAttendeesExportView.as_view(), name="event-attendees-export"),
+
+    # moderare (staff), vezi backend/moderation.py
+    path("admin/moderation/", ModerationQueueAdminView.as_view(), name="moderation-queue"),
+    path("admin/moderation/bulk/", EventBulkModerationAdminView.as_view(), name="event-bulk-moderation"),
 
     # Endpoints for Faculties, Departments, Categories - DIANA
-    path("faculties/", FacultyListView.as_view(), name='faculty-list'),
-    path("departments/", DepartmentListView.as_view(), name='department-list'),
-    path("categories/", CategoryListView.as_view(), name='category-list'),
+    path("faculties/", faculty_list_view.as_view(), name='faculty-list'),
+    path("faculties/<int:pk>/calendar.ics", FacultyCalendarView.as_view(), name='faculty-calendar'),
+    path("departments/", department_list_view.as_view(), name='department-list'),
+    path("categories/", category_list_view.as_view(), name='category-list'),
+    path("locations/", LocationAutocompleteView.as_view(), name='location-autocomplete'),
 ]
@@ -1,24 +1,56 @@
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Count, Avg
-from rest_framework.exceptions import PermissionDenied, NotFound
+from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
+from django.views import View
 
-from .models import Event, Faculty, Department, Category
+from .exports import attendee_rows, stream_csv, stream_xlsx
+from .imports import import_events, read_rows, rows_from_data
+from .calendar import feed_events, feed_version, ics_response, not_modified
+from .models import Event, Faculty, Department, Category, Location
+from .locations import filter_near, normalize, parse_near, search_locations
 from interactions.models import Ticket, Review
 from .serializers import (
+    EVENT_RELATED,
     EventSerializer,
     EventCreateSerializer,
     FacultySerializer,
     DepartmentSerializer,
     CategorySerializer,
+    LocationSerializer,
+    EventBulkModerationSerializer,
 )
 from .permissions import IsEventOrganizer
 
+
+def attach_tickets_count(events):
+    """
+    Pentru evenimente incarcate prin alt model (bilete, favorite): numarul de bilete
+    vandute, intr-un singur query agregat, in loc de un COUNT per eveniment.
+    """
+    events = list(events)
+    sold = dict(
+        Ticket.objects.filter(event_id__in={event.id for event in events})
+        .values("event_id")
+        .annotate(count=Count("id"))
+        .values_list("event_id", "count")
+        .order_by()
+    )
+    for event in events:
+        event.tickets_count = sold.get(event.id, 0)
+
 # Project-wide imports
+from users.authentication import ClaimsJWTAuthentication
 from users.permissions import IsOrganizer
+from users.models import OrganizerRequest
+from users.serializers import OrganizerRequestSerializer
+from backend.moderation import moderate_events, status_counts
 
 # List and Create Events
 class EventListCreateView(generics.ListCreateAPIView):   
@@ -26,6 +58,7 @@ class EventListCreateView(generics.ListCreateAPIView):
     Listare evenimente publicate (GET) și creare evenimente noi (POST).
     """
 
+    authentication_classes = [ClaimsJWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['faculty', 'category', 'status', 'start_date']
     search_fields = ["title", "description"]
@@ -35,7 +68,25 @@ class EventListCreateView(generics.ListCreateAPIView):
         Această metodă decide ce evenimente sunt returnate.
         Pentru lista publică (GET), vrem doar evenimentele PUBLICATE.
         """
-        return Event.objects.filter(status='published').annotate(tickets_count=Count('tickets')).order_by('-start_date')
+        qs = (
+            Event.objects.filter(status='published')
+            .select_related(*EVENT_RELATED)
+            .annotate(tickets_count=Count('tickets'))
+        )
+
+        # ?near=lat,lng&radius=km -> cele mai apropiate intai (vezi events/locations.py)
+        params = self.request.query_params
+        if params.get('near'):
+            try:
+                latitude, longitude, radius = parse_near(params['near'], params.get('radius'))
+            except ValueError as exc:
+                raise ValidationError({'near': [str(exc)]})
+            return filter_near(qs, latitude, longitude, radius).order_by('distance_km', '-start_date')
+
+        # ?ordering=trending -> scor precalculat si indexat (vezi events/trending.py)
+        if self.request.query_params.get('ordering') == 'trending':
+            return qs.order_by('-trending_score', '-start_date')
+        return qs.order_by('-start_date')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -50,19 +101,48 @@ class EventListCreateView(generics.ListCreateAPIView):
             return [permissions.IsAuthenticated(), IsOrganizer()] 
         return [permissions.AllowAny()] 
 
+class EventImportView(APIView):
+    """
+    Import în bloc (programul unui semestru): fișier CSV / JSON în câmpul `file` (multipart)
+    sau JSON în corp (listă sau {"events": [...]}). ?dry_run=1 doar validează.
+    Dacă un rând are erori nu se creează nimic; răspunsul conține erorile pe rânduri.
+    """
+
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsOrganizer]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        try:
+            rows = read_rows(upload, upload.name) if upload else rows_from_data(request.data)
+            events, errors = import_events(
+                rows, request.user.id, dry_run=request.query_params.get("dry_run") in ("1", "true")
+            )
+        except ValueError as exc:
+            raise ValidationError({"file": [str(exc)]})
+
+        if errors:
+            return Response({"created": 0, "errors": errors}, status=400)
+        if not events:
+            # dry run reusit
+            return Response({"created": 0, "valid": len(rows), "errors": []})
+        return Response({"created": len(events), "ids": [event.pk for event in events], "errors": []}, status=201)
+
 # Retrieve Faculties, Departments, Categories - DIANA
 class FacultyListView(generics.ListAPIView):
     """ Listare facultăți. """
 
     queryset = Faculty.objects.all()
     serializer_class = FacultySerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.AllowAny] 
 
 class DepartmentListView(generics.ListAPIView):
     """ Listare departamente. """
 
-    queryset = Department.objects.all()
+    queryset = Department.objects.select_related("faculty")
     serializer_class = DepartmentSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.AllowAny]
 
 class CategoryListView(generics.ListAPIView):
@@ -70,15 +150,70 @@ class CategoryListView(generics.ListAPIView):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.AllowAny]
 
+class LocationAutocompleteView(generics.ListAPIView):
+    """ Autocomplete locații pentru formularul de eveniment (?q=aula). """
+
+    serializer_class = LocationSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsOrganizer]
+
+    def get_queryset(self):
+        query = self.request.query_params.get("q", "")
+        # sub 2 caractere orice locatie s-ar potrivi
+        if len(normalize(query)) < 2:
+            return Location.objects.none()
+        return search_locations(query)
+
+class FacultyCalendarView(View):
+    """ Feed iCalendar public cu evenimentele publicate ale unei facultăți. """
+
+    # View Django simplu: DRF ar raspunde 406 aplicatiilor care cer text/calendar
+
+    def get(self, request, pk):
+        events = feed_events(Event.objects.filter(faculty_id=pk, status="published"))
+        version = feed_version(events)
+        # poll-urile repetate se opresc aici, dupa un singur query
+        response = not_modified(request, version)
+        if response is not None:
+            return response
+        faculty = get_object_or_404(Faculty, pk=pk)
+        return ics_response(request, events, faculty.name, version, f"faculty-{pk}.ics", public=True)
+
 # 06.01.2026 List Events Organized by the Authenticated User
 class MyEventsListView(generics.ListAPIView):
     serializer_class = EventSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Event.objects.filter(organizer=self.request.user).annotate(tickets_count=Count('tickets')).order_by("-created_at")
+        return (
+            Event.objects.filter(organizer_id=self.request.user.id)
+            .select_related(*EVENT_RELATED)
+            .annotate(tickets_count=Count('tickets'))
+            .order_by("-created_at")
+        )
+
+
+# Recomandari "pentru tine" (precalculate de comanda build_recommendations)
+class RecommendedEventListView(generics.ListAPIView):
+    serializer_class = EventSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            Event.objects.filter(
+                recommendations__user_id=self.request.user.id,
+                status="published",
+                start_date__gt=timezone.now(),
+            )
+            .select_related(*EVENT_RELATED)
+            .annotate(tickets_count=Count("tickets"))
+            .order_by("recommendations__rank")
+        )
 
 
 # Retrieve, Update, Delete Event
@@ -86,7 +221,8 @@ class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Vizualizare, editare și ștergere eveniment.
     """
-    queryset = Event.objects.annotate(tickets_count=Count('tickets'))
+    queryset = Event.objects.select_related(*EVENT_RELATED).annotate(tickets_count=Count('tickets'))
+    authentication_classes = [ClaimsJWTAuthentication]
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
@@ -175,3 +311,74 @@ class EventStatsView(APIView):
         )
 
 
+class EventAttendeesExportView(APIView):
+    """
+    Lista participanților (?type=csv implicit, ?type=xlsx), scrisă în streaming.
+    Acces: organizatorul evenimentului sau staff (IsEventOrganizer).
+    """
+
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsEventOrganizer]
+
+    FORMATS = {
+        "csv": ("text/csv; charset=utf-8", stream_csv),
+        "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", stream_xlsx),
+    }
+
+    def get(self, request, pk):
+        export_type = request.query_params.get("type", "csv")
+        if export_type not in self.FORMATS:
+            raise ValidationError({"type": "Format necunoscut; folosește csv sau xlsx."})
+
+        event = get_object_or_404(Event.objects.only("id", "title", "organizer_id"), pk=pk)
+        self.check_object_permissions(request, event)
+
+        content_type, stream = self.FORMATS[export_type]
+        response = StreamingHttpResponse(stream(attendee_rows(event.pk)), content_type=content_type)
+        filename = f"{slugify(event.title) or 'eveniment'}-{event.pk}-participanti.{export_type}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+
+# Coada de moderare pentru staff: cele mai vechi evenimente / cereri in asteptare + totaluri
+class ModerationQueueAdminView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    max_limit = 200
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 50))
+        except ValueError:
+            raise ValidationError({"limit": "Trebuie să fie un număr întreg."})
+        # slice negativ pe queryset ridica exceptie (500): limita ramane in 1..max_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        events = (
+            Event.objects.filter(status="pending")
+            .select_related(*EVENT_RELATED)
+            .annotate(tickets_count=Count("tickets"))
+            .order_by("created_at")[:limit]
+        )
+        requests = (
+            OrganizerRequest.objects.filter(status="pending")
+            .select_related("user")
+            .order_by("created_at")[:limit]
+        )
+        return Response({
+            "counts": status_counts(),
+            "events": EventSerializer(events, many=True).data,
+            "organizer_requests": OrganizerRequestSerializer(requests, many=True).data,
+        })
+
+# Publicare / respingere pe loturi (un singur UPDATE, notificari puse la coada)
+class EventBulkModerationAdminView(generics.GenericAPIView):
+    serializer_class = EventBulkModerationSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        updated = moderate_events(ids, serializer.validated_data["status"])
+        return Response({"updated": updated, "skipped": sorted(set(ids) - set(updated))})
@@ -1,20 +1,42 @@
 from django.contrib import admin
-from .models import Ticket, Review, Favorite, Notification
+
+from backend.admin_utils import AutocompleteFilter, LargeTableAdmin
+from .models import Ticket, Review, Favorite, Notification, Recommendation
+
+# Tabelele de aici cresc cu numarul de utilizatori x evenimente: listele fac JOIN pe
+# user/event, evenimentele se filtreaza prin autocomplete, iar totalul e estimat
 
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(LargeTableAdmin):
     list_display = ('user', 'event', 'is_checked_in', 'purchased_at')
-    list_filter = ('is_checked_in', 'event')
+    list_select_related = ('user', 'event')
+    list_filter = ('is_checked_in', ('event', AutocompleteFilter))
     search_fields = ('user__email', 'event__title', 'qr_code_data')
+    autocomplete_fields = ('user', 'event')
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = ('event', 'user', 'rating', 'created_at')
-    list_filter = ('rating', 'event')
+    list_select_related = ('event', 'user')
+    list_filter = ('rating', ('event', AutocompleteFilter))
+    autocomplete_fields = ('user', 'event')
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(LargeTableAdmin):
     list_display = ('user', 'title', 'is_read', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('is_read',)
+    autocomplete_fields = ('user',)
+
+@admin.register(Recommendation)
+class RecommendationAdmin(LargeTableAdmin):
+    list_display = ('user', 'event', 'rank', 'score', 'created_at')
+    list_select_related = ('user', 'event')
+    search_fields = ('user__email', 'event__title')
+    autocomplete_fields = ('user', 'event')
 
-admin.site.register(Favorite)
\ No newline at end of file
+@admin.register(Favorite)
+class FavoriteAdmin(LargeTableAdmin):
+    list_display = ('user', 'event', 'added_at')
+    list_select_related = ('user', 'event')
+    autocomplete_fields = ('user', 'event')
@@ -0,0 +1,27 @@
+"""
+Variante async (ASGI) pentru endpoint-urile de citire din interactions
+(portofelul de bilete si notificarile userului).
+"""
+
+from asgiref.sync import sync_to_async
+
+from backend.async_views import AsyncReadView
+from events.views import attach_tickets_count
+from .views import NotificationListView, TicketListView
+
+
+class TicketListAsyncView(AsyncReadView):
+    sync_view = TicketListView
+    login_required = True
+
+    async def get_data(self, request):
+        view = self.drf_view(request)
+        tickets = [ticket async for ticket in (await self.filtered_queryset(view)).aiterator()]
+        # numarul de bilete vandute per eveniment, intr-un singur query agregat (ca TicketListView.list)
+        await sync_to_async(attach_tickets_count)([ticket.event for ticket in tickets])
+        return view.get_serializer(tickets, many=True).data
+
+
+class NotificationListAsyncView(AsyncReadView):
+    sync_view = NotificationListView
+    login_required = True
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from interactions.recommendations import DEFAULT_TOP_K, benchmark, build_recommendations
+
+
+class Command(BaseCommand):
+    help = "Reconstruieste recomandarile 'pentru tine' (item-item CF). Se ruleaza periodic, ex. din cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Cate recomandari se pastreaza per user.")
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Nu atinge DB-ul; masoara timpul si memoria pe o matrice sintetica.",
+        )
+        parser.add_argument("--users", type=int, default=50_000, help="Numar useri pentru --benchmark.")
+        parser.add_argument("--events", type=int, default=5_000, help="Numar evenimente pentru --benchmark.")
+        parser.add_argument("--per-user", type=int, default=20, help="Interactiuni per user pentru --benchmark.")
+
+    def handle(self, *args, **options):
+        if options["benchmark"]:
+            result = benchmark(
+                n_users=options["users"],
+                n_events=options["events"],
+                per_user=options["per_user"],
+                k=options["top_k"],
+            )
+            self.stdout.write(
+                f"{result['users']} useri x {result['events']} evenimente, "
+                f"{result['interactions']} interactiuni, {result['similarity_nnz']} perechi similare"
+            )
+            for stage, seconds in result["timings"].items():
+                self.stdout.write(f"  {stage:<12} {seconds:8.2f}s")
+            self.stdout.write(f"  total        {sum(result['timings'].values()):8.2f}s")
+            self.stdout.write(f"  memorie max  {result['peak_memory_mb']:8.1f} MB")
+            self.stdout.write(f"  recomandari  {result['recommendations']}")
+            return
+
+        written = build_recommendations(k=options["top_k"])
+        self.stdout.write(self.style.SUCCESS(f"Au fost generate {written} recomandari."))
@@ -0,0 +1,139 @@
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event
+from users.models import CustomUser
+from users.serializers import MyTokenObtainPairSerializer
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de incarcare: simuleaza o 'furtuna' de cumparari de bilete pe un eveniment "
+        "si masoara in paralel latenta listei de evenimente. Ruleaza contra unui server "
+        "pornit local (scrie bilete in DB-ul acelui server)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--event", type=int, help="Evenimentul tinta (implicit: primul publicat).")
+        parser.add_argument("--buyers", type=int, default=200, help="Cati useri cumpara.")
+        parser.add_argument("--concurrency", type=int, default=32, help="Fire de executie pentru cumparari.")
+        parser.add_argument("--duration", type=float, default=15.0, help="Durata furtunii (secunde).")
+        parser.add_argument("--baseline", type=float, default=3.0, help="Masuratoare fara incarcare (secunde).")
+
+    def _users(self, count):
+        users = list(CustomUser.objects.filter(email__startswith="storm-").order_by("id")[:count])
+        missing = count - len(users)
+        if missing > 0:
+            # parola inutilizabila: nu platim hashing-ul PBKDF2 pentru useri de test
+            unusable = make_password(None)
+            CustomUser.objects.bulk_create(
+                [
+                    CustomUser(email=f"storm-{len(users) + i}@load.test", password=unusable)
+                    for i in range(missing)
+                ],
+                ignore_conflicts=True,
+            )
+            users = list(CustomUser.objects.filter(email__startswith="storm-").order_by("id")[:count])
+        return users
+
+    def _probe(self, url, stop, latencies):
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                session.get(url, timeout=30)
+            except requests.RequestException:
+                pass
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.1)
+
+    def _measure_list(self, url, seconds):
+        stop, latencies = threading.Event(), []
+        probe = threading.Thread(target=self._probe, args=(url, stop, latencies))
+        probe.start()
+        time.sleep(seconds)
+        stop.set()
+        probe.join()
+        return latencies
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/")
+        list_url = f"{base_url}/api/events/"
+        buy_url = f"{base_url}/api/interactions/tickets/buy/"
+
+        event = (
+            Event.objects.filter(pk=options["event"]).first()
+            if options["event"]
+            else Event.objects.filter(status="published").first()
+        )
+        if event is None:
+            raise CommandError("Nu exista un eveniment publicat pentru test.")
+
+        tokens = [
+            str(MyTokenObtainPairSerializer.get_token(user).access_token)
+            for user in self._users(options["buyers"])
+        ]
+
+        self.stdout.write(f"Baseline lista evenimente ({options['baseline']}s)...")
+        baseline = self._measure_list(list_url, options["baseline"])
+
+        statuses = Counter()
+        stop = threading.Event()
+        storm_latencies = []
+        probe = threading.Thread(target=self._probe, args=(list_url, stop, storm_latencies))
+
+        def buyer(my_tokens):
+            session = requests.Session()
+            i = 0
+            while not stop.is_set():
+                token = my_tokens[i % len(my_tokens)]
+                i += 1
+                try:
+                    response = session.post(
+                        buy_url,
+                        json={"event_id": event.id},
+                        headers={"Authorization": f"Bearer {token}"},
+                        timeout=30,
+                    )
+                    statuses[response.status_code] += 1
+                except requests.RequestException:
+                    statuses["error"] += 1
+
+        self.stdout.write(
+            f"Furtuna pe evenimentul #{event.id}: {len(tokens)} useri, "
+            f"{options['concurrency']} fire, {options['duration']}s..."
+        )
+        probe.start()
+        concurrency = min(options["concurrency"], len(tokens))
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i in range(concurrency):
+                pool.submit(buyer, tokens[i::concurrency])
+            time.sleep(options["duration"])
+            stop.set()
+        probe.join()
+
+        for label, values in (("fara incarcare", baseline), ("in timpul furtunii", storm_latencies)):
+            if not values:
+                continue
+            self.stdout.write(
+                f"GET /api/events/ {label:<20} n={len(values):<5} "
+                f"p50={statistics.median(values):7.1f}ms "
+                f"p95={_percentile(values, 95):7.1f}ms "
+                f"max={max(values):7.1f}ms"
+            )
+        self.stdout.write("POST tickets/buy: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items(), key=str)))
@@ -58,4 +58,25 @@ class Notification(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Notificare pt {self.user.email}: {self.title}"
\ No newline at end of file
+        return f"Notificare pt {self.user.email}: {self.title}"
+
+class Recommendation(models.Model):
+    """
+    Top-K evenimente recomandate per user.
+    Tabela e reconstruita periodic de comanda `build_recommendations`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recommendations')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'event')
+        ordering = ['rank']
+        indexes = [
+            models.Index(fields=['user', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.user.email} -> {self.event.title}"
@@ -0,0 +1,234 @@
+"""
+recommendations.py (interactions app)
+
+Recomandari "pentru tine" pe baza de item-item collaborative filtering.
+
+- matricea user x eveniment e construita din semnale implicite:
+  bilete (+ check-in), favorite si review-uri
+- similaritatea intre evenimente e cosinus pe coloanele matricei, pastrata doar
+  intre evenimente din aceeasi facultate sau aceeasi categorie
+- scorul unui eveniment pentru un user = suma similaritatilor fata de
+  evenimentele cu care a interactionat deja
+- se pastreaza top-K evenimente viitoare, publicate, inca neatinse de user
+
+Rulat periodic prin `python manage.py build_recommendations` (cron).
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import Event
+from .models import Favorite, Recommendation, Review, Ticket
+
+TICKET_WEIGHT = 3.0
+CHECKIN_BONUS = 1.0
+FAVORITE_WEIGHT = 2.0
+REVIEW_WEIGHT_PER_STAR = 0.4  # 1★ -> 0.4, 5★ -> 2.0
+
+DEFAULT_TOP_K = 20
+USER_CHUNK_SIZE = 2048
+WRITE_BATCH_SIZE = 5000
+
+
+def _one_hot(codes, n_rows):
+    """Matrice sparse n_rows x n_coduri; codurile < 0 (FK null) nu primesc intrare."""
+    rows = np.flatnonzero(codes >= 0)
+    if rows.size == 0:
+        return sparse.csr_matrix((n_rows, 1), dtype=np.float32)
+    _, cols = np.unique(codes[rows], return_inverse=True)
+    data = np.ones(rows.size, dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, int(cols.max()) + 1))
+
+
+def item_similarity(matrix, event_faculty, event_category):
+    """
+    Similaritate cosinus intre coloanele (evenimentele) matricei de interactiuni,
+    restransa la perechi din aceeasi facultate sau categorie.
+    """
+    matrix = matrix.tocsc().astype(np.float32)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    normalized = matrix @ sparse.diags(1.0 / norms).astype(np.float32)
+
+    similarity = (normalized.T @ normalized).tocsr()
+
+    n_events = matrix.shape[1]
+    faculty = _one_hot(event_faculty, n_events)
+    category = _one_hot(event_category, n_events)
+    same_group = (faculty @ faculty.T + category @ category.T).astype(bool)
+
+    similarity = similarity.multiply(same_group).tocsr()
+    similarity = similarity - sparse.diags(similarity.diagonal()).tocsr()
+    similarity.eliminate_zeros()
+    return similarity
+
+
+def top_k_per_user(matrix, similarity, candidates, k=DEFAULT_TOP_K, chunk_size=USER_CHUNK_SIZE):
+    """
+    Genereaza (rand_user, coloane_evenimente, scoruri) pentru fiecare user,
+    procesand userii pe bucati ca memoria sa ramana marginita.
+    """
+    matrix = matrix.tocsr()
+    excluded = ~candidates
+
+    for start in range(0, matrix.shape[0], chunk_size):
+        chunk = matrix[start:start + chunk_size]
+        scores = (chunk @ similarity).toarray()
+
+        scores[:, excluded] = 0
+        seen_rows, seen_cols = chunk.nonzero()
+        scores[seen_rows, seen_cols] = 0
+
+        kk = min(k, scores.shape[1])
+        if kk == 0:
+            return
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for i in range(top.shape[0]):
+            keep = top_scores[i] > 0
+            if keep.any():
+                yield start + i, top[i][keep], top_scores[i][keep]
+
+
+def _load_interactions():
+    """Citeste semnalele din DB ca trei vectori paraleli (user_id, event_id, weight)."""
+    users, events, weights = [], [], []
+
+    for user_id, event_id, checked_in in Ticket.objects.values_list(
+        "user_id", "event_id", "is_checked_in"
+    ).iterator(chunk_size=WRITE_BATCH_SIZE):
+        users.append(user_id)
+        events.append(event_id)
+        weights.append(TICKET_WEIGHT + (CHECKIN_BONUS if checked_in else 0.0))
+
+    for user_id, event_id in Favorite.objects.values_list(
+        "user_id", "event_id"
+    ).iterator(chunk_size=WRITE_BATCH_SIZE):
+        users.append(user_id)
+        events.append(event_id)
+        weights.append(FAVORITE_WEIGHT)
+
+    for user_id, event_id, rating in Review.objects.values_list(
+        "user_id", "event_id", "rating"
+    ).iterator(chunk_size=WRITE_BATCH_SIZE):
+        users.append(user_id)
+        events.append(event_id)
+        weights.append(rating * REVIEW_WEIGHT_PER_STAR)
+
+    return (
+        np.asarray(users, dtype=np.int64),
+        np.asarray(events, dtype=np.int64),
+        np.asarray(weights, dtype=np.float32),
+    )
+
+
+def build_recommendations(k=DEFAULT_TOP_K):
+    """
+    Reconstruieste tabela Recommendation din interactiunile curente.
+    Returneaza numarul de randuri scrise.
+    """
+    event_rows = list(
+        Event.objects.order_by("id").values_list("id", "faculty_id", "category_id", "status", "start_date")
+    )
+    if not event_rows:
+        return 0
+
+    now = timezone.now()
+    event_ids = np.asarray([row[0] for row in event_rows], dtype=np.int64)
+    event_faculty = np.asarray([row[1] if row[1] is not None else -1 for row in event_rows], dtype=np.int64)
+    event_category = np.asarray([row[2] if row[2] is not None else -1 for row in event_rows], dtype=np.int64)
+    candidates = np.asarray(
+        [row[3] == "published" and row[4] > now for row in event_rows], dtype=bool
+    )
+
+    user_ids, interaction_events, weights = _load_interactions()
+
+    # indexii in matrice: userii compactati, evenimentele dupa pozitia in event_ids
+    unique_users, user_rows = np.unique(user_ids, return_inverse=True)
+    event_cols = np.searchsorted(event_ids, interaction_events)
+
+    # coo -> csr aduna automat duplicatele (ex. bilet + favorit la acelasi eveniment)
+    matrix = sparse.coo_matrix(
+        (weights, (user_rows, event_cols)),
+        shape=(unique_users.size, event_ids.size),
+    ).tocsr()
+
+    similarity = item_similarity(matrix, event_faculty, event_category)
+
+    written = 0
+    with transaction.atomic():
+        Recommendation.objects.all().delete()
+
+        batch = []
+        for row, cols, scores in top_k_per_user(matrix, similarity, candidates, k=k):
+            user_id = int(unique_users[row])
+            for rank, (col, score) in enumerate(zip(cols, scores), start=1):
+                batch.append(
+                    Recommendation(user_id=user_id, event_id=int(event_ids[col]), score=float(score), rank=rank)
+                )
+            if len(batch) >= WRITE_BATCH_SIZE:
+                Recommendation.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+
+        if batch:
+            Recommendation.objects.bulk_create(batch)
+            written += len(batch)
+
+    return written
+
+
+def benchmark(n_users=50_000, n_events=5_000, per_user=20, n_faculties=20, n_categories=10,
+              k=DEFAULT_TOP_K, seed=0):
+    """
+    Ruleaza pipeline-ul offline pe o matrice sintetica (fara DB) si masoara
+    timpul fiecarei etape si varful de memorie alocata.
+    """
+    rng = np.random.default_rng(seed)
+
+    tracemalloc.start()
+    timings = {}
+
+    t0 = time.perf_counter()
+    nnz = n_users * per_user
+    # popularitate Zipf-like, ca in realitate cateva evenimente atrag majoritatea
+    popularity = 1.0 / np.arange(1, n_events + 1)
+    popularity /= popularity.sum()
+    rows = np.repeat(np.arange(n_users), per_user)
+    cols = rng.choice(n_events, size=nnz, p=popularity)
+    weights = rng.choice([TICKET_WEIGHT, FAVORITE_WEIGHT, TICKET_WEIGHT + CHECKIN_BONUS], size=nnz).astype(np.float32)
+    matrix = sparse.coo_matrix((weights, (rows, cols)), shape=(n_users, n_events)).tocsr()
+    event_faculty = rng.integers(-1, n_faculties, size=n_events)
+    event_category = rng.integers(-1, n_categories, size=n_events)
+    candidates = rng.random(n_events) < 0.2
+    timings["matrix"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    similarity = item_similarity(matrix, event_faculty, event_category)
+    timings["similarity"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    recommended = sum(top.size for _, top, _ in top_k_per_user(matrix, similarity, candidates, k=k))
+    timings["top_k"] = time.perf_counter() - t0
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "users": n_users,
+        "events": n_events,
+        "interactions": int(matrix.nnz),
+        "similarity_nnz": int(similarity.nnz),
+        "recommendations": int(recommended),
+        "timings": timings,
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
@@ -2,7 +2,8 @@
 serializers.py (interactions app)
 
 - TicketSerializer: afișare ticket + flag has_review
-- TicketCreateSerializer: creare ticket cu validări (status, start_date, seats, unicitate)
+- TicketCreateSerializer: creare ticket cu validări (status, start_date, seats, unicitate,
+  suprapunere cu alt bilet al userului, confirmabila prin allow_overlap)
 - ReviewSerializer / FavoriteSerializer: event_id write-only, event nested read-only
 - NotificationSerializer: notificări pentru user
 """
@@ -10,14 +11,16 @@ serializers.py (interactions app)
 from django.utils import timezone
 from rest_framework import serializers
 
+from backend.metrics import TimedSerializerMixin
 from events.models import Event
-from events.serializers import EventSerializer
+from events.schedule import Overlaps
+from events.serializers import EVENT_RELATED, EventSerializer
 from users.serializers import UserSerializer
 from .models import Favorite, Notification, Review, Ticket
 
 
 # Ticket (read)
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Ticket pentru afișare"""
     user = UserSerializer(read_only=True)
     event = EventSerializer(read_only=True)
@@ -30,7 +33,12 @@ class TicketSerializer(serializers.ModelSerializer):
         if not user or not user.is_authenticated:
             return False
 
-        return Review.objects.filter(user=user, event=obj.event).exists()
+        # adnotat in queryset (Exists) cand e disponibil, ca sa evitam un query per bilet
+        annotated = getattr(obj, "has_review", None)
+        if annotated is not None:
+            return annotated
+
+        return Review.objects.filter(user_id=user.id, event_id=obj.event_id).exists()
 
     class Meta:
         model = Ticket
@@ -63,10 +71,12 @@ class TicketCreateSerializer(serializers.ModelSerializer):
         source="event",
         write_only=True,
     )
+    # studentul a vazut avertismentul de suprapunere si cumpara oricum
+    allow_overlap = serializers.BooleanField(write_only=True, required=False, default=False)
 
     class Meta:
         model = Ticket
-        fields = ["id", "event_id", "qr_code_data", "is_checked_in", "purchased_at"]
+        fields = ["id", "event_id", "allow_overlap", "qr_code_data", "is_checked_in", "purchased_at"]
         read_only_fields = ["id", "qr_code_data", "is_checked_in", "purchased_at"]
 
     def validate(self, attrs):
@@ -96,11 +106,25 @@ class TicketCreateSerializer(serializers.ModelSerializer):
             if sold >= event.max_participants:
                 raise serializers.ValidationError({"event_id": "Nu mai sunt locuri disponibile."})
 
+        # 5) suprapunere cu un eveniment pentru care userul are deja bilet
+        if not attrs.pop("allow_overlap", False):
+            overlapping = (
+                Ticket.objects.filter(user=user)
+                .filter(Overlaps("event__start_date", "event__end_date", event.start_date, event.end_date))
+                .values_list("event__title", flat=True)
+                .first()
+            )
+            if overlapping is not None:
+                # cheie separata: frontend-ul cere confirmare si retrimite cu allow_overlap
+                raise serializers.ValidationError(
+                    {"schedule_conflict": f"Ai deja bilet la „{overlapping}” în același interval."}
+                )
+
         return attrs
 
 
 # Review
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Review:
     - user read-only
@@ -110,7 +134,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     event = EventSerializer(read_only=True)
 
     event_id = serializers.PrimaryKeyRelatedField(
-        queryset=Event.objects.all(),
+        queryset=Event.objects.select_related(*EVENT_RELATED),
         source="event",
         write_only=True,
     )
@@ -122,17 +146,17 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 
 # Favorite
-class FavoriteSerializer(serializers.ModelSerializer):
+class FavoriteSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Favorite:
     - user read-only
-    - event_id write-only
+    - event_id write-only, doar evenimente publicate
     """
     user = UserSerializer(read_only=True)
     event = EventSerializer(read_only=True)
 
     event_id = serializers.PrimaryKeyRelatedField(
-        queryset=Event.objects.all(),
+        queryset=Event.objects.filter(status="published").select_related(*EVENT_RELATED),
         source="event",
         write_only=True,
     )
@@ -144,7 +168,7 @@ class FavoriteSerializer(serializers.ModelSerializer):
 
 
 # Notification
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Notification"""
     user = UserSerializer(read_only=True)
 
@@ -0,0 +1,17 @@
+"""
+tasks.py (interactions app)
+
+Task-uri rulate de worker-ul din jobs (vezi jobs/queue.py).
+"""
+
+from jobs.queue import task
+from .models import Notification
+
+
+@task
+def send_notifications(user_ids, title, message):
+    """Aceeasi notificare pentru mai multi useri, intr-un singur INSERT."""
+    Notification.objects.bulk_create(
+        [Notification(user_id=user_id, title=title, message=message) for user_id in user_ids],
+        batch_size=1000,
+    )
@@ -1,3 +1,431 @@
-from django.test import TestCase
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import path, reverse
+from django.utils.http import http_date
+from django.utils import timezone
+from scipy import sparse
+
+from backend.testing import budgets, factories
+from users.serializers import MyTokenObtainPairSerializer
+from . import async_views, views
+from backend.throttling import THROTTLE_CACHE, purchase_limiter
+from events import trending
+from events.models import Event
+from .models import Favorite, Notification, Recommendation, Review, Ticket
+from .recommendations import build_recommendations, item_similarity, top_k_per_user
+
+# AsyncTicketListTests: portofelul de bilete prin view-ul DRF si prin varianta async
+urlpatterns = [
+    path("sync/tickets/", views.TicketListView.as_view()),
+    path("async/tickets/", async_views.TicketListAsyncView.as_view()),
+]
+
+
+class InteractionQueryBudgetTests(budgets.QueryBudgetTestCase):
+    """Bugetele de query-uri pentru rutele din interactions/urls.py (vezi backend/query_budgets.py)."""
+
+    route_prefix = "api/interactions/"
+
+    def test_ticket_list(self):
+        def seed(n):
+            user = self.make_user()
+            tickets = self.make_tickets((user, event) for event in self.make_events(n))
+            Review.objects.create(user=user, event=tickets[0].event, rating=4, comment="Bun")
+            return {"user": user}
+
+        self.assertQueryBudget("GET", "api/interactions/tickets/", seed)
+
+    def test_ticket_buy(self):
+        def seed(n):
+            event = self.make_events(1)[0]
+            self.make_tickets((user, event) for user in self.make_users(n))
+            # biletele existente ale cumparatorului nu se suprapun cu evenimentul
+            buyer = self.make_user()
+            later = self.make_events(n, start_date=timezone.now() + timedelta(days=30))
+            self.make_tickets((buyer, other) for other in later)
+            return {"user": buyer, "data": {"event_id": event.pk}}
+
+        self.assertQueryBudget("POST", "api/interactions/tickets/buy/", seed, status=201)
+
+    def test_ticket_delete(self):
+        def seed(n):
+            user = self.make_user()
+            event = self.make_events(1)[0]
+            self.make_tickets((other, event) for other in self.make_users(n))
+            ticket = Ticket.objects.create(user=user, event=event, qr_code_data=str(uuid.uuid4()))
+            return {"user": user, "kwargs": {"pk": ticket.pk}}
+
+        self.assertQueryBudget("DELETE", "api/interactions/tickets/<int:pk>/", seed, status=204)
+
+    def test_favorite_list(self):
+        def seed(n):
+            user = self.make_user()
+            Favorite.objects.bulk_create([Favorite(user=user, event=event) for event in self.make_events(n)])
+            return {"user": user}
+
+        self.assertQueryBudget("GET", "api/interactions/favorites/", seed)
+
+    def test_favorite_create(self):
+        def seed(n):
+            user = self.make_user()
+            events = self.make_events(n + 1)
+            Favorite.objects.bulk_create([Favorite(user=user, event=event) for event in events[1:]])
+            return {"user": user, "data": {"event_id": events[0].pk}}
+
+        self.assertQueryBudget("POST", "api/interactions/favorites/", seed, status=201)
+
+    def test_favorite_delete(self):
+        def seed(n):
+            user = self.make_user()
+            favorites = Favorite.objects.bulk_create(
+                [Favorite(user=user, event=event) for event in self.make_events(n)]
+            )
+            return {"user": user, "kwargs": {"pk": favorites[0].pk}}
+
+        self.assertQueryBudget("DELETE", "api/interactions/favorites/<int:pk>/", seed, status=204)
+
+    def _favorite_by_event(self, n):
+        user = self.make_user()
+        events = self.make_events(n + 1)
+        Favorite.objects.bulk_create([Favorite(user=other, event=events[0]) for other in self.make_users(n)])
+        Favorite.objects.bulk_create([Favorite(user=user, event=event) for event in events[1:]])
+        return {"user": user, "kwargs": {"event_id": events[0].pk}}
+
+    def test_favorite_by_event_put(self):
+        self.assertQueryBudget("PUT", "api/interactions/favorites/event/<int:event_id>/", self._favorite_by_event)
+
+    def test_favorite_by_event_delete(self):
+        def seed(n):
+            seeded = self._favorite_by_event(n)
+            Favorite.objects.create(user=seeded["user"], event_id=seeded["kwargs"]["event_id"])
+            return seeded
+
+        self.assertQueryBudget("DELETE", "api/interactions/favorites/event/<int:event_id>/", seed)
+
+    def test_review_create(self):
+        def seed(n):
+            event = self.make_events(1)[0]
+            Review.objects.bulk_create(
+                [Review(user=user, event=event, rating=5, comment="Bun") for user in self.make_users(n)]
+            )
+            return {"user": self.make_user(), "data": {"event_id": event.pk, "rating": 4, "comment": "Frumos"}}
+
+        self.assertQueryBudget("POST", "api/interactions/reviews/", seed, status=201)
+
+    def test_notification_list(self):
+        def seed(n):
+            user = self.make_user()
+            Notification.objects.bulk_create(
+                [Notification(user=user, title="Titlu", message="Mesaj") for _ in range(n)]
+            )
+            return {"user": user}
+
+        self.assertQueryBudget("GET", "api/interactions/notifications/", seed)
+
+    def test_calendar_token(self):
+        def seed(n):
+            user = self.make_user(calendar_token=f"token-{n}")
+            return {"user": user}
+
+        self.assertQueryBudget("GET", "api/interactions/calendar/", seed)
+        self.assertQueryBudget("POST", "api/interactions/calendar/", seed)
+
+    def test_calendar_feed(self):
+        def seed(n):
+            user = self.make_user(calendar_token=f"token-{n}")
+            events = self.make_events(2 * n)
+            self.make_tickets((user, event) for event in events[:n])
+            Favorite.objects.bulk_create([Favorite(user=user, event=event) for event in events[n:]])
+            return {"kwargs": {"token": user.calendar_token}}
+
+        self.assertQueryBudget("GET", "api/interactions/calendar/<str:token>.ics", seed)
+
+
+class TicketPurchaseLimitTests(factories.ApiTestCase):
+    def setUp(self):
+        caches[THROTTLE_CACHE].clear()
+        self.client.force_authenticate(self.make_user())
+        self.event, = self.make_events(1)
+
+    def buy(self, data):
+        return self.client.post("/api/interactions/tickets/buy/", data, format="json")
+
+    def test_invalid_body_is_rejected_before_the_limiter(self):
+        for data in ([{"event_id": self.event.pk}], {}, {"event_id": "abc"}, {"event_id": None}):
+            response = self.buy(data)
+            self.assertEqual(response.status_code, 400, data)
+            self.assertIn("event_id", response.data)
+        self.assertIsNone(caches[THROTTLE_CACHE].get("purchase_slots_None"))
+
+    def test_full_event_fails_fast_with_retry_after(self):
+        with patch.object(purchase_limiter, "limit", 0):
+            response = self.buy({"event_id": self.event.pk})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(self.buy({"event_id": self.event.pk}).status_code, 201)
+        self.assertEqual(caches[THROTTLE_CACHE].get(f"purchase_slots_{self.event.pk}"), 0)
+
+
+class TicketAdminTests(factories.ApiTestCase):
+    """Filtrul dupa eveniment din sidebar nu mai incarca toate evenimentele."""
+
+    def test_event_filter_uses_autocomplete(self):
+        self.client.force_login(self.make_user(is_staff=True, is_superuser=True))
+        events = self.make_events(30)
+        self.make_tickets([(user, events[0]) for user in self.make_users(5)])
+        self.make_tickets([(user, events[1]) for user in self.make_users(3)])
+        url = reverse("admin:interactions_ticket_changelist")
+
+        response = self.client.get(url, {"event__id__exact": events[1].pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertContains(response, 'name="event__id__exact"')
+        self.assertContains(response, "admin-autocomplete")
+        self.assertContains(response, "select2")
+        # nicio legatura per eveniment in sidebar, ca la RelatedFieldListFilter
+        self.assertNotContains(response, f"event__id__exact={events[2].pk}")
+
+
+class TicketScheduleConflictTests(factories.ApiTestCase):
+    """Biletul la un eveniment care se suprapune cu altul deja cumparat cere confirmare."""
+
+    def setUp(self):
+        self.user = self.make_user()
+        start = timezone.now() + timedelta(days=5)
+        self.held = self.make_events(1, title="Hackathon", start_date=start, end_date=start + timedelta(hours=4))[0]
+        self.make_tickets([(self.user, self.held)])
+        self.client.force_authenticate(self.user)
+        self.start = start
+
+    def buy(self, event, **extra):
+        return self.client.post("/api/interactions/tickets/buy/", {"event_id": event.pk, **extra}, format="json")
+
+    def test_overlapping_event_needs_confirmation(self):
+        clash = self.make_events(1, start_date=self.start + timedelta(hours=3))[0]
+
+        response = self.buy(clash)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Hackathon", response.data["schedule_conflict"][0])
+
+        self.assertEqual(self.buy(clash, allow_overlap=True).status_code, 201)
+        self.assertTrue(Ticket.objects.filter(user=self.user, event=clash).exists())
+
+    def test_back_to_back_events_do_not_conflict(self):
+        # intervalele sunt [start, end): un eveniment care incepe fix la final nu se suprapune
+        after = self.make_events(1, start_date=self.start + timedelta(hours=4))[0]
+        self.assertEqual(self.buy(after).status_code, 201)
+
+
+
+class FavoriteTests(factories.ApiTestCase):
+    def setUp(self):
+        self.user = self.make_user()
+        self.client.force_authenticate(self.user)
+        self.event, = self.make_events(1)
+
+    def url(self, event):
+        return f"/api/interactions/favorites/event/{event.pk}/"
+
+    def test_put_is_idempotent_and_counts_activity_once(self):
+        for _ in range(2):
+            response = self.client.put(self.url(self.event))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data["is_favorite"])
+            score = Event.objects.get(pk=self.event.pk).trending_score
+
+        favorite = Favorite.objects.get(user=self.user, event=self.event)
+        self.assertGreater(score, 0)
+        # scorul e exact contributia unui singur favorit, la momentul salvat
+        self.assertAlmostEqual(
+            score, trending._log_contribution(trending.WEIGHTS["favorite"], favorite.added_at), places=6
+        )
+
+    def test_put_rejects_unpublished_or_missing_events(self):
+        draft, = self.make_events(1, status="draft")
+        self.assertEqual(self.client.put(self.url(draft)).status_code, 404)
+        self.assertEqual(self.client.put("/api/interactions/favorites/event/999999/").status_code, 404)
+        self.assertFalse(Favorite.objects.exists())
+        self.assertEqual(Event.objects.get(pk=draft.pk).trending_score, 0)
+
+    def test_concurrent_deletes_lower_score_once(self):
+        favorite = Favorite.objects.create(user=self.user, event=self.event)
+        ticket, = self.make_tickets([(self.user, self.event)])
+        for view, obj, url in (
+            (views.FavoriteDeleteView, favorite, f"/api/interactions/favorites/{favorite.pk}/"),
+            (views.TicketDeleteView, ticket, f"/api/interactions/tickets/{ticket.pk}/"),
+        ):
+            with self.subTest(view=view.__name__):
+                # celalalt DELETE a sters randul intre get_object si perform_destroy
+                stale = type(obj).objects.get(pk=obj.pk)
+                obj.delete()
+                with patch.object(view, "get_object", return_value=stale), \
+                        patch.object(views, "remove_activity") as remove_activity:
+                    self.assertEqual(self.client.delete(url).status_code, 204)
+                remove_activity.assert_not_called()
+
+    def test_create_rejects_unpublished_events(self):
+        pending, = self.make_events(1, status="pending")
+        response = self.client.post("/api/interactions/favorites/", {"event_id": pending.pk}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("event_id", response.data)
+
+
+class CalendarFeedTests(factories.ApiTestCase):
+    """Feed-ul iCalendar personal: continut, GET conditional si rotirea token-ului."""
+
+    def setUp(self):
+        self.user = self.make_user()
+        self.ticket_event, self.favorite_event, self.draft = self.make_events(3)
+        Event.objects.filter(pk=self.ticket_event.pk).update(title="Hackathon; ediția 2")
+        Event.objects.filter(pk=self.draft.pk).update(status="draft")
+        self.make_tickets([(self.user, self.ticket_event)])
+        Favorite.objects.bulk_create(
+            [Favorite(user=self.user, event=event) for event in (self.favorite_event, self.draft)]
+        )
+        self.client.force_authenticate(self.user)
+        self.url = self.client.get("/api/interactions/calendar/").data["url"]
+
+    def fetch(self, url=None, **headers):
+        return self.client.get(url or self.url, **headers)
+
+    def test_feed_lists_tickets_and_published_favorites(self):
+        self.client.force_authenticate(None)
+        response = self.fetch()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = b"".join(response.streaming_content).decode()
+
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn("SUMMARY:Hackathon\\; ediția 2", body)
+        self.assertIn(f"UID:event-{self.ticket_event.pk}@", body)
+        self.assertIn(f"UID:event-{self.favorite_event.pk}@", body)
+        self.assertNotIn(f"UID:event-{self.draft.pk}@", body)
+        self.assertEqual(body.count("STATUS:CONFIRMED"), 1)
+        self.assertEqual(body.count("STATUS:TENTATIVE"), 1)
+
+    def test_repeat_poll_is_not_modified(self):
+        etag = self.fetch()["ETag"]
+        with self.assertNumQueries(1):
+            response = self.fetch(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # un eveniment editat schimba versiunea feed-ului
+        Event.objects.filter(pk=self.favorite_event.pk).update(updated_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(self.fetch(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_ticket_for_favorite_changes_version(self):
+        response = self.fetch()
+        self.assertIn("STATUS:TENTATIVE", b"".join(response.streaming_content).decode())
+        # evenimentele feed-ului raman aceleasi, doar biletul e nou
+        self.make_tickets([(self.user, self.favorite_event)])
+        response = self.fetch(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("STATUS:TENTATIVE", b"".join(response.streaming_content).decode())
+
+    def test_new_favorite_is_not_hidden_by_if_modified_since(self):
+        response = self.fetch()
+        self.assertNotIn("Last-Modified", response)
+        # evenimentul nou favorit e mai vechi decat restul feed-ului
+        older, = self.make_events(1)
+        Event.objects.filter(pk=older.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        Favorite.objects.create(user=self.user, event=older)
+        response = self.fetch(HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"UID:event-{older.pk}@", b"".join(response.streaming_content).decode())
+
+        etag = self.fetch()["ETag"]
+        Favorite.objects.filter(user=self.user, event=older).delete()
+        self.assertEqual(self.fetch(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_rotated_token_invalidates_old_url(self):
+        self.assertEqual(self.fetch().status_code, 200)
+        new_url = self.client.post("/api/interactions/calendar/").data["url"]
+        self.assertNotEqual(new_url, self.url)
+        self.assertEqual(self.fetch().status_code, 404)
+        self.assertEqual(self.fetch(new_url).status_code, 200)
+
+
+class RecommendationTests(factories.ApiTestCase):
+    """Item-item CF: similaritatea, excluderile si taierea la top-K."""
+
+    def test_item_similarity_is_restricted_to_same_faculty_or_category(self):
+        # evenimentele 0 si 1 sunt luate de aceiasi useri; 2 e din alta facultate si categorie
+        matrix = sparse.csr_matrix(np.array([[1, 1, 1], [1, 1, 1], [1, 0, 0]], dtype=np.float32))
+        similarity = item_similarity(matrix, np.array([1, 1, 2]), np.array([5, 5, -1])).toarray()
+
+        self.assertGreater(similarity[0, 1], 0.8)
+        self.assertAlmostEqual(similarity[0, 1], similarity[1, 0], places=5)
+        self.assertEqual(similarity[0, 2], 0)
+        self.assertEqual(list(similarity.diagonal()), [0, 0, 0])
+
+    def test_top_k_skips_seen_and_non_candidate_events(self):
+        matrix = sparse.csr_matrix(np.array([[1, 0, 0, 0]], dtype=np.float32))
+        similarity = sparse.csr_matrix(
+            np.array(
+                [[0, 0.9, 0.5, 0.7], [0.9, 0, 0, 0], [0.5, 0, 0, 0], [0.7, 0, 0, 0]], dtype=np.float32
+            )
+        )
+        candidates = np.array([True, True, True, False])
+
+        [(row, cols, scores)] = list(top_k_per_user(matrix, similarity, candidates, k=5))
+        self.assertEqual(row, 0)
+        # 0 e deja al userului, 3 nu e candidat (trecut / nepublicat)
+        self.assertEqual(list(cols), [1, 2])
+        self.assertTrue(scores[0] > scores[1])
+
+        [(_, cols, _)] = list(top_k_per_user(matrix, similarity, candidates, k=1))
+        self.assertEqual(list(cols), [1])
+
+    def test_build_recommendations(self):
+        held_past, held_favorite, popular, niche, draft = self.make_events(5)
+        Event.objects.filter(pk=held_past.pk).update(start_date=timezone.now() - timedelta(days=3))
+        Event.objects.filter(pk=draft.pk).update(status="draft")
+
+        user, other = self.make_users(2)
+        self.make_tickets([(user, held_past), (other, popular)])
+        Favorite.objects.create(user=user, event=held_favorite)
+        # cine a fost la held_past a mai luat: popular (3 useri), niche (1 user), draft (3 useri)
+        crowd = self.make_users(3)
+        self.make_tickets([(member, held_past) for member in crowd])
+        self.make_tickets([(member, popular) for member in crowd])
+        self.make_tickets([(crowd[0], niche)])
+        self.make_tickets([(member, draft) for member in crowd])
+
+        build_recommendations()
+        ranked = list(Recommendation.objects.filter(user=user).values_list("event_id", flat=True))
+        self.assertEqual(ranked, [popular.pk, niche.pk])
+        # evenimentul trecut e similar cu ce are `other`, dar nu mai poate fi recomandat
+        self.assertNotIn(
+            held_past.pk, Recommendation.objects.filter(user=other).values_list("event_id", flat=True)
+        )
+
+        build_recommendations(k=1)
+        ranked = list(Recommendation.objects.filter(user=user).values_list("event_id", flat=True))
+        self.assertEqual(ranked, [popular.pk])
+
+
+@override_settings(ROOT_URLCONF="interactions.tests")
+class AsyncTicketListTests(factories.ApiTestCase):
+    def test_matches_the_drf_view(self):
+        user = self.make_user()
+        events = self.make_events(2)
+        self.make_tickets((buyer, event) for buyer in (user, self.make_user()) for event in events)
+        Review.objects.create(user=user, event=events[0], rating=5, comment="Bun")
+
+        self.assertEqual(async_to_sync(self.async_client.get)("/async/tickets/").status_code, 401)
+
+        token = f"Bearer {MyTokenObtainPairSerializer.get_token(user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=token)
+        expected = self.client.get("/sync/tickets/").json()
+        response = async_to_sync(self.async_client.get)("/async/tickets/", headers={"Authorization": token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual([ticket["event"]["tickets_count"] for ticket in expected], [2, 2])
@@ -1,25 +1,39 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     TicketCreateView, TicketListView,
-    FavoriteListCreateView, FavoriteDeleteView,
+    FavoriteListCreateView, FavoriteDeleteView, FavoriteByEventView,
     ReviewCreateView,
     NotificationListView,
-    TicketDeleteView
+    TicketDeleteView,
+    CalendarTokenView,
+    CalendarFeedView,
 )
+from .async_views import TicketListAsyncView, NotificationListAsyncView
+
+# Pe ASGI citirile merg prin view-urile async (vezi backend/async_views.py)
+async_reads = settings.ASYNC_READ_VIEWS
+ticket_list_view = TicketListAsyncView if async_reads else TicketListView
+notification_list_view = NotificationListAsyncView if async_reads else NotificationListView
 
 urlpatterns = [
     # tickets
-    path("tickets/", TicketListView.as_view()),
+    path("tickets/", ticket_list_view.as_view()),
     path("tickets/buy/", TicketCreateView.as_view()),
     path("tickets/<int:pk>/", TicketDeleteView.as_view()),
 
     # favorites
     path("favorites/", FavoriteListCreateView.as_view()),
     path("favorites/<int:pk>/", FavoriteDeleteView.as_view()),
+    path("favorites/event/<int:event_id>/", FavoriteByEventView.as_view()),
 
     # reviews
     path("reviews/", ReviewCreateView.as_view()),
 
     # notifications
-    path("notifications/", NotificationListView.as_view()),
+    path("notifications/", notification_list_view.as_view()),
+
+    # feed iCalendar personal (vezi events/calendar.py)
+    path("calendar/", CalendarTokenView.as_view()),
+    path("calendar/<str:token>.ics", CalendarFeedView.as_view(), name="calendar-feed"),
 ]
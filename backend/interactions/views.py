@@ -1,6 +1,13 @@
+from django.db import IntegrityError, connections, router
+from django.db.models import Exists, OuterRef, Q
+from django.http import Http404
+from django.urls import reverse
 from django.utils import timezone
-from rest_framework.exceptions import ValidationError
+from django.views import View
+from rest_framework.exceptions import ValidationError, NotFound
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Ticket, Favorite, Review, Notification
 from .serializers import (
     TicketSerializer,
@@ -9,24 +16,66 @@ from .serializers import (
     ReviewSerializer,
     NotificationSerializer
 )
+from events.calendar import (
+    calendar_user_id,
+    feed_events,
+    feed_version,
+    get_calendar_token,
+    ics_response,
+    not_modified,
+    rotate_calendar_token,
+)
 from events.models import Event
+from events.serializers import EVENT_RELATED
+from events.views import attach_tickets_count
+from events.trending import record_activity, remove_activity
+from backend.throttling import TokenBucketThrottle, purchase_limiter
+from users.authentication import ClaimsJWTAuthentication
 import uuid
 
 # Ticket Views
 class TicketCreateView(generics.CreateAPIView):
     serializer_class = TicketCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "ticket_buy"
+
+    def create(self, request, *args, **kwargs):
+        # id-ul se verifica inainte de semafor: altfel corpurile invalide ar imparti acelasi slot
+        event_id = request.data.get("event_id") if isinstance(request.data, dict) else None
+        try:
+            event_id = int(event_id)
+        except (TypeError, ValueError):
+            raise ValidationError({"event_id": "Trimite id-ul evenimentului."})
+
+        # la deschiderea unui eveniment popular, cumpararile pentru el nu ocupa toti workerii
+        with purchase_limiter.slot(event_id):
+            return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         qr = uuid.uuid4()
-        serializer.save(user=self.request.user, qr_code_data=str(qr))
+        ticket = serializer.save(user=self.request.user, qr_code_data=str(qr))
+        record_activity(ticket.event_id, "ticket")
 
 class TicketListView(generics.ListAPIView):
     serializer_class = TicketSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Ticket.objects.filter(user=self.request.user)
+        user_id = self.request.user.id
+        return (
+            Ticket.objects.filter(user_id=user_id)
+            .select_related("user", *(f"event__{name}" for name in EVENT_RELATED))
+            .annotate(
+                has_review=Exists(Review.objects.filter(user_id=user_id, event_id=OuterRef("event_id")))
+            )
+        )
+
+    def list(self, request, *args, **kwargs):
+        tickets = list(self.get_queryset())
+        attach_tickets_count(ticket.event for ticket in tickets)
+        return Response(self.get_serializer(tickets, many=True).data)
     
 class TicketDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -37,18 +86,32 @@ class TicketDeleteView(generics.DestroyAPIView):
     def perform_destroy(self, instance):
         if instance.event.start_date and instance.event.start_date <= timezone.now():
             raise ValidationError({"detail": "Nu poți anula biletul după ce evenimentul a început."})
-        instance.delete()
+        # doar cine a sters efectiv randul scade scorul (DELETE-uri concurente)
+        if Ticket.objects.filter(pk=instance.pk).delete()[0]:
+            remove_activity(instance.event_id, "ticket", instance.purchased_at)
 
 # Favorite Views
 class FavoriteListCreateView(generics.ListCreateAPIView):
     serializer_class = FavoriteSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Favorite.objects.filter(user=self.request.user)
+        return Favorite.objects.filter(user_id=self.request.user.id).select_related(
+            "user", *(f"event__{name}" for name in EVENT_RELATED)
+        )
+
+    def list(self, request, *args, **kwargs):
+        favorites = list(self.get_queryset())
+        attach_tickets_count(favorite.event for favorite in favorites)
+        return Response(self.get_serializer(favorites, many=True).data)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        try:
+            favorite = serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({"event_id": "Evenimentul este deja la favorite."})
+        record_activity(favorite.event_id, "favorite", favorite.added_at)
 
 class FavoriteDeleteView(generics.DestroyAPIView):
     serializer_class = FavoriteSerializer
@@ -57,18 +120,109 @@ class FavoriteDeleteView(generics.DestroyAPIView):
     def get_queryset(self):
         return Favorite.objects.filter(user=self.request.user)
 
+    def perform_destroy(self, instance):
+        # doar cine a sters efectiv randul scade scorul (DELETE-uri concurente)
+        if Favorite.objects.filter(pk=instance.pk).delete()[0]:
+            remove_activity(instance.event_id, "favorite", instance.added_at)
+
+# Favorite toggle dupa event_id (idempotent)
+class FavoriteByEventView(APIView):
+    """
+    PUT    -> adauga evenimentul la favorite (un singur INSERT ... SELECT ... ON CONFLICT DO NOTHING)
+    DELETE -> scoate evenimentul din favorite (un singur DELETE conditionat)
+    Ambele intorc starea noua, deci apelurile repetate sunt inofensive.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def put(self, request, event_id):
+        added_at = timezone.now()
+        connection = connections[router.db_for_write(Favorite)]
+        # SELECT-ul din events_event insereaza doar pentru evenimente publicate;
+        # RETURNING spune daca randul e nou, deci scorul trending creste o singura data
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {Favorite._meta.db_table} (user_id, event_id, added_at) "
+                f"SELECT %s, id, %s FROM {Event._meta.db_table} WHERE id = %s AND status = %s "
+                "ON CONFLICT (user_id, event_id) DO NOTHING RETURNING id",
+                [
+                    request.user.id,
+                    connection.ops.adapt_datetimefield_value(added_at),
+                    event_id,
+                    "published",
+                ],
+            )
+            created = cursor.fetchone() is not None
+
+        if created:
+            record_activity(event_id, "favorite", added_at)
+        elif not Favorite.objects.filter(user=request.user, event_id=event_id).exists():
+            raise NotFound("Eveniment inexistent.")
+        return Response({"event_id": event_id, "is_favorite": True})
+
+    def delete(self, request, event_id):
+        favorite = Favorite.objects.filter(user=request.user, event_id=event_id)
+        added_at = favorite.values_list("added_at", flat=True).first()
+        # doar cine a sters efectiv randul scade scorul (DELETE-uri concurente)
+        if added_at is not None and favorite.delete()[0]:
+            remove_activity(event_id, "favorite", added_at)
+        return Response({"event_id": event_id, "is_favorite": False})
+
 # Review Views
 class ReviewCreateView(generics.CreateAPIView):
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        review = serializer.save(user=self.request.user)
+        record_activity(review.event_id, "review")
 
 # Notification Views
 class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user_id=self.request.user.id).select_related("user")
+
+# Calendar Views
+class CalendarTokenView(APIView):
+    """
+    GET  -> URL-ul feed-ului iCalendar personal (bilete + favorite), creat la prima cerere
+    POST -> token nou; URL-ul vechi nu mai functioneaza (ex. daca a fost partajat din greseala)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _urls(self, request, token):
+        url = request.build_absolute_uri(reverse("calendar-feed", kwargs={"token": token}))
+        return {"url": url, "webcal": "webcal://" + url.split("://", 1)[1]}
+
+    def get(self, request):
+        return Response(self._urls(request, get_calendar_token(request.user)))
+
+    def post(self, request):
+        return Response(self._urls(request, rotate_calendar_token(request.user)))
+
+class CalendarFeedView(View):
+    """
+    Feed-ul iCalendar personal; aplicatiile de calendar nu trimit JWT, deci accesul e prin
+    token-ul din URL. Biletele apar ca CONFIRMED, favoritele fara bilet ca TENTATIVE.
+    """
+
+    def get(self, request, token):
+        user_id = calendar_user_id(token)
+        if user_id is None:
+            raise Http404
+        tickets = Ticket.objects.filter(user_id=user_id)
+        events = feed_events(
+            Event.objects.filter(
+                Q(pk__in=tickets.values("event_id"))
+                | Q(pk__in=Favorite.objects.filter(user_id=user_id).values("event_id"), status="published")
+            )
+        )
+        version = feed_version(events, user_id)
+        response = not_modified(request, version)
+        if response is not None:
+            return response
+        events = events.annotate(has_ticket=Exists(tickets.filter(event_id=OuterRef("pk"))))
+        return ics_response(request, events, "UniEvent", version, "unievent.ics")
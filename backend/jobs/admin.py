@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'priority', 'attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('attempts', 'locked_by', 'locked_at', 'created_at', 'finished_at', 'last_error')
+    actions = ['requeue']
+
+    @admin.action(description="Repune in coada job-urile selectate")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='queued', run_at=timezone.now(), attempts=0, locked_by='', locked_at=None
+        )
+        self.message_user(request, f"{updated} job-uri repuse in coada.")
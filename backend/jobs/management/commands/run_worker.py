@@ -0,0 +1,67 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.queue import TASKS, claim, release, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker pentru coada de job-uri din DB (vezi jobs/queue.py). Se pot porni oricati "
+        "workeri in paralel; pe Postgres isi impart job-urile prin SELECT ... FOR UPDATE SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=10, help="Job-uri preluate odata.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Pauza cand coada e goala (secunde).")
+        parser.add_argument("--once", action="store_true", help="Goleste coada si iese.")
+        parser.add_argument("--max-jobs", type=int, default=0, help="Iese dupa atatea job-uri (0 = fara limita).")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+
+        def stop(signum, frame):
+            # termina job-ul curent, apoi iese
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker {worker_id}, task-uri: {', '.join(sorted(TASKS)) or '-'}")
+        processed = failed = 0
+        last_recovery = 0.0
+
+        while not self.stopping:
+            close_old_connections()
+
+            if time.monotonic() - last_recovery > 60:
+                recovered = requeue_stale()
+                if recovered:
+                    self.stdout.write(f"{recovered} job-uri abandonate repuse in coada")
+                last_recovery = time.monotonic()
+
+            jobs = claim(worker_id, options["batch"])
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            for index, job in enumerate(jobs):
+                if self.stopping:
+                    # job-urile preluate dar nerulate se intorc imediat in coada
+                    release(jobs[index:])
+                    break
+                ok = run_job(job)
+                processed += 1
+                failed += not ok
+                self.stdout.write(f"{'ok' if ok else 'EROARE'} {job.name} #{job.pk} (incercarea {job.attempts})")
+                if options["max_jobs"] and processed >= options["max_jobs"]:
+                    self.stopping = True
+
+        self.stdout.write(f"Worker oprit: {processed} job-uri, {failed} esuate.")
@@ -0,0 +1,47 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Un apel de task pus la coada (vezi jobs/queue.py); rulat de `manage.py run_worker`."""
+
+    STATUS_CHOICES = [
+        ('queued', 'In asteptare'),
+        ('running', 'In executie'),
+        ('done', 'Terminat'),
+        ('failed', 'Esuat'),
+    ]
+
+    name = models.CharField(max_length=200, help_text="Numele task-ului inregistrat cu @task")
+    payload = models.JSONField(default=dict, blank=True)
+
+    # prioritate mai mare = preluat mai devreme
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-priority', 'run_at', 'id']
+        indexes = [
+            # index partial: workerii cauta doar printre job-urile in asteptare
+            models.Index(
+                fields=['-priority', 'run_at'],
+                name='job_ready_idx',
+                condition=Q(status='queued'),
+            ),
+            models.Index(fields=['status', 'locked_at'], name='job_status_locked_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
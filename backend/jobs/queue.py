@@ -0,0 +1,153 @@
+"""
+queue.py (jobs app)
+
+Coada de job-uri in baza de date, fara broker extern.
+
+- @task: inregistreaza o functie ca task; primeste `.enqueue(**kwargs)`
+- enqueue / enqueue_many: pun job-uri la coada (in tranzactia curenta, deci un job
+  pus dintr-un view care esueaza dispare odata cu rollback-ul)
+- claim: preia job-uri cu SELECT ... FOR UPDATE SKIP LOCKED; mai multi workeri pe acelasi
+  Postgres nu se blocheaza intre ei si nu iau niciodata acelasi job
+- run_job: executa un job; la eroare il reprogrameaza cu backoff exponential pana la max_attempts
+- release: intoarce in coada job-uri preluate dar nerulate
+- requeue_stale: readuce in coada job-urile ramase "running" dupa un worker oprit brusc
+  (sau le marcheaza "failed" daca si-au epuizat incercarile)
+
+Payload-ul trebuie sa fie serializabil JSON (id-uri, nu instante de modele).
+"""
+
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+TASKS = {}
+
+# backoff: BASE * 2^(incercare-1) secunde, cu jitter, plafonat la MAX
+JOB_RETRY_BASE_SECONDS = getattr(settings, "JOB_RETRY_BASE_SECONDS", 10)
+JOB_RETRY_MAX_SECONDS = getattr(settings, "JOB_RETRY_MAX_SECONDS", 3600)
+
+# dupa cat timp un job "running" e considerat abandonat de worker
+JOB_LOCK_TIMEOUT = getattr(settings, "JOB_LOCK_TIMEOUT", 15 * 60)
+
+
+def task(func=None, *, name=None, priority=0, max_attempts=5):
+    """
+    @task
+    def send_notifications(user_ids, title, message): ...
+
+    send_notifications.enqueue(user_ids=[1, 2], title="...", message="...")
+    """
+
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        TASKS[task_name] = func
+        func.task_name = task_name
+
+        def enqueue_task(priority=priority, run_at=None, delay=None, max_attempts=max_attempts, **payload):
+            return enqueue(
+                task_name, payload, priority=priority, run_at=run_at, delay=delay, max_attempts=max_attempts
+            )
+
+        func.enqueue = enqueue_task
+        return func
+
+    return register(func) if func is not None else register
+
+
+def _build(name, payload, priority=0, run_at=None, delay=None, max_attempts=5):
+    if name not in TASKS:
+        raise KeyError(f"Task necunoscut: {name}")
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    return Job(name=name, payload=payload or {}, priority=priority, run_at=run_at, max_attempts=max_attempts)
+
+
+def enqueue(name, payload=None, **options):
+    job = _build(name, payload, **options)
+    job.save()
+    return job
+
+
+def enqueue_many(name, payloads, **options):
+    """Acelasi task cu payload-uri diferite, intr-un singur INSERT."""
+    return Job.objects.bulk_create([_build(name, payload, **options) for payload in payloads])
+
+
+def claim(worker_id, limit=1):
+    """Preia pana la `limit` job-uri scadente, in ordinea prioritatii."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_at__lte=now)
+            .order_by("-priority", "run_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids).update(
+            status="running", locked_by=worker_id, locked_at=now, attempts=F("attempts") + 1
+        )
+    return list(Job.objects.filter(id__in=ids).order_by("-priority", "run_at", "id"))
+
+
+def release(jobs):
+    """Intoarce in coada job-uri preluate dar nerulate (ex. la oprirea workerului)."""
+    Job.objects.filter(pk__in=[job.pk for job in jobs], status="running").update(
+        status="queued", locked_by="", locked_at=None, attempts=F("attempts") - 1
+    )
+
+
+def backoff(attempts):
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def run_job(job):
+    """Executa job-ul; intoarce True daca a reusit."""
+    try:
+        func = TASKS[job.name]
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status="failed", last_error=error, locked_by="", locked_at=None, finished_at=timezone.now()
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status="queued",
+                last_error=error,
+                locked_by="",
+                locked_at=None,
+                run_at=timezone.now() + backoff(job.attempts),
+            )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status="done", locked_by="", locked_at=None, finished_at=timezone.now()
+    )
+    return True
+
+
+def requeue_stale(timeout=JOB_LOCK_TIMEOUT):
+    """
+    Job-urile ramase "running" dupa un worker oprit brusc. Rularea intrerupta e deja numarata
+    in attempts (claim o incrementeaza), deci un job care opreste workerul de fiecare data
+    ajunge "failed" dupa max_attempts, ca unul care arunca exceptii. Intoarce cate au revenit in coada.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status="running", locked_at__lt=now - timedelta(seconds=timeout))
+    error = f"Worker oprit sau blocat: job-ul nu s-a terminat in {timeout}s."
+    with transaction.atomic():
+        stale.filter(attempts__gte=F("max_attempts")).update(
+            status="failed", last_error=error, locked_by="", locked_at=None, finished_at=now
+        )
+        return stale.update(status="queued", last_error=error, locked_by="", locked_at=None)
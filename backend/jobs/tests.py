@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+
+calls = []
+
+
+@queue.task(name="jobs.tests.record")
+def record(value):
+    calls.append(value)
+
+
+@queue.task(name="jobs.tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("eroare de test")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_orders_by_priority_and_skips_future_jobs(self):
+        record.enqueue(value="normal")
+        record.enqueue(value="urgent", priority=10)
+        record.enqueue(value="mai tarziu", delay=timedelta(hours=1))
+
+        jobs = queue.claim("test", limit=10)
+
+        self.assertEqual([job.payload["value"] for job in jobs], ["urgent", "normal"])
+        self.assertTrue(all(job.status == "running" and job.attempts == 1 for job in jobs))
+        self.assertEqual(queue.claim("test", limit=10), [])
+
+    def test_run_job_marks_done(self):
+        record.enqueue(value=1)
+        [job] = queue.claim("test")
+
+        self.assertTrue(queue.run_job(job))
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get(pk=job.pk).status, "done")
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        explode.enqueue()
+        [job] = queue.claim("test")
+        self.assertFalse(queue.run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("eroare de test", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        [job] = queue.claim("test")
+        self.assertFalse(queue.run_job(job))
+        self.assertEqual(Job.objects.get(pk=job.pk).status, "failed")
+
+    def test_enqueue_many_and_release(self):
+        queue.enqueue_many("jobs.tests.record", [{"value": i} for i in range(3)])
+        jobs = queue.claim("test", limit=3)
+        queue.release(jobs[1:])
+
+        self.assertEqual(Job.objects.filter(status="queued", attempts=0).count(), 2)
+
+    def test_requeue_stale(self):
+        record.enqueue(value=1)
+        [job] = queue.claim("test")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(queue.requeue_stale(timeout=60), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ("queued", 1, ""))
+        self.assertIn("Worker oprit", job.last_error)
+
+    def test_job_that_keeps_killing_the_worker_is_marked_failed(self):
+        job = explode.enqueue()
+        for attempt in range(1, job.max_attempts + 1):
+            [claimed] = queue.claim("test")
+            self.assertEqual(claimed.attempts, attempt)
+            # workerul moare in timpul job-ului: ramane "running" cu lock-ul vechi
+            Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+            queue.requeue_stale(timeout=60)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", job.max_attempts))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(queue.claim("test"), [])
+
+    def test_requeue_stale_ignores_recent_locks(self):
+        record.enqueue(value=1)
+        queue.claim("test")
+        self.assertEqual(queue.requeue_stale(timeout=60), 0)
+        self.assertEqual(Job.objects.get().status, "running")
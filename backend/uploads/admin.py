@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import Upload
+
+
+@admin.register(Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'owner', 'kind', 'status', 'offset', 'size', 'updated_at')
+    list_select_related = ('owner',)
+    list_filter = ('status', 'kind')
+    search_fields = ('filename', 'owner__email')
+    readonly_fields = ('offset', 'stored_name', 'created_at', 'updated_at')
+    autocomplete_fields = ('owner',)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from uploads.models import Upload
+
+
+class Command(BaseCommand):
+    help = (
+        "Sterge upload-urile abandonate: neterminate sau terminate dar neatasate niciunui eveniment "
+        "de mai mult de UPLOAD_EXPIRE_HOURS. De rulat periodic (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=float, default=settings.UPLOAD_EXPIRE_HOURS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        stale = Upload.objects.filter(updated_at__lt=cutoff)
+        removed = 0
+        for upload in stale.iterator(chunk_size=500):
+            upload.discard()
+            removed += 1
+        self.stdout.write(f"{removed} upload-uri sterse.")
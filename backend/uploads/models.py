@@ -0,0 +1,59 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+
+
+class Upload(models.Model):
+    """
+    Fisier urcat pe bucati (vezi uploads/views.py). Cat timp e "pending", bucatile se scriu in
+    UPLOAD_TEMP_DIR; dupa ultima bucata fisierul e verificat si mutat in storage ("complete"),
+    iar evenimentul il refera prin id (image_upload / file_upload).
+    """
+
+    KIND_CHOICES = [
+        ('image', 'Imagine'),
+        ('file', 'Fisier'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'In curs'),
+        ('complete', 'Complet'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploads')
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # sha256 (hex) al fisierului intreg, declarat de client; verificat dupa ultima bucata
+    checksum = models.CharField(max_length=64, blank=True)
+
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    stored_name = models.CharField(max_length=255, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='upload_status_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f"{self.id}.part")
+
+    def discard(self):
+        """Sterge fisierul (partial sau finalizat, inca neatasat) si randul."""
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        if self.stored_name:
+            default_storage.delete(self.stored_name)
+        self.delete()
@@ -0,0 +1,46 @@
+import os
+import re
+
+from django.conf import settings
+from django.utils.text import get_valid_filename
+from rest_framework import serializers
+
+from .models import Upload
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    # marimea recomandata (si maxima) a unei bucati
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Upload
+        fields = ["id", "kind", "filename", "size", "checksum", "offset", "status", "chunk_size", "created_at"]
+        read_only_fields = ["id", "offset", "status", "created_at"]
+        extra_kwargs = {"checksum": {"write_only": True}}
+
+    def get_chunk_size(self, obj):
+        return settings.UPLOAD_CHUNK_SIZE
+
+    def validate_filename(self, value):
+        # doar numele, fara cale; restul se normalizeaza ca la upload-urile obisnuite
+        value = os.path.basename(value.replace("\\", "/")).strip()
+        if not value or value in {".", ".."}:
+            raise serializers.ValidationError("Nume de fișier invalid.")
+        return get_valid_filename(value)
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Fișierul este gol.")
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Fișierul depășește limita de {settings.UPLOAD_MAX_SIZE // (1024 * 1024)} MB."
+            )
+        return value
+
+    def validate_checksum(self, value):
+        value = value.lower()
+        if value and not _SHA256_RE.match(value):
+            raise serializers.ValidationError("Checksum-ul trebuie să fie SHA-256 în hex.")
+        return value
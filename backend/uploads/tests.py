@@ -0,0 +1,218 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+
+from backend.testing import budgets, factories
+from events.models import Event
+from . import views
+from .models import Upload
+
+
+class UploadTestMixin:
+    """MEDIA_ROOT si UPLOAD_TEMP_DIR in directoare temporare, sterse dupa fiecare test."""
+
+    def setUp(self):
+        media_root, temp_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.addCleanup(shutil.rmtree, temp_dir)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, UPLOAD_TEMP_DIR=temp_dir, UPLOAD_CHUNK_SIZE=4
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def make_upload(self, owner, content=b"0123456789", **fields):
+        fields.setdefault("kind", "file")
+        return Upload.objects.create(
+            owner=owner, filename="program.pdf", size=len(content),
+            checksum=hashlib.sha256(content).hexdigest(), **fields
+        )
+
+    def send_chunk(self, upload, offset, chunk, checksum=None):
+        headers = {"HTTP_UPLOAD_OFFSET": str(offset)}
+        if checksum is not None:
+            headers["HTTP_UPLOAD_CHECKSUM"] = f"sha256 {base64.b64encode(checksum).decode()}"
+        return self.client.patch(
+            f"/api/uploads/{upload.pk}/", chunk, content_type="application/offset+octet-stream", **headers
+        )
+
+
+class UploadQueryBudgetTests(UploadTestMixin, budgets.QueryBudgetTestCase):
+    """Bugetele de query-uri pentru rutele din uploads/urls.py (vezi backend/query_budgets.py)."""
+
+    route_prefix = "api/uploads/"
+
+    def seed_uploads(self, n, **fields):
+        owner = self.make_user(is_organizer=True)
+        uploads = [self.make_upload(owner, **fields) for _ in range(n)]
+        return {"user": owner, "kwargs": {"pk": uploads[0].pk}}
+
+    def test_upload_create(self):
+        def seed(n):
+            seeded = self.seed_uploads(n)
+            seeded["data"] = {"kind": "file", "filename": "program.pdf", "size": 10}
+            return seeded
+
+        self.assertQueryBudget("POST", "api/uploads/", seed, status=201)
+
+    def test_upload_detail(self):
+        self.assertQueryBudget("GET", "api/uploads/<uuid:pk>/", self.seed_uploads)
+
+    def test_upload_chunk(self):
+        def seed(n):
+            seeded = self.seed_uploads(n)
+            seeded.update(data=b"0123", content_type="application/offset+octet-stream",
+                          headers={"HTTP_UPLOAD_OFFSET": "0"})
+            return seeded
+
+        self.assertQueryBudget("PATCH", "api/uploads/<uuid:pk>/", seed)
+
+    def test_upload_delete(self):
+        self.assertQueryBudget("DELETE", "api/uploads/<uuid:pk>/", self.seed_uploads, status=204)
+
+
+class ChunkedUploadTests(UploadTestMixin, factories.ApiTestCase):
+    """Protocolul de upload: offset-uri, checksum-uri, finalizare si atasarea la eveniment."""
+
+    def setUp(self):
+        super().setUp()
+        self.organizer = self.make_user(is_organizer=True)
+        self.client.force_authenticate(self.organizer)
+
+    def test_resume_after_wrong_offset(self):
+        upload = self.make_upload(self.organizer)
+        self.assertEqual(self.send_chunk(upload, 0, b"0123").status_code, 200)
+
+        # clientul a pierdut raspunsul si retrimite de la 0: serverul ii spune unde a ramas
+        response = self.send_chunk(upload, 0, b"0123")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Upload-Offset"], "4")
+        self.assertEqual(self.client.get(f"/api/uploads/{upload.pk}/")["Upload-Offset"], "4")
+
+        self.send_chunk(upload, 4, b"4567")
+        response = self.send_chunk(upload, 8, b"89")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "complete")
+        upload.refresh_from_db()
+        self.assertTrue(upload.stored_name.startswith("event_files/"))
+        with default_storage.open(upload.stored_name) as fh:
+            self.assertEqual(fh.read(), b"0123456789")
+        self.assertFalse(os.path.exists(upload.part_path))
+
+    def test_chunk_is_received_outside_the_transaction(self):
+        upload = self.make_upload(self.organizer)
+        depth = len(connection.atomic_blocks)
+        receive = views._receive_chunk
+
+        def slow_client(*args):
+            # in timp ce bucata vine din retea nu e deschisa nicio tranzactie (si niciun lock);
+            # intre timp, un retry al aceleiasi bucati a ajuns primul
+            self.assertEqual(len(connection.atomic_blocks), depth)
+            Upload.objects.filter(pk=upload.pk).update(offset=4)
+            return receive(*args)
+
+        with patch.object(views, "_receive_chunk", side_effect=slow_client):
+            response = self.send_chunk(upload, 0, b"0123")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Upload-Offset"], "4")
+        # fisierul temporar al bucatii nu ramane in urma
+        self.assertEqual(os.listdir(os.path.dirname(upload.part_path)), [])
+
+    def test_oversized_chunk_is_rejected(self):
+        upload = self.make_upload(self.organizer)
+        self.assertEqual(self.send_chunk(upload, 0, b"01234").status_code, 413)
+
+    def test_chunk_checksum_mismatch_keeps_offset(self):
+        upload = self.make_upload(self.organizer)
+
+        response = self.send_chunk(upload, 0, b"0123", checksum=hashlib.sha256(b"xxxx").digest())
+        self.assertEqual(response.status_code, 400)
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 0)
+
+        response = self.send_chunk(upload, 0, b"0123", checksum=hashlib.sha256(b"0123").digest())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["offset"], 4)
+
+    def test_file_checksum_mismatch_restarts_upload(self):
+        upload = self.make_upload(self.organizer, content=b"0123")
+        upload.checksum = hashlib.sha256(b"altceva").hexdigest()
+        upload.save()
+
+        response = self.send_chunk(upload, 0, b"0123")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["offset"], 0)
+        upload.refresh_from_db()
+        self.assertEqual((upload.offset, upload.status), (0, "pending"))
+
+    def test_invalid_image_is_rejected(self):
+        upload = self.make_upload(self.organizer, content=b"nu e png", kind="image")
+        with override_settings(UPLOAD_CHUNK_SIZE=1024):
+            response = self.send_chunk(upload, 0, b"nu e png")
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_users_upload_is_not_visible(self):
+        upload = self.make_upload(self.make_user(is_organizer=True))
+        self.assertEqual(self.send_chunk(upload, 0, b"0123").status_code, 404)
+
+    def test_event_create_attaches_upload(self):
+        buffer = BytesIO()
+        Image.new("RGB", (40, 30), (10, 120, 200)).save(buffer, "PNG")
+        content = buffer.getvalue()
+        upload = self.make_upload(self.organizer, content=content, kind="image")
+        with override_settings(UPLOAD_CHUNK_SIZE=len(content)):
+            self.assertEqual(self.send_chunk(upload, 0, content).status_code, 200)
+        upload.refresh_from_db()
+
+        faculty = self.make_events(1)[0].faculty
+        start = timezone.now() + timedelta(days=3)
+        response = self.client.post("/api/events/", {
+            "title": "Eveniment cu afis",
+            "description": "Descriere",
+            "faculty": faculty.pk,
+            "location_name": "Aula Magna",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(hours=2)).isoformat(),
+            "max_participants": 50,
+            "image_upload": str(upload.pk),
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        event = Event.objects.get(title="Eveniment cu afis")
+        self.assertEqual(event.image.name, upload.stored_name)
+        self.assertFalse(Upload.objects.filter(pk=upload.pk).exists())
+
+    def test_event_create_rejects_foreign_or_unfinished_upload(self):
+        foreign = self.make_upload(self.make_user(is_organizer=True), status="complete", stored_name="event_files/x.pdf")
+        pending = self.make_upload(self.organizer)
+        event = self.make_events(1, organizer=self.organizer)[0]
+
+        for upload in (foreign, pending):
+            response = self.client.patch(f"/api/events/{event.pk}/", {"file_upload": str(upload.pk)}, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("file_upload", response.data)
+
+    def test_purge_removes_stale_uploads(self):
+        stale = self.make_upload(self.organizer)
+        self.send_chunk(stale, 0, b"0123")
+        Upload.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        fresh = self.make_upload(self.organizer)
+
+        call_command("purge_uploads", stdout=open(os.devnull, "w"))
+
+        self.assertEqual(list(Upload.objects.values_list("pk", flat=True)), [fresh.pk])
+        self.assertFalse(os.path.exists(stale.part_path))
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import UploadCreateView, UploadDetailView
+
+urlpatterns = [
+    path("", UploadCreateView.as_view(), name="upload-create"),
+    path("<uuid:pk>/", UploadDetailView.as_view(), name="upload-detail"),
+]
@@ -0,0 +1,229 @@
+"""
+views.py (uploads app)
+
+Upload pe bucati, reluabil, pentru imaginile si fisierele evenimentelor:
+
+1. POST   /api/uploads/            {kind, filename, size, checksum?} -> {id, offset: 0, chunk_size}
+2. PATCH  /api/uploads/<id>/       corpul = bytes-ii bucatii, cu header-ele
+                                   Upload-Offset: <pozitia bucatii>
+                                   Upload-Checksum: sha256 <base64>   (optional, per bucata)
+3. GET    /api/uploads/<id>/       offset-ul curent, pentru reluare dupa o conexiune picata
+4. DELETE /api/uploads/<id>/       renuntare
+
+Bucata se citeste din retea intr-un fisier separat, fara tranzactie; lock-ul pe upload se ia
+doar pentru verificarea offset-ului si lipirea ei in fisierul partial.
+
+Dupa ultima bucata fisierul e verificat (checksum-ul declarat, imagine valida) si mutat in
+storage; evenimentul il primeste apoi prin image_upload / file_upload, fara sa mai treaca
+fisierul prin request-ul de creare / editare.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, transaction
+from PIL import Image
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from events.models import Event
+from users.permissions import IsOrganizer
+from .models import Upload
+from .serializers import UploadSerializer
+
+READ_BLOCK = 64 * 1024
+
+# campul din Event in care ajunge fiecare tip de upload (upload_to-ul lui da directorul)
+TARGET_FIELDS = {
+    "image": Event._meta.get_field("image"),
+    "file": Event._meta.get_field("file"),
+}
+
+
+class _PartFile(File):
+    # FileSystemStorage muta (os.rename) fisierele care au temporary_file_path, in loc sa le copieze
+    def temporary_file_path(self):
+        return self.name
+
+
+def _parse_chunk_checksum(header):
+    if not header:
+        return None
+    algorithm, _, value = header.partition(" ")
+    if algorithm.lower() != "sha256":
+        raise ValidationError({"Upload-Checksum": "Doar sha256 este acceptat."})
+    try:
+        return base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValidationError({"Upload-Checksum": "Valoare base64 invalidă."})
+
+
+def _receive_chunk(upload, request, length):
+    """
+    Citeste corpul (bucata) din retea intr-un fisier separat, inainte de orice tranzactie: un
+    client lent nu tine ocupate un lock si o conexiune DB din pool. Intoarce (cale, digest).
+    """
+    digest = hashlib.sha256()
+    os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+    chunk = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(upload.part_path), prefix=f"{upload.id}.", suffix=".chunk", delete=False
+    )
+    with chunk:
+        remaining = length
+        while remaining:
+            block = request.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            chunk.write(block)
+            digest.update(block)
+            remaining -= len(block)
+    if remaining:
+        os.remove(chunk.name)
+        raise ValidationError({"detail": "Corpul request-ului este mai scurt decât Content-Length."})
+    return chunk.name, digest.digest()
+
+
+def _append_chunk(upload, chunk_path, offset):
+    """Copiaza bucata primita la `offset` in fisierul partial (copiere locala, sub lock)."""
+    mode = "r+b" if os.path.exists(upload.part_path) else "w+b"
+    with open(upload.part_path, mode) as part, open(chunk_path, "rb") as chunk:
+        part.seek(offset)
+        shutil.copyfileobj(chunk, part, READ_BLOCK)
+        # o scriere anterioara intrerupta poate sa fi lasat bytes dupa offset
+        part.truncate()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _finalize(upload):
+    """Ultima bucata a sosit: verificari, apoi mutare in storage. Intoarce eroarea, daca exista."""
+    if upload.checksum and _file_sha256(upload.part_path) != upload.checksum:
+        return "Checksum-ul fișierului nu corespunde; reia upload-ul."
+
+    if upload.kind == "image":
+        try:
+            with Image.open(upload.part_path) as image:
+                image.verify()
+        except Exception:
+            return "Fișierul nu este o imagine validă."
+
+    target = TARGET_FIELDS[upload.kind].generate_filename(None, upload.filename)
+    with open(upload.part_path, "rb") as fh:
+        upload.stored_name = default_storage.save(target, _PartFile(fh, name=upload.part_path))
+    # storage-urile care copiaza (nu muta) lasa fisierul partial in urma
+    if os.path.exists(upload.part_path):
+        os.remove(upload.part_path)
+    upload.status = "complete"
+    return None
+
+
+class UploadCreateView(generics.CreateAPIView):
+    serializer_class = UploadSerializer
+    permission_classes = [permissions.IsAuthenticated, IsOrganizer]
+
+    def perform_create(self, serializer):
+        serializer.save(owner_id=self.request.user.id)
+
+
+class UploadDetailView(generics.RetrieveDestroyAPIView):
+    serializer_class = UploadSerializer
+    permission_classes = [permissions.IsAuthenticated, IsOrganizer]
+
+    def get_queryset(self):
+        return Upload.objects.filter(owner_id=self.request.user.id)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        response["Upload-Offset"] = str(response.data["offset"])
+        return response
+
+    def perform_destroy(self, instance):
+        instance.discard()
+
+    @staticmethod
+    def _check_offset(upload, offset):
+        if upload.status == "complete" or offset != upload.offset:
+            # clientul reia de la offset-ul din raspuns
+            return Response(
+                {"detail": "Offset greșit.", "offset": upload.offset},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Upload-Offset": str(upload.offset)},
+            )
+        return None
+
+    def patch(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            raise ValidationError({"Upload-Offset": "Header lipsă sau invalid."})
+        expected_digest = _parse_chunk_checksum(request.headers.get("Upload-Checksum"))
+
+        try:
+            upload = self.get_queryset().get(pk=kwargs["pk"])
+        except Upload.DoesNotExist:
+            raise NotFound("Upload inexistent.")
+        conflict = self._check_offset(upload, offset)
+        if conflict is not None:
+            return conflict
+        if length <= 0:
+            raise ValidationError({"detail": "Bucata este goală."})
+        if length > settings.UPLOAD_CHUNK_SIZE or offset + length > upload.size:
+            return Response(
+                {"detail": "Bucata depășește dimensiunea permisă."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        chunk_path, digest = _receive_chunk(upload, request._request, length)
+        try:
+            if expected_digest is not None and digest != expected_digest:
+                # bucata se retrimite de la acelasi offset
+                return Response(
+                    {"detail": "Checksum-ul bucății nu corespunde.", "offset": upload.offset},
+                    status=status.HTTP_400_BAD_REQUEST,
+                    headers={"Upload-Offset": str(upload.offset)},
+                )
+
+            # lock-ul se tine doar cat se lipeste bucata deja primita
+            with transaction.atomic():
+                try:
+                    # o singura bucata lipita odata per upload (ex. retry in paralel cu request-ul vechi)
+                    upload = self.get_queryset().select_for_update(nowait=True).get(pk=kwargs["pk"])
+                except Upload.DoesNotExist:
+                    raise NotFound("Upload inexistent.")
+                except DatabaseError:
+                    return Response({"detail": "O altă bucată se scrie chiar acum."}, status=status.HTTP_409_CONFLICT)
+
+                # intre timp poate fi ajuns alt request cu aceeasi bucata
+                conflict = self._check_offset(upload, offset)
+                if conflict is not None:
+                    return conflict
+
+                _append_chunk(upload, chunk_path, offset)
+                upload.offset = offset + length
+                error = _finalize(upload) if upload.offset == upload.size else None
+                if error:
+                    # fisierul intreg e stricat: se reia de la zero
+                    os.remove(upload.part_path)
+                    upload.offset = 0
+                upload.save()
+        finally:
+            os.remove(chunk_path)
+
+        if error:
+            return Response({"detail": error, "offset": 0}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(UploadSerializer(upload).data, headers={"Upload-Offset": str(upload.offset)})
@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+
+from backend.admin_utils import EstimatedCountPaginator
+from backend.moderation import cached_pending_counts, moderate_organizer_requests
 from .models import CustomUser, OrganizerRequest
+from .authentication import invalidate_tokens
 
 class OrganizerRequestInline(admin.StackedInline):
     model = OrganizerRequest
@@ -26,6 +30,13 @@ class CustomUserAdmin(UserAdmin):
 
     ordering = ("email",)
 
+    # tabela de utilizatori e mare: total estimat, fara al doilea COUNT(*)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # campuri care apar in token (claims); la schimbarea lor token-urile vechi se revoca
+    token_claim_fields = {"email", "first_name", "last_name", "is_staff", "is_organizer", "is_active", "password"}
+
     search_fields = ("email", "first_name", "last_name")
 
     fieldsets = (
@@ -60,31 +71,29 @@ class CustomUserAdmin(UserAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and self.token_claim_fields.intersection(form.changed_data):
+            invalidate_tokens([obj.pk])
+
 @admin.register(OrganizerRequest)
 class OrganizerRequestAdmin(admin.ModelAdmin):
 
     list_display = ('user', 'organization_name', 'status', 'created_at')
     list_filter = ('status', 'created_at')
+    list_select_related = ('user',)
     search_fields = ('user__email', 'organization_name')
+    autocomplete_fields = ('user',)
 
     actions = ['approve_requests', 'reject_requests']
 
     @admin.action(description='Aprobă cererile selectate (Userul devine Organizator)')
     def approve_requests(self, request, queryset):
-        for req in queryset:
-            if req.status != 'approved':
-
-                req.status = 'approved'
-                req.save()
-                
-                user = req.user
-                user.is_organizer = True
-                user.save()
-        
+        moderate_organizer_requests(list(queryset.values_list('pk', flat=True)), 'approved', statuses=None)
         self.message_user(request, "Cererile au fost aprobate și userii au primit drepturi!")
 
     def changelist_view(self, request, extra_context=None):
-        pending_count = OrganizerRequest.objects.filter(status='pending').count()
+        pending_count = cached_pending_counts()['organizer_requests'].get('pending', 0)
 
         if pending_count > 0:
             self.message_user(
@@ -97,4 +106,4 @@ class OrganizerRequestAdmin(admin.ModelAdmin):
 
     @admin.action(description='Respinge cererile selectate')
     def reject_requests(self, request, queryset):
-        queryset.update(status='rejected')
+        moderate_organizer_requests(list(queryset.values_list('pk', flat=True)), 'rejected', statuses=None)
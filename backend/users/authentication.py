@@ -0,0 +1,166 @@
+"""
+authentication.py (users app)
+
+- VersionedJWTAuthentication: JWT standard (user incarcat din DB) + verificarea
+  claim-ului de versiune, ca token-urile vechi sa nu mai fie acceptate dupa
+  schimbari de rol / parola
+- ClaimsJWTAuthentication: pentru endpoint-uri de citire; construieste userul
+  direct din claim-urile token-ului (email, is_organizer, is_staff, full_name),
+  fara query pe CustomUser. Metodele care scriu trec tot prin DB.
+- invalidate_tokens: creste versiunea => token-urile emise anterior devin invalide
+
+Versiunea curenta se tine in cache-ul "default" TOKEN_VERSION_CACHE_SECONDS. invalidate_tokens
+sterge cheia doar din cache-ul procesului care o apeleaza: cu LocMemCache (implicit, per proces)
+ceilalti workeri mai accepta token-urile revocate pana la expirarea cheii lor. In productie
+cu mai multi workeri, CACHES["default"] trebuie sa fie un backend partajat (Redis, Memcached).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+TOKEN_VERSION_CLAIM = "ver"
+
+# cat timp tine fiecare worker versiunea in cache; o revocare se vede in cel mult
+# atatea secunde pe ceilalti workeri (imediat daca CACHES["default"] e partajat)
+TOKEN_VERSION_CACHE_SECONDS = getattr(settings, "TOKEN_VERSION_CACHE_SECONDS", 60)
+
+
+def _version_cache_key(user_id):
+    return f"users:token-version:{user_id}"
+
+
+def add_token_claims(token, user):
+    """Claim-urile custom puse in token (login clasic si Google)."""
+    token["email"] = user.email
+    token["is_organizer"] = user.is_organizer
+    token["is_staff"] = user.is_staff
+    token["full_name"] = f"{user.first_name} {user.last_name}"
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """Versiunea curenta a token-urilor userului (None daca userul nu mai exista)."""
+    key = _version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            CustomUser.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, TOKEN_VERSION_CACHE_SECONDS)
+    return version
+
+
+async def aget_token_version(user_id):
+    """Varianta async a get_token_version, pentru view-urile async (ORM async)."""
+    key = _version_cache_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = await (
+            CustomUser.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .afirst()
+        )
+        if version is not None:
+            await cache.aset(key, version, TOKEN_VERSION_CACHE_SECONDS)
+    return version
+
+
+def invalidate_tokens(user_ids, **fields):
+    """
+    Revoca toate token-urile emise pana acum pentru userii dati.
+    `fields` (ex. is_organizer=True) se actualizeaza in acelasi UPDATE.
+    """
+    user_ids = list(user_ids)
+    CustomUser.objects.filter(pk__in=user_ids).update(token_version=F("token_version") + 1, **fields)
+    # dupa commit: altfel un request concurent reciteste versiunea veche (inca cea comisa) si o
+    # pune la loc in cache, iar token-urile revocate mai merg TOKEN_VERSION_CACHE_SECONDS
+    keys = [_version_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def check_token_version(validated_token, current_version):
+    if current_version is None:
+        raise AuthenticationFailed("Utilizator inexistent sau inactiv.", code="user_not_found")
+    if validated_token.get(TOKEN_VERSION_CLAIM, 0) != current_version:
+        raise AuthenticationFailed(
+            "Sesiunea a expirat (drepturile s-au schimbat). Autentifică-te din nou.",
+            code="token_revoked",
+        )
+
+
+class ClaimsUser(TokenUser):
+    """User construit doar din claim-uri; expune campurile folosite de permisiuni si filtre."""
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def is_organizer(self):
+        return self.token.get("is_organizer", False)
+
+    @cached_property
+    def full_name(self):
+        return self.token.get("full_name", "")
+
+
+class VersionedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        check_token_version(validated_token, user.token_version)
+        return user
+
+
+class ClaimsJWTAuthentication(VersionedJWTAuthentication):
+    """
+    Pentru GET/HEAD/OPTIONS nu incarca userul din DB (doar versiunea, din cache).
+    Pentru scrieri foloseste userul complet din DB.
+    """
+
+    def authenticate(self, request):
+        self._safe_request = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if not getattr(self, "_safe_request", False):
+            return super().get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        check_token_version(validated_token, get_token_version(user.id))
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Autentificare din claims pentru view-uri async (primesc HttpRequest Django).
+        Returneaza ClaimsUser sau None daca nu exista header Authorization.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = ClaimsUser(validated_token)
+        check_token_version(validated_token, await aget_token_version(user.id))
+        return user
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='calendar_token',
+            field=models.CharField(blank=True, editable=False, max_length=43, null=True, unique=True),
+        ),
+    ]
@@ -53,6 +53,12 @@ class CustomUser(AbstractUser):
     is_student = models.BooleanField(default=True)
     is_organizer = models.BooleanField(default=False)
 
+    # Crescut la schimbari de rol / parola => token-urile JWT emise anterior devin invalide
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Secretul din URL-ul feed-ului iCalendar personal (vezi events/calendar.py)
+    calendar_token = models.CharField(max_length=43, unique=True, null=True, blank=True, editable=False)
+
     # Setari de configurare Django
     USERNAME_FIELD = 'email' 
     REQUIRED_FIELDS = []    
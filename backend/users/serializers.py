@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from .models import CustomUser, OrganizerRequest
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import add_token_claims, check_token_version, get_token_version
+from backend.moderation import MAX_BATCH
 
 # Serializer for CustomUser model
 class UserSerializer(serializers.ModelSerializer):
@@ -42,18 +46,28 @@ class OrganizerRequestSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "organization_name", "details", "status", "created_at"]
         read_only_fields = ["id", "user", "status", "created_at"]
 
+# Serializer for bulk approve / reject (vezi backend/moderation.py)
+class OrganizerRequestBulkSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_BATCH
+    )
+    status = serializers.ChoiceField(choices=["approved", "rejected"])
+
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
 
         # Aici adaugam informatiile extra in token
-        token['email'] = user.email
-        token['is_organizer'] = user.is_organizer
-        token['is_staff'] = user.is_staff
-        token['full_name'] = f"{user.first_name} {user.last_name}"
+        return add_token_claims(token, user)
+
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuza refresh-ul daca token-ul a fost emis inainte de o schimbare de rol / parola."""
 
-        return token
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs["refresh"])
+        check_token_version(refresh, get_token_version(refresh.get(api_settings.USER_ID_CLAIM)))
+        return super().validate(attrs)
     
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True)
@@ -1,24 +1,121 @@
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
 from django.contrib.auth import get_user_model
 from django.conf import settings
+import re
+import threading
+import time
 import uuid
 
 
 User = get_user_model()
 
 GOOGLE_CLIENT_ID = "344307986436-j0o4fqcrj14smhqvrgmt3jkngpgnm1nu.apps.googleusercontent.com"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+
+# cu cat timp inainte de expirare reimprospatam certificatele in fundal
+CERTS_REFRESH_MARGIN = 300
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class _CachedResponse:
+    """Raspuns HTTP minimal, compatibil cu ce asteapta google-auth (status, headers, data)."""
+
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class CertificateCache:
+    """
+    Transport google-auth care tine in memorie raspunsurile GET (certificatele Google)
+    cat timp permite `Cache-Control: max-age`.
+
+    O singura instanta per proces (worker), partajata intre request-uri.
+    Cand intrarea e aproape de expirare, se reimprospateaza pe un thread separat,
+    astfel incat login-ul sa faca doar verificarea criptografica, fara apel de retea.
+    """
+
+    def __init__(self, refresh_margin=CERTS_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._entries = {}       # url -> (raspuns, expira_la)
+        self._refreshing = set()
+
+    @staticmethod
+    def _ttl(headers):
+        match = _MAX_AGE_RE.search(headers.get("Cache-Control", headers.get("cache-control", "")))
+        if not match:
+            return 0
+        age = headers.get("Age", headers.get("age", "0"))
+        return int(match.group(1)) - (int(age) if str(age).isdigit() else 0)
+
+    def _fetch(self, url, timeout=None):
+        # google-auth (si requests) se incarca doar la primul login cu Google
+        from google.auth.transport import requests as google_requests
+
+        response = google_requests.Request()(url, method="GET", timeout=timeout)
+        cached = _CachedResponse(response.status, dict(response.headers), response.data)
+
+        ttl = self._ttl(cached.headers)
+        if cached.status == 200 and ttl > 0:
+            with self._lock:
+                self._entries[url] = (cached, time.monotonic() + ttl)
+        return cached
+
+    def _refresh_in_background(self, url):
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def run():
+            try:
+                self._fetch(url)
+            except Exception as e:
+                print(f"!!! EROARE REIMPROSPATARE CERTIFICATE GOOGLE: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method != "GET" or body is not None:
+            from google.auth.transport import requests as google_requests
+            return google_requests.Request()(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        entry = self._entries.get(url)
+        now = time.monotonic()
+
+        if entry is None or entry[1] <= now:
+            return self._fetch(url, timeout=timeout)
+
+        response, expires_at = entry
+        if expires_at - now <= self.refresh_margin:
+            self._refresh_in_background(url)
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+certificate_cache = CertificateCache()
 
 def google_validate_id_token(token: str):
     """
     Verifica token-ul primit de la Google.
     Returneaza informatiile userului (email, first_name, last_name) sau arunca eroare.
     """
+    from google.oauth2 import id_token
+
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            google_requests.Request(), 
+        idinfo = id_token.verify_token(
+            token,
+            certificate_cache,
             GOOGLE_CLIENT_ID,
+            certs_url=getattr(settings, "GOOGLE_CERTS_URL", GOOGLE_CERTS_URL),
             clock_skew_in_seconds=10
         )
         
@@ -1,3 +1,338 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
 
-# Create your tests here.
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from backend.testing import budgets, factories
+from interactions.tasks import send_notifications
+from jobs.models import Job
+from . import services
+from .authentication import ClaimsJWTAuthentication, _version_cache_key, get_token_version, invalidate_tokens
+from .models import CustomUser, OrganizerRequest
+from .serializers import MyTokenObtainPairSerializer
+
+
+def _make_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem.decode()
+
+
+class _CertsHandler(BaseHTTPRequestHandler):
+    """Inlocuitor local pentru endpoint-ul de certificate Google."""
+
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        body = json.dumps(server.certs).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", f"public, max-age={server.max_age}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class GoogleCertificateCacheTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_pem, public_pem = _make_key()
+
+        cls.server = HTTPServer(("127.0.0.1", 0), _CertsHandler)
+        cls.server.certs = {"test-key": public_pem}
+        cls.server.max_age = 3600
+        cls.server.hits = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.certs_url = f"http://127.0.0.1:{cls.server.server_port}/certs"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.hits = 0
+        self.server.max_age = 3600
+        self.cache = services.CertificateCache()
+        patcher = mock.patch.object(services, "certificate_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_override = override_settings(GOOGLE_CERTS_URL=self.certs_url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _id_token(self, email="student@upb.ro"):
+        from google.auth import crypt, jwt
+
+        now = int(time.time())
+        signer = crypt.RSASigner.from_string(self.private_pem, key_id="test-key")
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": services.GOOGLE_CLIENT_ID,
+            "iat": now,
+            "exp": now + 600,
+            "email": email,
+            "given_name": "Ana",
+            "family_name": "Pop",
+        }
+        return jwt.encode(signer, payload).decode()
+
+    def test_certificates_fetched_once_while_fresh(self):
+        for _ in range(3):
+            data = services.google_validate_id_token(self._id_token())
+            self.assertEqual(data["email"], "student@upb.ro")
+
+        self.assertEqual(self.server.hits, 1)
+
+    def test_no_max_age_means_no_caching(self):
+        self.server.max_age = 0
+
+        services.google_validate_id_token(self._id_token())
+        services.google_validate_id_token(self._id_token())
+
+        self.assertEqual(self.server.hits, 2)
+
+    def test_refreshes_in_background_before_expiry(self):
+        self.cache.refresh_margin = 3600
+
+        services.google_validate_id_token(self._id_token())
+        services.google_validate_id_token(self._id_token())
+
+        deadline = time.monotonic() + 5
+        while self.server.hits < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.hits, 2)
+
+    def test_invalid_token_rejected(self):
+        self.assertIsNone(services.google_validate_id_token(self._id_token() + "x"))
+
+
+class UserQueryBudgetTests(budgets.QueryBudgetTestCase):
+    """Bugetele de query-uri pentru rutele din users/urls.py (vezi backend/query_budgets.py)."""
+
+    route_prefix = "api/users/"
+
+    def _organizer_requests(self, n):
+        return OrganizerRequest.objects.bulk_create(
+            [OrganizerRequest(user=user, organization_name="Asociatia") for user in self.make_users(n)]
+        )
+
+    def test_register(self):
+        def seed(n):
+            self.make_users(n)
+            return {
+                "data": {
+                    "email": "nou@test.ro",
+                    "first_name": "Ana",
+                    "last_name": "Pop",
+                    "password": "Parola-Noua-2025",
+                    "password2": "Parola-Noua-2025",
+                }
+            }
+
+        self.assertQueryBudget("POST", "api/users/register/", seed, status=201)
+
+    def test_profile(self):
+        def seed(n):
+            self.make_users(n)
+            return {"user": self.make_user()}
+
+        self.assertQueryBudget("GET", "api/users/profile/", seed)
+
+    def test_change_password(self):
+        def seed(n):
+            self.make_users(n)
+            return {
+                "user": self.make_user(),
+                "data": {
+                    "old_password": self.password,
+                    "new_password": "Parola-Noua-2025",
+                    "new_password2": "Parola-Noua-2025",
+                },
+            }
+
+        self.assertQueryBudget("POST", "api/users/change-password/", seed)
+
+    def test_organizer_request_create(self):
+        def seed(n):
+            self._organizer_requests(n)
+            return {"user": self.make_user(), "data": {"organization_name": "Liga Studentilor"}}
+
+        self.assertQueryBudget("POST", "api/users/organizer-request/", seed, status=201)
+
+    def test_organizer_request_me(self):
+        def seed(n):
+            return {"user": self._organizer_requests(n)[0].user}
+
+        self.assertQueryBudget("GET", "api/users/organizer-request/me/", seed)
+
+    def test_organizer_request_admin_list(self):
+        def seed(n):
+            self._organizer_requests(n)
+            return {"user": self.make_user(is_staff=True)}
+
+        self.assertQueryBudget("GET", "api/users/admin/organizer-requests/", seed)
+
+    def test_organizer_request_admin_approve(self):
+        def seed(n):
+            request = self._organizer_requests(n)[0]
+            return {
+                "user": self.make_user(is_staff=True),
+                "kwargs": {"pk": request.pk},
+                "data": {"status": "approved"},
+            }
+
+        self.assertQueryBudget("PATCH", "api/users/admin/organizer-requests/<int:pk>/", seed)
+
+    def test_organizer_request_admin_bulk(self):
+        def seed(n):
+            requests = self._organizer_requests(n)
+            return {
+                "user": self.make_user(is_staff=True),
+                "data": {"ids": [request.pk for request in requests], "status": "approved"},
+            }
+
+        self.assertQueryBudget("POST", "api/users/admin/organizer-requests/bulk/", seed)
+
+
+class OrganizerRequestModerationTests(factories.ApiTestCase):
+    def test_bulk_approve_promotes_users_and_revokes_tokens(self):
+        users = self.make_users(3)
+        requests = OrganizerRequest.objects.bulk_create(
+            [OrganizerRequest(user=user, organization_name="Asociatia") for user in users]
+        )
+        OrganizerRequest.objects.filter(pk=requests[2].pk).update(status="rejected")
+        self.client.force_authenticate(self.make_user(is_staff=True))
+
+        response = self.client.post(
+            "/api/users/admin/organizer-requests/bulk/",
+            {"ids": [request.pk for request in requests], "status": "approved"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["skipped"], [requests[2].pk])
+        promoted = CustomUser.objects.filter(is_organizer=True, token_version=1)
+        self.assertEqual(set(promoted.values_list("pk", flat=True)), {users[0].pk, users[1].pk})
+        [job] = Job.objects.filter(name=send_notifications.task_name)
+        self.assertEqual(sorted(job.payload["user_ids"]), [users[0].pk, users[1].pk])
+
+
+class TokenVersionTests(factories.ApiTestCase):
+    """Token-urile emise inainte de invalidate_tokens (rol nou, parola noua) nu mai sunt acceptate."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = self.make_user()
+        self.refresh = MyTokenObtainPairSerializer.get_token(self.user)
+
+    def get(self, path, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.client.get(path)
+
+    def test_revoked_access_token_is_rejected(self):
+        access = self.refresh.access_token
+        # profilul incarca userul din DB, lista de bilete doar versiunea (din cache)
+        self.assertEqual(self.get("/api/users/profile/", access).status_code, 200)
+        self.assertEqual(self.get("/api/interactions/tickets/", access).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tokens([self.user.pk])
+
+        for path in ("/api/users/profile/", "/api/interactions/tickets/"):
+            response = self.get(path, access)
+            self.assertEqual(response.status_code, 401, path)
+            self.assertIn("Sesiunea a expirat", response.json()["detail"])
+
+    def test_revoked_refresh_token_is_rejected(self):
+        response = self.client.post("/api/token/refresh/", {"refresh": str(self.refresh)}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tokens([self.user.pk], is_organizer=True)
+
+        response = self.client.post("/api/token/refresh/", {"refresh": str(self.refresh)}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_organizer)
+        fresh = MyTokenObtainPairSerializer.get_token(self.user)
+        response = self.client.post("/api/token/refresh/", {"refresh": str(fresh)}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_version_claim_must_match(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(token_version=3)
+        access = self.refresh.access_token
+        self.assertEqual(self.get("/api/interactions/tickets/", access).status_code, 401)
+
+        # token fara claim de versiune (emis inainte de introducerea lui) = versiunea 0
+        del access["ver"]
+        self.assertEqual(self.get("/api/users/profile/", access).status_code, 401)
+
+        access["ver"] = 3
+        self.assertEqual(self.get("/api/users/profile/", access).status_code, 200)
+        self.assertEqual(self.get("/api/interactions/tickets/", access).status_code, 200)
+
+    def test_inactive_user_is_rejected_from_claims(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.get("/api/interactions/tickets/", self.refresh.access_token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "Utilizator inexistent sau inactiv.")
+
+    def test_async_authentication_checks_version(self):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+        authenticate = async_to_sync(ClaimsJWTAuthentication().aauthenticate)
+        self.assertEqual(authenticate(request).id, self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tokens([self.user.pk])
+        with self.assertRaises(AuthenticationFailed):
+            authenticate(request)
+
+    def test_cache_is_cleared_after_commit(self):
+        old_version = get_token_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                invalidate_tokens([self.user.pk])
+                # un request concurent citeste versiunea inca comisa si o pune in cache
+                cache.set(_version_cache_key(self.user.pk), old_version)
+        self.assertEqual(get_token_version(self.user.pk), old_version + 1)
+
+    def test_change_password_revokes_old_tokens_and_issues_new_ones(self):
+        other_session = MyTokenObtainPairSerializer.get_token(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+        response = self.client.post(
+            "/api/users/change-password/",
+            {"old_password": self.password, "new_password": "Parola-Noua-2025", "new_password2": "Parola-Noua-2025"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("Parola-Noua-2025"))
+        for old in (self.refresh.access_token, other_session.access_token):
+            self.assertEqual(self.get("/api/users/profile/", old).status_code, 401)
+        self.assertEqual(self.get("/api/users/profile/", response.data["access"]).status_code, 200)
+        refreshed = self.client.post("/api/token/refresh/", {"refresh": response.data["refresh"]}, format="json")
+        self.assertEqual(refreshed.status_code, 200)
@@ -5,6 +5,7 @@ from .views import (
     OrganizerRequestCreateView,
     OrganizerRequestListAdminView,
     OrganizerRequestUpdateAdminView,
+    OrganizerRequestBulkAdminView,
     GoogleLoginView,
     ChangePasswordView,
     OrganizerRequestMeView,
@@ -19,6 +20,7 @@ urlpatterns = [
     path("organizer-request/", OrganizerRequestCreateView.as_view()),
     path("admin/organizer-requests/", OrganizerRequestListAdminView.as_view()),
     path("admin/organizer-requests/<int:pk>/", OrganizerRequestUpdateAdminView.as_view()),
+    path("admin/organizer-requests/bulk/", OrganizerRequestBulkAdminView.as_view()),
     path("organizer-request/me/", OrganizerRequestMeView.as_view()),
 
     path("google/", GoogleLoginView.as_view(), name="google_login"),
@@ -3,25 +3,31 @@ from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.exceptions import NotFound
 
 # Importuri locale
 from .models import CustomUser, OrganizerRequest
 from .serializers import (
     MyTokenObtainPairSerializer,
+    MyTokenRefreshSerializer,
     UserSerializer,
     RegisterSerializer,
     OrganizerRequestSerializer,
+    OrganizerRequestBulkSerializer,
     ChangePasswordSerializer
 )
+from .authentication import invalidate_tokens
 from .services import google_validate_id_token, google_get_or_create_user
+from backend.moderation import moderate_organizer_requests
+from backend.throttling import TokenBucketThrottle
 
 # View for user registration
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "register"
 
 # View for retrieving user profile
 class ProfileView(generics.RetrieveAPIView):
@@ -54,7 +60,12 @@ class OrganizerRequestMeView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        obj = OrganizerRequest.objects.filter(user=self.request.user).order_by("-created_at").first()
+        obj = (
+            OrganizerRequest.objects.filter(user=self.request.user)
+            .select_related("user")
+            .order_by("-created_at")
+            .first()
+        )
         if not obj:
             raise NotFound("Nu ai nicio cerere de organizator.")
         return obj
@@ -65,13 +76,13 @@ class OrganizerRequestListAdminView(generics.ListAPIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get_queryset(self):
-        return OrganizerRequest.objects.all()
+        return OrganizerRequest.objects.select_related("user")
 
 # View for admin to update organizer request status
 class OrganizerRequestUpdateAdminView(generics.UpdateAPIView):
     serializer_class = OrganizerRequestSerializer
     permission_classes = [permissions.IsAdminUser]
-    queryset = OrganizerRequest.objects.all()
+    queryset = OrganizerRequest.objects.select_related("user")
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -80,21 +91,36 @@ class OrganizerRequestUpdateAdminView(generics.UpdateAPIView):
         if status_value not in ["approved", "rejected"]:
             return Response({"detail": "Status invalid."}, status=400)
 
-        instance.status = status_value
-        instance.save()
-
-        if status_value == "approved":
-            user = instance.user
-            user.is_organizer = True
-            user.save()
+        if moderate_organizer_requests([instance.pk], status_value, statuses=None):
+            instance.status = status_value
+            instance.user.is_organizer = instance.user.is_organizer or status_value == "approved"
 
         return Response(OrganizerRequestSerializer(instance).data)
+
+# View for admin to approve / reject many organizer requests at once
+class OrganizerRequestBulkAdminView(generics.GenericAPIView):
+    serializer_class = OrganizerRequestBulkSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        updated = moderate_organizer_requests(ids, serializer.validated_data["status"])
+        return Response({"updated": updated, "skipped": sorted(set(ids) - set(updated))})
     
 class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "login"
+
+class MyTokenRefreshView(TokenRefreshView):
+    serializer_class = MyTokenRefreshSerializer
 
 class GoogleLoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "login"
 
     def post(self, request):
         token = request.data.get('token')
@@ -110,14 +136,8 @@ class GoogleLoginView(APIView):
         # 2. Obtinem sau cream userul 
         user = google_get_or_create_user(google_data)
 
-        # 3. Generam token-urile JWT 
-        refresh = RefreshToken.for_user(user)
-        
-        # Adaugam datele custom in token
-        refresh['email'] = user.email
-        refresh['is_organizer'] = user.is_organizer
-        refresh['is_staff'] = user.is_staff
-        refresh['full_name'] = f"{user.first_name} {user.last_name}"
+        # 3. Generam token-urile JWT (cu aceleasi date custom ca la login-ul clasic)
+        refresh = MyTokenObtainPairSerializer.get_token(user)
 
         return Response({
             'refresh': str(refresh),
@@ -139,6 +159,17 @@ class ChangePasswordView(APIView):
             return Response({"detail": "Parola veche este greșită."}, status=status.HTTP_400_BAD_REQUEST)
 
         user.set_password(new_password)
-        user.save()
-
-        return Response({"detail": "Parola a fost schimbată cu succes."}, status=status.HTTP_200_OK)
\ No newline at end of file
+        # parola noua si revocarea token-urilor vechi (si ale altor sesiuni) in acelasi UPDATE
+        invalidate_tokens([user.pk], password=user.password)
+        user.token_version += 1
+
+        # sesiunea curenta continua cu o pereche noua de token-uri
+        refresh = MyTokenObtainPairSerializer.get_token(user)
+        return Response(
+            {
+                "detail": "Parola a fost schimbată cu succes.",
+                "access": str(refresh.access_token),
+                "refresh": str(refresh),
+            },
+            status=status.HTTP_200_OK,
+        )
\ No newline at end of file
@@ -81,6 +81,7 @@ const EventCard = ({
   };
 
   const finalImageUrl = getMediaUrl(event.image);
+  const cardImage = event.image_variants?.card;
   const finalFileUrl = getMediaUrl(event.file);
 
   const fileName = event.file ? String(event.file).split("/").pop() : null;
@@ -129,14 +130,26 @@ const EventCard = ({
         <div className={styles.imageContainer}>
           {event.image ? (
             <>
-              <img
-                src={finalImageUrl}
-                alt={event.title || "Eveniment"}
-                className={styles.eventImage}
-                onError={(e) => {
-                  e.currentTarget.style.display = "none";
-                }}
-              />
+              {/* varianta "card" (WebP + JPEG) daca a fost generata, altfel originalul */}
+              <picture>
+                {cardImage && (
+                  <source type="image/webp" srcSet={cardImage.webp} sizes={cardImage.sizes} />
+                )}
+                <img
+                  src={cardImage?.src || finalImageUrl}
+                  srcSet={cardImage?.jpeg}
+                  sizes={cardImage?.sizes}
+                  width={cardImage?.width}
+                  height={cardImage?.height}
+                  loading="lazy"
+                  decoding="async"
+                  alt={event.title || "Eveniment"}
+                  className={styles.eventImage}
+                  onError={(e) => {
+                    e.currentTarget.style.display = "none";
+                  }}
+                />
+              </picture>
 
               <button
                 className={styles.viewCoverBtn}
@@ -89,6 +89,8 @@ export default function EventDetailsModal({
     return safeEvent.imageUrl || getMediaUrl(safeEvent.image);
   }, [safeEvent.imageUrl, safeEvent.image]);
 
+  const heroImage = safeEvent.image_variants?.hero;
+
   const fileUrl = useMemo(() => {
     return safeEvent.fileUrl || getMediaUrl(safeEvent.file);
   }, [safeEvent.fileUrl, safeEvent.file]);
@@ -226,8 +228,20 @@ export default function EventDetailsModal({
     setBuyMsg("");
     setBuyError("");
 
+    const buy = (allowOverlap) =>
+      api.post("/api/interactions/tickets/buy/", { event_id: eventId, allow_overlap: allowOverlap });
+
     try {
-      await api.post("/api/interactions/tickets/buy/", { event_id: eventId });
+      try {
+        await buy(false);
+      } catch (err) {
+        // suprapunere cu un alt bilet: cumpărăm doar dacă utilizatorul confirmă
+        const conflict = err?.response?.data?.schedule_conflict;
+        if (!conflict) throw err;
+        const message = Array.isArray(conflict) ? conflict[0] : conflict;
+        if (!window.confirm(`${message}\nVrei să te înscrii oricum?`)) return;
+        await buy(true);
+      }
       setBuyMsg("Bilet creat cu succes!");
       onTicketCreated?.(eventId);
       setTimeout(() => closeWithAnimation(), 900);
@@ -259,14 +273,21 @@ export default function EventDetailsModal({
         <div className={styles.headerGrid}>
           <div className={styles.cover}>
             {imageUrl ? (
-              <img
-                src={imageUrl}
-                alt={safeEvent.title || "Eveniment"}
-                className={styles.coverImg}
-                onError={(e) => {
-                  e.currentTarget.style.display = "none";
-                }}
-              />
+              <picture>
+                {heroImage && (
+                  <source type="image/webp" srcSet={heroImage.webp} sizes={heroImage.sizes} />
+                )}
+                <img
+                  src={heroImage?.src || imageUrl}
+                  srcSet={heroImage?.jpeg}
+                  sizes={heroImage?.sizes}
+                  alt={safeEvent.title || "Eveniment"}
+                  className={styles.coverImg}
+                  onError={(e) => {
+                    e.currentTarget.style.display = "none";
+                  }}
+                />
+              </picture>
             ) : (
               <div className={styles.coverPlaceholder} aria-hidden="true">
                 <FiImage size={42} color="rgba(255,255,255,0.5)" />
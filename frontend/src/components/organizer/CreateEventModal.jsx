@@ -3,6 +3,7 @@ import styles from "../../styles/CreateEvent.module.css";
 
 // --- Servicii ---
 import api from "../../services/api";
+import { uploadFile } from "../../services/uploads";
 
 // --- Harta ---
 import { MapContainer, TileLayer, Marker, useMapEvents } from "react-leaflet";
@@ -69,6 +70,7 @@ const INITIAL_DATA = {
 
 const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
   const [facultiesList, setFacultiesList] = useState([]);
+  const [locationSuggestions, setLocationSuggestions] = useState([]);
   const [departmentsList, setDepartmentsList] = useState([]);
   const [categoriesList, setCategoriesList] = useState([]);
   const [errors, setErrors] = useState({});
@@ -163,6 +165,26 @@ const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
     }
   }, [isOpen]);
 
+  // Autocomplete pentru locații deja folosite (aceeași sală = aceeași locație în backend)
+  useEffect(() => {
+    const query = (formData.locationName || "").trim();
+    if (!isOpen || query.length < 2) {
+      setLocationSuggestions([]);
+      return;
+    }
+
+    const timer = setTimeout(async () => {
+      try {
+        const res = await api.get("api/events/locations/", { params: { q: query } });
+        setLocationSuggestions(res.data);
+      } catch (error) {
+        console.error("Nu am putut încărca locațiile:", error);
+      }
+    }, 250);
+
+    return () => clearTimeout(timer);
+  }, [isOpen, formData.locationName]);
+
   // Filtrăm departamentele în funcție de facultatea selectată
   const filteredDepartments = departmentsList.filter((dept) => {
     return dept.faculty && dept.faculty.id === parseInt(formData.faculty);
@@ -199,6 +221,15 @@ const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
       if (name === "faculty") {
         newData.department = "";
       }
+
+      // Locație aleasă din sugestii: completăm și adresa / link-ul
+      if (name === "locationName") {
+        const match = locationSuggestions.find((loc) => loc.name === value);
+        if (match) {
+          newData.locationAddress = match.address || "";
+          newData.googleMapsLink = match.google_maps_link || "";
+        }
+      }
       return newData;
     });
   };
@@ -302,10 +333,6 @@ const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
     if (formData.department) data.append("department", formData.department);
     if (formData.category) data.append("category", formData.category);
 
-    // Fișiere
-    if (formData.coverImage) data.append("image", formData.coverImage);
-    if (formData.document) data.append("file", formData.document);
-
     try {
       const token = localStorage.getItem("access_token");
 
@@ -314,6 +341,14 @@ const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
         return;
       }
 
+      // Fișiere: urcate pe bucăți înainte (reluabil), evenimentul primește doar id-ul upload-ului
+      if (formData.coverImage) {
+        data.append("image_upload", await uploadFile(formData.coverImage, "image"));
+      }
+      if (formData.document) {
+        data.append("file_upload", await uploadFile(formData.document, "file"));
+      }
+
       const response = initialEvent
         ? await api.patch(`/api/events/${initialEvent.id}/`, data)
         : await api.post("/api/events/", data);
@@ -627,8 +662,17 @@ const CreateEventModal = ({ isOpen, onClose, initialEvent = null }) => {
                   className={styles.input}
                   value={formData.locationName}
                   onChange={handleChange}
+                  list="location-suggestions"
+                  autoComplete="off"
                   required
                 />
+                <datalist id="location-suggestions">
+                  {locationSuggestions.map((loc) => (
+                    <option key={loc.id} value={loc.name}>
+                      {loc.address}
+                    </option>
+                  ))}
+                </datalist>
                 {errors.location_name && (
                   <div className={styles.fieldError}>
                     {errors.location_name}
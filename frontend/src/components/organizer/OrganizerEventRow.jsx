@@ -1,4 +1,5 @@
 import React, { useMemo } from "react";
+import api from "../../services/api";
 import styles from "../../styles/OrganizerEventRow.module.css";
 import {
   FiEdit2,
@@ -7,6 +8,7 @@ import {
   FiCheckCircle,
   FiXCircle,
   FiTrash2,
+  FiDownload,
 } from "react-icons/fi";
 
 export default function OrganizerEventRow({
@@ -46,6 +48,21 @@ export default function OrganizerEventRow({
     onDeleteDraft?.(event);
   };
 
+  // lista participanților (CSV); cererea trece prin api ca să trimită token-ul JWT
+  const handleExport = async (e) => {
+    e.stopPropagation();
+    const res = await api.get(`/api/events/${event.id}/attendees/`, {
+      params: { type: "csv" },
+      responseType: "blob",
+    });
+    const url = URL.createObjectURL(res.data);
+    const link = document.createElement("a");
+    link.href = url;
+    link.download = `participanti-${event.id}.csv`;
+    link.click();
+    URL.revokeObjectURL(url);
+  };
+
   return (
     <div className={styles.row}>
       <div className={styles.left}>
@@ -99,6 +116,17 @@ export default function OrganizerEventRow({
           )}
         </button>
 
+        {status === "published" && (
+          <button
+            type="button"
+            className={styles.primaryBtn}
+            onClick={handleExport}
+            title="Descarcă lista participanților"
+          >
+            <FiDownload /> Participanți
+          </button>
+        )}
+
         {isDraft && (
           <button
             type="button"
@@ -53,39 +53,21 @@ function FavoritesPage() {
     fetchTickets();
   }, []);
 
-  // map eventId -> favoriteId (pk) 
-  const favoritesMap = useMemo(() => {
-    const map = {};
-    (favorites || []).forEach((fav) => {
-      const evId = fav?.event?.id ?? fav?.event;
-      if (evId) map[String(evId)] = fav.id;
-    });
-    return map;
-  }, [favorites]);
-
   const favoriteEvents = useMemo(() => {
     return (favorites || []).map((fav) => fav?.event).filter(Boolean);
   }, [favorites]);
 
   const toggleFavorite = async (eventId) => {
     const key = String(eventId);
-    const favId = favoritesMap[key];
 
     try {
-      if (favId) {
-        await api.delete(`/api/interactions/favorites/${favId}/`);
+      // pe pagina de favorite orice eveniment afisat este deja favorit
+      await api.delete(`/api/interactions/favorites/event/${eventId}/`);
 
-        // scoatem din listă favorit-ul șters
-        setFavorites((prev) =>
-          (prev || []).filter((f) => String(f?.id) !== String(favId))
-        );
-      } else {
-        const res = await api.post("/api/interactions/favorites/", {
-          event_id: eventId,
-        });
-        const created = res.data;
-        if (created?.id) setFavorites((prev) => [created, ...(prev || [])]);
-      }
+      // scoatem din listă evenimentul șters
+      setFavorites((prev) =>
+        (prev || []).filter((f) => String(f?.event?.id ?? f?.event) !== key)
+      );
     } catch (e) {
       console.error("Eroare la toggle favorite:", e);
     }
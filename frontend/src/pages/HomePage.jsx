@@ -55,7 +55,7 @@ function HomePage() {
         const map = {};
         (res.data || []).forEach((fav) => {
           const evId = fav?.event?.id ?? fav?.event;
-          if (evId) map[String(evId)] = fav.id;
+          if (evId) map[String(evId)] = true;
         });
         setFavoritesMap(map);
       } catch (e) {
@@ -183,28 +183,19 @@ function HomePage() {
 
   const toggleFavorite = async (eventId) => {
     const key = String(eventId);
-    const existingFavId = favoritesMap[key];
+    const isFav = Boolean(favoritesMap[key]);
 
     try {
-      if (existingFavId) {
-        await api.delete(`/api/interactions/favorites/${existingFavId}/`);
-        setFavoritesMap((prev) => {
-          const next = { ...prev };
-          delete next[key];
-          return next;
-        });
-      } else {
-        const res = await api.post("/api/interactions/favorites/", {
-          event_id: eventId,
-        });
-
-        const newFavId = res.data?.id;
-        if (newFavId) {
-          setFavoritesMap((prev) => ({ ...prev, [key]: newFavId }));
-        } else {
-          // fallback dacă backend nu întoarce id
-        }
-      }
+      const res = isFav
+        ? await api.delete(`/api/interactions/favorites/event/${eventId}/`)
+        : await api.put(`/api/interactions/favorites/event/${eventId}/`);
+
+      setFavoritesMap((prev) => {
+        const next = { ...prev };
+        if (res.data?.is_favorite) next[key] = true;
+        else delete next[key];
+        return next;
+      });
     } catch (e) {
       console.error("Eroare toggle favorite:", e);
     }
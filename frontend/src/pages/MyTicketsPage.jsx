@@ -142,6 +142,16 @@ function MyTicketsPage() {
     }
   };
 
+  // feed iCalendar personal (bilete + favorite); webcal:// deschide aplicația de calendar
+  const subscribeCalendar = async () => {
+    try {
+      const res = await api.get("/api/interactions/calendar/");
+      window.location.href = res.data.webcal;
+    } catch {
+      setError("Nu am putut genera link-ul de calendar.");
+    }
+  };
+
   const openDetails = (ev) => {
     setSelectedEvent(ev);
     setDetailsOpen(true);
@@ -158,6 +168,9 @@ function MyTicketsPage() {
         <div className={styles.header}>
           <h1 className={styles.title}>My Tickets</h1>
           <p className={styles.subtitle}>Biletele tale pentru evenimente.</p>
+          <button type="button" className={styles.calendarBtn} onClick={subscribeCalendar}>
+            Adaugă în calendarul telefonului
+          </button>
         </div>
 
         {loading && <p>Se încarcă biletele...</p>}
@@ -87,6 +87,35 @@ export default function OrganizerDashboardPage() {
     }
   };
 
+  // import în bloc (CSV / JSON); dacă un rând are erori nu se creează nimic
+  const [importErrors, setImportErrors] = useState([]);
+
+  const handleImport = async (e) => {
+    const file = e.target.files?.[0];
+    e.target.value = "";
+    if (!file) return;
+
+    const data = new FormData();
+    data.append("file", file);
+    setImportErrors([]);
+    try {
+      const res = await api.post("/api/events/import/", data);
+      alert(`${res.data.created} evenimente importate.`);
+      fetchMyEvents();
+    } catch (err) {
+      const body = err?.response?.data;
+      if (body?.errors) {
+        setImportErrors(
+          body.errors.map(
+            (row) => `Rândul ${row.row}: ${Object.values(row.errors).flat().join(" ")}`
+          )
+        );
+      } else {
+        setImportErrors([String(body?.file || "Importul a eșuat.")]);
+      }
+    }
+  };
+
   const groups = useMemo(() => {
     const by = { draft: [], pending: [], published: [], rejected: [] };
 
@@ -107,6 +136,17 @@ export default function OrganizerDashboardPage() {
           <p className={styles.subtitle}>
             Draft-urile pot fi editate. Celelalte pot fi doar vizualizate.
           </p>
+          <label className={styles.importBtn}>
+            Importă program (CSV / JSON)
+            <input type="file" accept=".csv,.json" hidden onChange={handleImport} />
+          </label>
+          {importErrors.length > 0 && (
+            <ul className={styles.importErrors}>
+              {importErrors.map((message) => (
+                <li key={message}>{message}</li>
+              ))}
+            </ul>
+          )}
         </div>
 
         {loading ? (
@@ -1,6 +1,7 @@
 import React, { useCallback, useEffect, useMemo, useState } from "react";
 import Layout from "../components/Layout";
 import api from "../services/api";
+import { ACCESS_TOKEN, REFRESH_TOKEN } from "../constants";
 import styles from "../styles/Profile.module.css";
 
 function ProfilePage() {
@@ -150,6 +151,11 @@ function ProfilePage() {
         new_password2: newPass2,
       });
 
+      // token-urile vechi sunt revocate la schimbarea parolei; serverul trimite o pereche noua
+      if (res?.data?.access) {
+        localStorage.setItem(ACCESS_TOKEN, res.data.access);
+        localStorage.setItem(REFRESH_TOKEN, res.data.refresh);
+      }
       setPassMsg(res?.data?.detail || "Parola a fost schimbată.");
       setOldPass("");
       setNewPass("");
@@ -0,0 +1,107 @@
+/**
+ * uploads.js:
+ * - Urcă un fișier pe bucăți prin /api/uploads/ (vezi backend/uploads/views.py).
+ * - Fiecare bucată are checksum SHA-256; o conexiune picată se reia de la offset-ul
+ *   confirmat de server, nu de la zero.
+ * - Upload-urile neterminate se țin minte în localStorage, așa că aceeași poză aleasă din nou
+ *   (după refresh) continuă de unde a rămas.
+ *
+ * Exemplu utilizare:
+ * import { uploadFile } from './uploads';
+ * const id = await uploadFile(file, 'image', (p) => setProgress(p));
+ * data.append('image_upload', id);
+ */
+
+import api from './api';
+
+const MAX_RETRIES = 5;
+
+const storageKey = (file, kind) =>
+  `upload:${kind}:${file.name}:${file.size}:${file.lastModified}`;
+
+const toBase64 = (buffer) => {
+  let binary = '';
+  new Uint8Array(buffer).forEach((byte) => {
+    binary += String.fromCharCode(byte);
+  });
+  return btoa(binary);
+};
+
+const toHex = (buffer) =>
+  Array.from(new Uint8Array(buffer), (byte) => byte.toString(16).padStart(2, '0')).join('');
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// reluăm upload-ul salvat, dacă serverul încă îl are
+const resumeUpload = async (key) => {
+  const id = localStorage.getItem(key);
+  if (!id) return null;
+  try {
+    const res = await api.get(`/api/uploads/${id}/`);
+    return res.data;
+  } catch {
+    localStorage.removeItem(key);
+    return null;
+  }
+};
+
+export async function uploadFile(file, kind, onProgress) {
+  const key = storageKey(file, kind);
+  let upload = await resumeUpload(key);
+
+  if (!upload) {
+    // fișierele mici se citesc o singură dată pentru checksum-ul întregului fișier
+    const checksum = toHex(await crypto.subtle.digest('SHA-256', await file.arrayBuffer()));
+    const res = await api.post('/api/uploads/', {
+      kind,
+      filename: file.name,
+      size: file.size,
+      checksum,
+    });
+    upload = res.data;
+    localStorage.setItem(key, upload.id);
+  }
+
+  let { offset } = upload;
+  let retries = 0;
+
+  while (upload.status !== 'complete') {
+    const chunk = await file.slice(offset, offset + upload.chunk_size).arrayBuffer();
+    const digest = await crypto.subtle.digest('SHA-256', chunk);
+
+    try {
+      const res = await api.patch(`/api/uploads/${upload.id}/`, chunk, {
+        headers: {
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': String(offset),
+          'Upload-Checksum': `sha256 ${toBase64(digest)}`,
+        },
+      });
+      upload = { ...upload, ...res.data };
+      offset = upload.offset;
+      retries = 0;
+      if (onProgress) onProgress(Math.round((offset / file.size) * 100));
+    } catch (error) {
+      const response = error.response;
+      const serverOffset = response && response.data ? response.data.offset : undefined;
+      if (response && response.status === 409 && serverOffset !== undefined) {
+        // serverul are deja bucata (sau e alta în scriere): continuăm de la offset-ul lui
+        offset = serverOffset;
+      } else if (response && response.status < 500 && response.status !== 409 && serverOffset === undefined) {
+        // upload inexistent, bucată prea mare etc.: reîncercarea nu ajută
+        localStorage.removeItem(key);
+        throw error;
+      } else if (retries >= MAX_RETRIES) {
+        throw error;
+      } else {
+        // checksum greșit (400 cu offset) sau eroare de rețea / server: retrimitem
+        if (serverOffset !== undefined) offset = serverOffset;
+        retries += 1;
+        await sleep(1000 * 2 ** retries);
+      }
+    }
+  }
+
+  localStorage.removeItem(key);
+  return upload.id;
+}